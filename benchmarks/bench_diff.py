@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Time and peak RSS of the release comparison scripts (fully offline).
+
+Writes a synthetic pair of releases (--rows villages each, as
+villages.csv and regions_id.csv, sorted by code like the builder's
+output; the new release drops, adds and renames ~1% of the villages)
+and runs scripts/compare_regions.py and scripts/compare_regions_id.py
+on them as child processes. Run it against another checkout with
+--repo for a before / after comparison; the SHA256 of every diff file
+is reported so both can be checked for identical output.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_diff --rows 1000000
+    git worktree add /tmp/before HEAD~1
+    python -m benchmarks.bench_diff --rows 1000000 --repo /tmp/before
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_memory import run_peak_rss_mb
+from benchmarks.bench_pipeline import git_commit
+from benchmarks.synthetic_pdf import region_name
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+VILLAGES_PER_DISTRICT = 25
+DISTRICTS_PER_REGENCY = 20
+REGENCIES_PER_PROVINCE = 25
+
+
+# =========================
+# Synthetic releases
+# =========================
+
+def village_codes(rows: int):
+    """`rows` village codes in sorted order, with the parent codes."""
+    per_province = REGENCIES_PER_PROVINCE * DISTRICTS_PER_REGENCY * VILLAGES_PER_DISTRICT
+    for i in range(rows):
+        province = 11 + i // per_province
+        regency = i // (DISTRICTS_PER_REGENCY * VILLAGES_PER_DISTRICT) % REGENCIES_PER_PROVINCE + 1
+        district = i // VILLAGES_PER_DISTRICT % DISTRICTS_PER_REGENCY + 1
+        # leave gaps between codes for the villages added in the new release
+        village = 2 * (i % VILLAGES_PER_DISTRICT) + 1001
+        regency_code = f"{province}{regency:02d}"
+        district_code = f"{regency_code}{district:02d}"
+        yield str(province), regency_code, district_code, f"{district_code}{village:04d}"
+
+
+def write_releases(work: Path, rows: int, seed: int = 0) -> dict[str, tuple[Path, Path]]:
+    rng = random.Random(seed)
+    paths = {
+        name: (work / f"old_{name}.csv", work / f"new_{name}.csv")
+        for name in ("villages", "regions_id")
+    }
+    files = {name: [open(p, "w", newline="", encoding="utf-8") for p in pair]
+             for name, pair in paths.items()}
+    try:
+        writers = {name: [csv.writer(f) for f in pair] for name, pair in files.items()}
+        for w in writers["villages"]:
+            w.writerow(["code", "district_code", "name", "type"])
+        for w in writers["regions_id"]:
+            w.writerow([
+                "province_code", "province_name", "province_capital",
+                "regency_code", "regency_name", "regency_type", "regency_capital",
+                "district_code", "district_name",
+                "village_code", "village_name", "village_type",
+            ])
+
+        for i, (province, regency, district, code) in enumerate(village_codes(rows)):
+            name = region_name(i, words=1 + i % 2)
+            vtype = "village" if i % 5 else "urban_village"
+            old = [(code, name, vtype)]
+            x = rng.random()
+            if x < 0.01:
+                new = []                                  # removed
+            elif x < 0.02:
+                new = [(code, f"{name} Baru", vtype)]     # renamed
+            elif x < 0.03:
+                added = f"{code[:-4]}{int(code[-4:]) + 1:04d}"
+                new = [(code, name, vtype), (added, f"{name} Baru", "village")]
+            else:
+                new = old
+
+            for (old_or_new, versions) in ((0, old), (1, new)):
+                for v_code, v_name, v_type in versions:
+                    writers["villages"][old_or_new].writerow([v_code, district, v_name, v_type])
+                    writers["regions_id"][old_or_new].writerow([
+                        province, region_name(int(province)), "",
+                        regency, f"Kabupaten {region_name(int(regency))}", "regency", "",
+                        district, region_name(int(district)),
+                        v_code, v_name, v_type,
+                    ])
+    finally:
+        for pair in files.values():
+            for f in pair:
+                f.close()
+    return paths
+
+
+# =========================
+# Runs
+# =========================
+
+def sha256_of(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def run_script(repo: Path, script: str, old: Path, new: Path, output: Path) -> dict:
+    start = time.perf_counter()
+    peak = run_peak_rss_mb(
+        [sys.executable, str(repo / "scripts" / script), str(old), str(new), "-o", str(output)],
+        cwd=output.parent,
+    )
+    return {"seconds": round(time.perf_counter() - start, 2), "peak_rss_mb": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the release comparison scripts")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Villages per release")
+    parser.add_argument("--repo", type=Path, default=REPO_ROOT, help="Checkout to run the scripts from")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    repo = args.repo.resolve()
+    work = Path(tempfile.mkdtemp(prefix="kepmendagri-diff-"))
+    try:
+        start = time.perf_counter()
+        paths = write_releases(work, args.rows)
+        print(f"synthetic releases: {args.rows} villages ({time.perf_counter() - start:.1f}s)")
+
+        old, new = paths["villages"]
+        regions = run_script(repo, "compare_regions.py", old, new, work / "villages_diff.csv")
+        regions["output_sha256"] = sha256_of(work / "villages_diff.csv")
+
+        old, new = paths["regions_id"]
+        regions_id = run_script(repo, "compare_regions_id.py", old, new, work / "regions_id_diff")
+        # field order of the old script is not stable: hash the sorted lines
+        with open(work / "regions_id_diff_field_diff.csv", "rb") as f:
+            lines = sorted(f.readlines())
+        regions_id["output_sha256"] = hashlib.sha256(b"".join(lines)).hexdigest()
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print(f"\n=== DIFF ({args.rows} rows, {repo}) ===")
+    for name, result in (("compare_regions", regions), ("compare_regions_id", regions_id)):
+        print(
+            f"{name:<20}: {result['seconds']:7.2f} s   "
+            f"peak RSS {result['peak_rss_mb']:8.1f} MiB   "
+            f"output {result['output_sha256'][:12]}"
+        )
+
+    if args.output:
+        report = {
+            "git_commit": git_commit(),
+            "repo": str(repo),
+            "rows": args.rows,
+            "compare_regions": regions,
+            "compare_regions_id": regions_id,
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"✔ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
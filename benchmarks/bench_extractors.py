@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Extraction engine benchmark.
+
+Parses the same page range with every extraction engine and reports
+pages/second per engine. Parity between the engines is checked by
+tests/test_extractor_parity.py.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_extractors --input kepmendagri-2025.pdf \\
+        --start-page 1 --end-page 200
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from kepmendagri_parser.extractors.engines import ENGINES, get_engine
+from kepmendagri_parser.pipeline.page_parser import iter_page_results
+
+
+def run_engine(engine_name: str, pdf_path: Path, start_page: int, end_page: int | None):
+    engine = get_engine(engine_name)
+
+    started = time.perf_counter()
+    with engine.open(pdf_path) as pdf:
+        total = len(pdf.pages)
+        last = min(end_page or total, total)
+        results = list(iter_page_results(pdf, start_page, last, engine=engine))
+    elapsed = time.perf_counter() - started
+
+    return results, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark extraction engines (pages/second)"
+    )
+    parser.add_argument("--input", required=True, type=Path, help="Path to PDF")
+    parser.add_argument("--start-page", type=int, default=1)
+    parser.add_argument("--end-page", type=int)
+    parser.add_argument(
+        "--engines",
+        default=",".join(ENGINES),
+        help=f"Comma separated engines (default: {','.join(ENGINES)})",
+    )
+    parser.add_argument("--json", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    engines = [e.strip() for e in args.engines.split(",") if e.strip()]
+
+    report = {"input": str(args.input), "engines": {}}
+
+    for name in engines:
+        results, elapsed = run_engine(name, args.input, args.start_page, args.end_page)
+        pages = len(results)
+
+        entry = {
+            "pages": pages,
+            "seconds": round(elapsed, 3),
+            "pages_per_second": round(pages / elapsed, 2) if elapsed else None,
+            "rows": sum(len(r.rows) for r in results),
+        }
+        report["engines"][name] = entry
+
+    print("\n=== EXTRACTION ENGINES ===")
+    for name, entry in report["engines"].items():
+        print(
+            f"{name:12} : {entry['pages']} pages in {entry['seconds']:.2f}s "
+            f"({entry['pages_per_second']} pages/s), {entry['rows']} rows"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
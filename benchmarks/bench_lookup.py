@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Load time and lookup throughput of lookup.RegionIndex (fully offline).
+
+Runs against a datasets directory (--datasets) or, by default, against
+a synthetic one of --villages villages written by build_dataset. The
+baseline is what consumers do today: read regions_id.csv into a dict
+keyed by village code.
+
+- load         RegionIndex.load() plus the first access of each level
+               (only that level's CSV is read), versus the dict baseline
+- lookups/s    get() of a village, ancestry() of a village, children()
+               of a district, and a dict lookup on the baseline
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_lookup
+    python -m benchmarks.bench_lookup --datasets datasets --output lookup.json
+"""
+
+import argparse
+import csv
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_memory import synthetic_rows
+from benchmarks.bench_pipeline import git_commit
+from kepmendagri_parser.builders.dataset_builder import build_dataset
+from kepmendagri_parser.lookup.region_index import RegionIndex
+from kepmendagri_parser.models.region_code import Level
+
+
+def build_synthetic(out_dir: Path, villages: int) -> Path:
+    raw = synthetic_rows(villages)
+    build_dataset(raw["province"], raw["regency"], raw["district"], raw["village"], out_dir)
+    return out_dir
+
+
+def timed(fn) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def load_regions_id(datasets_dir: Path) -> dict[str, dict]:
+    """The consumer baseline: regions_id.csv as a dict by village code."""
+    with open(datasets_dir / "regions_id.csv", newline="", encoding="utf-8") as f:
+        return {row["village_code"]: row for row in csv.DictReader(f)}
+
+
+def per_second(fn, keys: list) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return len(keys) / (time.perf_counter() - start)
+
+
+def bench(datasets_dir: Path, lookups: int) -> dict:
+    results = {}
+
+    seconds, index = timed(lambda: RegionIndex.load(datasets_dir))
+    results["load_s.open"] = seconds
+    for level in Level:
+        seconds, table = timed(lambda: index.table(level))
+        results[f"load_s.{level.name.lower()}"] = seconds
+        results[f"rows.{level.name.lower()}"] = len(table)
+    results["load_s.all_levels"] = sum(
+        v for k, v in results.items() if k.startswith("load_s.")
+    )
+    results["load_s.regions_id_dict"], baseline = timed(lambda: load_regions_id(datasets_dir))
+
+    rng = random.Random(0)
+    villages = [str(c) for c in index.table(Level.VILLAGE).codes]
+    districts = [str(c) for c in index.table(Level.DISTRICT).codes]
+    village_keys = [rng.choice(villages) for _ in range(lookups)]
+    district_keys = [rng.choice(districts) for _ in range(lookups)]
+
+    # first children() call computes the ranges of the level
+    results["load_s.village_ranges"], _ = timed(lambda: index.children(districts[0]))
+
+    results["per_s.get"] = per_second(index.get, village_keys)
+    results["per_s.ancestry"] = per_second(index.ancestry, village_keys)
+    results["per_s.children"] = per_second(index.children, district_keys)
+    results["per_s.regions_id_dict"] = per_second(baseline.get, village_keys)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RegionIndex load time and lookups")
+    parser.add_argument("--datasets", type=Path, help="Datasets directory (default: synthetic)")
+    parser.add_argument("--villages", type=int, default=83_000, help="Villages of the synthetic dataset")
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="kepmendagri-lookup-"))
+    try:
+        datasets_dir = args.datasets or build_synthetic(work / "datasets", args.villages)
+        results = bench(datasets_dir, args.lookups)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print(f"\n=== LOAD ({results['rows.village']} villages) ===")
+    for level in Level:
+        name = level.name.lower()
+        print(f"{name:<16}: {results[f'load_s.{name}'] * 1000:8.1f} ms")
+    print(f"village ranges  : {results['load_s.village_ranges'] * 1000:8.1f} ms (first children())")
+    print(f"all levels      : {results['load_s.all_levels'] * 1000:8.1f} ms")
+    print(f"regions_id dict : {results['load_s.regions_id_dict'] * 1000:8.1f} ms (baseline)")
+
+    print(f"\n=== LOOKUPS ({args.lookups} random codes) ===")
+    print(f"get             : {results['per_s.get']:12,.0f} /s")
+    print(f"ancestry        : {results['per_s.ancestry']:12,.0f} /s")
+    print(f"children        : {results['per_s.children']:12,.0f} /s")
+    print(f"regions_id dict : {results['per_s.regions_id_dict']:12,.0f} /s (baseline, no objects)")
+
+    if args.output:
+        report = {
+            "git_commit": git_commit(),
+            "datasets": str(args.datasets or f"synthetic:{args.villages}"),
+            "lookups": args.lookups,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"✔ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark for the in-memory village store (fully offline).
+
+Two measurements:
+
+- store      traced allocations of N village rows held as a list of
+             dicts (as the parsers emit them) versus a VillageColumns
+             store, and of `build_dataset` on either input
+- full run   peak RSS of `python -m kepmendagri_parser` on a synthetic
+             PDF, measured on the child process, so any checkout can be
+             measured with --repo (e.g. a `git worktree` of an earlier
+             commit) for a before / after comparison
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_memory --size full
+    git worktree add /tmp/before HEAD~1
+    python -m benchmarks.bench_memory --size full --repo /tmp/before
+"""
+
+import argparse
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_pipeline import SIZES, git_commit
+from benchmarks.synthetic_pdf import region_name
+from kepmendagri_parser.builders.dataset_builder import build_dataset
+from kepmendagri_parser.models.columns import VillageColumns
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+MIB = 1024 * 1024
+
+
+# =========================
+# Synthetic raw rows
+# =========================
+
+def synthetic_rows(
+    villages: int, per_district: int = 25, per_regency: int = 90
+) -> dict[str, list[dict]]:
+    """Raw stitched rows (parser output shape) for `villages` villages."""
+    districts = -(-villages // per_district)
+    regencies = -(-districts // per_regency)
+
+    regency_rows = [{
+        "code": f"11{r + 1:02d}",
+        "province_code": "11",
+        "name": f"Kabupaten {region_name(r)}",
+        "type": "regency",
+    } for r in range(regencies)]
+
+    district_rows = []
+    village_rows = []
+    for d in range(districts):
+        regency = d // per_regency + 1
+        code = f"11{regency:02d}{d % per_regency + 1:02d}"
+        district_rows.append({
+            "code": code,
+            "regency_code": f"11{regency:02d}",
+            "province_code": "11",
+            "name": region_name(d),
+            "regency_capital": None,
+            "province_capital": None,
+        })
+        for v in range(min(per_district, villages - len(village_rows))):
+            # names repeat across districts like the real edition
+            village_rows.append({
+                "code": f"{code}{v + 1:04d}",
+                "name": region_name(v, words=1 + v % 2),
+                "district_code": code,
+                "type": "village" if v % 5 else "urban_village",
+                "source_page": 100 + len(village_rows) // 30,
+            })
+    return {
+        "province": [{"code": "11", "name": "Aceh"}],
+        "regency": regency_rows,
+        "district": district_rows,
+        "village": village_rows,
+    }
+
+
+# =========================
+# Benchmarks
+# =========================
+
+def traced(fn) -> tuple[float, float, object]:
+    """Run `fn` under tracemalloc: (retained MiB, peak MiB, result)."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(current / MIB, 2), round(peak / MIB, 2), result
+
+
+def bench_store(villages: int, work: Path) -> dict:
+    raw = synthetic_rows(villages)
+    rows = raw["village"]
+    # fresh rows and strings (like parsed rows), not shared with `raw`
+    dict_mb, _, kept = traced(lambda: json.loads(json.dumps(rows)))
+    columns_mb, _, store = traced(lambda: VillageColumns.from_rows(rows))
+    del kept
+
+    results = {
+        "villages": len(rows),
+        "list_of_dicts_mb": dict_mb,
+        "village_columns_mb": columns_mb,
+    }
+
+    for name, villages_in in (("dicts", rows), ("columns", store)):
+        out_dir = work / f"build_{name}"
+        shutil.rmtree(out_dir, ignore_errors=True)
+        _, peak, _ = traced(lambda: build_dataset(
+            raw["province"], raw["regency"], raw["district"], villages_in, out_dir
+        ))
+        results[f"build_dataset_peak_mb.{name}"] = peak
+    return results
+
+
+# Linux carries the RSS high-water mark of the forking process over exec,
+# so `cmd` is started (and waited for) by a fresh interpreter instead of
+# this one, which has pandas and the synthetic data loaded
+_WAIT4 = (
+    "import os, subprocess, sys\n"
+    "proc = subprocess.Popen(sys.argv[1:], stdout=subprocess.DEVNULL)\n"
+    "_, status, usage = os.wait4(proc.pid, 0)\n"
+    "print(os.waitstatus_to_exitcode(status), usage.ru_maxrss)\n"
+)
+
+
+def run_peak_rss_mb(cmd: list[str], cwd: Path) -> float:
+    """Run `cmd` and return the peak RSS of that child process."""
+    out = subprocess.run(
+        [sys.executable, "-c", _WAIT4, *cmd],
+        cwd=cwd, check=True, capture_output=True, text=True,
+    ).stdout.split()
+    returncode, maxrss = int(out[0]), int(out[1])
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, cmd)
+    # KiB on Linux, bytes on macOS
+    return round(maxrss / (MIB if sys.platform == "darwin" else 1024), 1)
+
+
+def bench_full_run(pdf_path: Path, work: Path, repo: Path, engine: str) -> dict:
+    out_dir = work / "run" / "datasets"
+    shutil.rmtree(work / "run", ignore_errors=True)
+    peak = run_peak_rss_mb(
+        [
+            sys.executable, "-m", "kepmendagri_parser",
+            "--input", str(pdf_path),
+            "--output", str(out_dir),
+            "--engine", engine,
+            "--checkpoint-every", "0",
+        ],
+        cwd=repo,
+    )
+    return {"peak_rss_mb": peak}
+
+
+def generate_pdf(pdf_path: Path, sizes) -> dict:
+    """Generate the synthetic PDF in a child process (keeps this one small)."""
+    subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.synthetic_pdf", str(pdf_path),
+            "--provinces", str(sizes.provinces),
+            "--regencies", str(sizes.regencies_per_province),
+            "--districts", str(sizes.districts_per_regency),
+            "--villages", str(sizes.villages_per_district),
+            "--rows-per-page", str(sizes.rows_per_page),
+        ],
+        cwd=REPO_ROOT,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+    return {
+        "villages": sizes.provinces * sizes.regencies_per_province
+        * sizes.districts_per_regency * sizes.villages_per_district,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure memory of the village store and peak RSS of a full run"
+    )
+    parser.add_argument("--villages", type=int, default=83_000, help="Rows for the store benchmark")
+    parser.add_argument("--size", choices=sorted(SIZES), default="medium", help="Synthetic PDF size")
+    parser.add_argument("--engine", default="pdfium")
+    parser.add_argument("--repo", type=Path, default=REPO_ROOT, help="Checkout to run the pipeline from")
+    parser.add_argument("--skip-run", action="store_true", help="Only run the store benchmark")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="kepmendagri-mem-"))
+    try:
+        report = {"git_commit": git_commit()}
+
+        # before anything is allocated here: a forked child starts with
+        # the parent's resident pages
+        if not args.skip_run:
+            pdf_path = work / "synthetic.pdf"
+            info = generate_pdf(pdf_path, SIZES[args.size])
+            run = bench_full_run(pdf_path, work, args.repo.resolve(), args.engine)
+            print(f"\n=== FULL RUN ({info['villages']} villages) ===")
+            print(f"peak RSS        : {run['peak_rss_mb']:8.1f} MiB ({args.repo})")
+            report["full_run"] = {"repo": str(args.repo), "pdf": info, **run}
+
+        store = bench_store(args.villages, work)
+        print(f"\n=== VILLAGE STORE ({store['villages']} villages) ===")
+        print(f"list of dicts   : {store['list_of_dicts_mb']:8.1f} MiB")
+        print(f"VillageColumns  : {store['village_columns_mb']:8.1f} MiB")
+        print(f"build_dataset   : {store['build_dataset_peak_mb.dicts']:8.1f} MiB peak (dict input)")
+        print(f"build_dataset   : {store['build_dataset_peak_mb.columns']:8.1f} MiB peak (column input)")
+
+        report["store"] = store
+
+        if args.output:
+            args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            print(f"✔ Results written to {args.output}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
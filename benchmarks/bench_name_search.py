@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Latency and recall of lookup.NameSearch versus a linear scan (offline).
+
+Runs against a datasets directory (--datasets) or, by default, against
+a synthetic one written by build_dataset whose names repeat like the
+real edition (a few thousand common names such as "Sukamaju" shared by
+many villages, the rest mostly unique).
+
+Queries are random villages, as free text the way an address
+normaliser sees it:
+
+- exact      the village name
+- typo       one character dropped
+- context    "Kel. <village>, <district>"
+- parent     the village name, constrained to its regency
+
+For every kind the report has the p50 / p95 latency and the share of
+queries whose village is among the results. The linear scan scores the
+same Dice coefficient against every name (trigram sets precomputed, so
+it is the best case for a scan) on a subset of the queries.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_name_search
+    python -m benchmarks.bench_name_search --datasets datasets --output search.json
+"""
+
+import argparse
+import csv
+import json
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_memory import synthetic_rows
+from benchmarks.bench_pipeline import git_commit
+from kepmendagri_parser.builders.dataset_builder import build_dataset
+from kepmendagri_parser.lookup.name_search import NameSearch, dice, parse_query, trigrams
+from kepmendagri_parser.utils.name_key import name_key
+
+SYLLABLES = [
+    "su", "ka", "ma", "ju", "me", "kar", "sa", "ri", "mul", "ya", "ta", "ni",
+    "ba", "ru", "ja", "ti", "wa", "ngi", "pa", "dang", "lam", "pung", "si",
+    "rang", "ke", "bon", "tan", "jung", "gu", "nung", "ci", "ra", "de", "let",
+]
+SUFFIXES = ["", "", "", " Jaya", " Baru", " Lama", " Timur", " Barat", " Utara", " Selatan", " Atas"]
+
+
+def synthetic_name(rng: random.Random) -> str:
+    word = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return word.capitalize() + rng.choice(SUFFIXES)
+
+
+def build_synthetic(out_dir: Path, villages: int, seed: int = 0) -> Path:
+    rng = random.Random(seed)
+    raw = synthetic_rows(villages)
+    common = [synthetic_name(rng) for _ in range(2000)]
+    # Zipf-like: a few common names are shared by hundreds of villages
+    weights = [1 / (i + 1) for i in range(len(common))]
+    for row in raw["village"]:
+        if rng.random() < 0.3:
+            row["name"] = rng.choices(common, weights)[0]
+        else:
+            row["name"] = synthetic_name(rng)
+    for row in raw["district"]:
+        row["name"] = synthetic_name(rng)
+    build_dataset(raw["province"], raw["regency"], raw["district"], raw["village"], out_dir)
+    return out_dir
+
+
+def make_queries(datasets_dir: Path, count: int, seed: int = 0) -> list[dict]:
+    with open(datasets_dir / "regions_id.csv", newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    rng = random.Random(seed)
+    queries = []
+    for row in rng.sample(rows, min(count, len(rows))):
+        name = row["village_name"]
+        cut = rng.randrange(1, len(name)) if len(name) > 3 else len(name)
+        base = {"code": row["village_code"], "name": name}
+        queries += [
+            {**base, "kind": "exact", "query": name},
+            {**base, "kind": "typo", "query": name[:cut - 1] + name[cut:]},
+            {**base, "kind": "context", "query": f"Kel. {name}, {row['district_name']}"},
+            {**base, "kind": "parent", "query": name, "parent": row["regency_code"]},
+        ]
+    return queries
+
+
+def linear_scan(entries: list[tuple[str, set[str]]], query: str, limit: int) -> list[tuple[float, str]]:
+    """Dice against every name: the best a scan without an index can do."""
+    key, _, _ = parse_query(query)
+    grams = trigrams(key)
+    scored = [(dice(grams, g), code) for code, g in entries]
+    scored.sort(key=lambda s: (-s[0], s[1]))
+    return scored[:limit]
+
+
+def percentile(values: list[float], q: float) -> float:
+    return statistics.quantiles(values, n=100)[int(q) - 1] if len(values) > 1 else values[0]
+
+
+def bench(datasets_dir: Path, queries: int, scan_queries: int, limit: int) -> dict:
+    start = time.perf_counter()
+    search = NameSearch.load(datasets_dir)
+    results = {"build_s": time.perf_counter() - start, "entries": len(search)}
+
+    by_kind: dict[str, list] = {}
+    for q in make_queries(datasets_dir, queries):
+        start = time.perf_counter()
+        matches = search.search(q["query"], parent=q.get("parent"), limit=limit)
+        elapsed = time.perf_counter() - start
+        hit = any(m.region.code == q["code"] for m in matches)
+        # equal names are equally good answers without context
+        same_name = bool(matches) and name_key(matches[0].region.name) == name_key(q["name"])
+        by_kind.setdefault(q["kind"], []).append((elapsed, hit, same_name))
+
+    for kind, runs in by_kind.items():
+        latencies = [r[0] * 1e6 for r in runs]
+        results[f"{kind}.p50_us"] = percentile(latencies, 50)
+        results[f"{kind}.p95_us"] = percentile(latencies, 95)
+        results[f"{kind}.found"] = sum(r[1] for r in runs) / len(runs)
+        results[f"{kind}.top1_same_name"] = sum(r[2] for r in runs) / len(runs)
+
+    # linear scan over the same entries
+    index = search.index
+    entries = [
+        (r.code, trigrams(name_key(r.name)))
+        for level in search.levels
+        for r in index.regions(level)
+    ]
+    exact = [q for q in make_queries(datasets_dir, scan_queries) if q["kind"] == "exact"]
+    latencies, agree = [], 0
+    for q in exact:
+        start = time.perf_counter()
+        scanned = linear_scan(entries, q["query"], limit)
+        latencies.append((time.perf_counter() - start) * 1e6)
+        matches = search.search(q["query"], limit=limit)
+        agree += bool(matches) and round(matches[0].score, 6) == round(scanned[0][0], 6)
+    results["scan.p50_us"] = percentile(latencies, 50)
+    results["scan.p95_us"] = percentile(latencies, 95)
+    results["scan.top_score_agrees"] = agree / len(exact)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark NameSearch against a linear scan")
+    parser.add_argument("--datasets", type=Path, help="Datasets directory (default: synthetic)")
+    parser.add_argument("--villages", type=int, default=83_000, help="Villages of the synthetic dataset")
+    parser.add_argument("--queries", type=int, default=1000, help="Villages queried (4 queries each)")
+    parser.add_argument("--scan-queries", type=int, default=30, help="Villages queried with the linear scan")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    work = Path(tempfile.mkdtemp(prefix="kepmendagri-search-"))
+    try:
+        datasets_dir = args.datasets or build_synthetic(work / "datasets", args.villages)
+        results = bench(datasets_dir, args.queries, args.scan_queries, args.limit)
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+    print(f"\n=== NAME SEARCH ({results['entries']} names, built in {results['build_s']:.2f}s) ===")
+    for kind in ("exact", "typo", "context", "parent"):
+        print(
+            f"{kind:<8}: p50 {results[f'{kind}.p50_us']:8.0f} us   "
+            f"p95 {results[f'{kind}.p95_us']:8.0f} us   "
+            f"found {results[f'{kind}.found']:6.1%}   "
+            f"top-1 same name {results[f'{kind}.top1_same_name']:6.1%}"
+        )
+    print(
+        f"scan    : p50 {results['scan.p50_us']:8.0f} us   "
+        f"p95 {results['scan.p95_us']:8.0f} us   "
+        f"top score agrees {results['scan.top_score_agrees']:6.1%}"
+    )
+
+    if args.output:
+        report = {
+            "git_commit": git_commit(),
+            "datasets": str(args.datasets or f"synthetic:{args.villages}"),
+            "queries": args.queries,
+            "limit": args.limit,
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"✔ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
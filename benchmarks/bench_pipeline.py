@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark on synthetic Kepmendagri-style PDFs (fully offline).
+
+Generates a synthetic PDF at the requested size, then times:
+
+- run_pipeline          full parse + build, with the per-stage metrics
+                        report of `--metrics-out`
+- build_dataset         in-memory, pandas and streaming builders on the
+                        same raw rows, per build step, and whether their
+                        CSVs are byte-identical to build_dataset
+- compare scripts       scripts/compare_regions.py (districts, villages)
+                        and scripts/compare_regions_id.py on a perturbed
+                        copy of the generated datasets
+
+Results are written as JSON; pass a previous result with --baseline to
+print the change of every timing.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_pipeline --size medium --output bench.json
+    python -m benchmarks.bench_pipeline --size medium --baseline bench.json
+"""
+
+import argparse
+import copy
+import csv
+import importlib.util
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.synthetic_pdf import SyntheticSizes, generate_synthetic_pdf
+from kepmendagri_parser.builders.dataset_builder import (
+    LEVEL_OUTPUTS,
+    REGIONS_ID_OUTPUT,
+    build_dataset,
+    build_dataset_streaming,
+)
+from kepmendagri_parser.builders.dataset_builder_pandas import build_dataset_pandas
+from kepmendagri_parser.builders.external_sort import SpillSorter
+from kepmendagri_parser.extractors.engines import ENGINES, DEFAULT_ENGINE, get_engine
+from kepmendagri_parser.pipeline.page_parser import iter_page_results
+from kepmendagri_parser.pipeline.runner import run_pipeline
+from kepmendagri_parser.pipeline.stitch import PageStitcher
+from kepmendagri_parser.utils.metrics import PipelineMetrics
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+SIZES = {
+    "small": SyntheticSizes(3, 4, 5, 12),
+    "medium": SyntheticSizes(6, 8, 8, 20),
+    "large": SyntheticSizes(10, 10, 10, 30),
+    # about the size of the real edition (~85k villages)
+    "full": SyntheticSizes(38, 14, 20, 8),
+}
+
+
+# =========================
+# Helpers
+# =========================
+
+def load_script(name: str):
+    """Import a module from scripts/ (not a package)."""
+    scripts_dir = REPO_ROOT / "scripts"
+    # the scripts import their siblings (region_diff) as top-level modules
+    if str(scripts_dir) not in sys.path:
+        sys.path.insert(0, str(scripts_dir))
+    path = scripts_dir / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"scripts_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timed(fn, repeat: int) -> tuple[dict, object]:
+    """Run `fn` `repeat` times; returns timing stats and the last result."""
+    runs = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        runs.append(time.perf_counter() - started)
+    return {
+        "runs": [round(r, 6) for r in runs],
+        "best": round(min(runs), 6),
+        "mean": round(sum(runs) / len(runs), 6),
+    }, result
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_raw_rows(pdf_path: Path, engine_name: str) -> dict[str, list[dict]]:
+    engine = get_engine(engine_name)
+    stitcher = PageStitcher()
+    with engine.open(pdf_path) as pdf:
+        for result in iter_page_results(pdf, 1, len(pdf.pages), engine=engine):
+            if not stitcher.feed(result):
+                break
+    return {
+        "province": stitcher.province_rows,
+        "regency": stitcher.regency_rows,
+        "district": stitcher.district_rows,
+        "village": stitcher.village_rows,
+    }
+
+
+def perturb_csv(src: Path, dst: Path, key: str, name_field: str, every: int = 50):
+    """
+    Copy of a dataset CSV with a predictable amount of change:
+    every `every`-th row renamed, dropped, or duplicated under a new code.
+    """
+    with open(src, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        fieldnames = reader.fieldnames
+        rows = list(reader)
+
+    out = []
+    for i, row in enumerate(rows):
+        if i % every == 1:
+            row = {**row, name_field: row[name_field] + " Baru"}
+        elif i % every == 2:
+            continue
+        out.append(row)
+        if i % every == 3:
+            # sorts right after `row`, so the copy stays in code order
+            out.append({**row, key: row[key] + "9"})
+
+    with open(dst, "w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=fieldnames)
+        w.writeheader()
+        w.writerows(out)
+
+
+# =========================
+# Benchmarks
+# =========================
+
+def bench_pipeline(pdf_path: Path, work: Path, engine: str, workers: int, repeat: int) -> dict:
+    out_dir = work / "pipeline" / "datasets"
+    metrics_path = work / "pipeline" / "metrics.json"
+
+    def run():
+        shutil.rmtree(out_dir, ignore_errors=True)
+        run_pipeline(
+            pdf_path=pdf_path,
+            out_dir=out_dir,
+            engine_name=engine,
+            workers=workers,
+            checkpoint_every=0,
+            metrics_out=metrics_path,
+        )
+
+    timing, _ = timed(run, repeat)
+    return {
+        **timing,
+        "metrics": json.loads(metrics_path.read_text(encoding="utf-8")),
+        "datasets": out_dir,
+    }
+
+
+def bench_build(raw: dict, work: Path, repeat: int) -> dict:
+    results = {}
+
+    def args():
+        # the builders do not mutate their input, but keep runs independent
+        return (
+            copy.deepcopy(raw["province"]),
+            copy.deepcopy(raw["regency"]),
+            copy.deepcopy(raw["district"]),
+            copy.deepcopy(raw["village"]),
+        )
+
+    builders = (
+        ("build_dataset", build_dataset),
+        ("build_dataset_pandas", build_dataset_pandas),
+        ("build_dataset_streaming", build_dataset_streaming),
+    )
+    for name, build in builders:
+        out_dir = work / name
+        metrics = PipelineMetrics()
+        streaming = build is build_dataset_streaming
+
+        def run(incremental=False):
+            if not incremental:
+                shutil.rmtree(out_dir, ignore_errors=True)
+            provinces, regencies, districts, villages = args()
+            if streaming:
+                sorter = SpillSorter(work / "spill", key=lambda r: r["code"])
+                sorter.extend(villages)
+                villages = sorter
+            return build(provinces, regencies, districts, villages, out_dir, metrics=metrics)
+
+        timing, _ = timed(run, repeat)
+        metrics.stages.clear()
+        run()
+        steps = {k.removeprefix("build."): round(v, 6) for k, v in metrics.stages.items()}
+
+        # nothing changed since the previous build: incremental no-op
+        unchanged, report = timed(lambda: run(incremental=True), repeat)
+
+        results[name] = {**timing, "steps": steps, "unchanged_rebuild": {
+            **unchanged, "rebuilt": report["rebuilt"],
+        }}
+
+    reference = work / "build_dataset"
+    for name, _ in builders[1:]:
+        results[name]["identical_to_build_dataset"] = all(
+            (reference / f).read_bytes() == (work / name / f).read_bytes()
+            for f in (*LEVEL_OUTPUTS, REGIONS_ID_OUTPUT)
+        )
+
+    return results
+
+
+def bench_compare(datasets: Path, work: Path, repeat: int) -> dict:
+    compare_regions = load_script("compare_regions")
+    compare_regions_id = load_script("compare_regions_id")
+
+    old_dir = work / "old"
+    old_dir.mkdir(parents=True, exist_ok=True)
+    perturb_csv(datasets / "districts.csv", old_dir / "districts.csv", "code", "name")
+    perturb_csv(datasets / "villages.csv", old_dir / "villages.csv", "code", "name")
+    perturb_csv(
+        datasets / "regions_id.csv", old_dir / "regions_id.csv", "village_code", "village_name"
+    )
+
+    results = {}
+    for level in ("districts", "villages"):
+        timing, (stats, _) = timed(
+            lambda: compare_regions.compare(
+                old_dir / f"{level}.csv", datasets / f"{level}.csv", work / f"{level}_diff.csv"
+            ),
+            repeat,
+        )
+        results[f"compare_regions.{level}"] = {**timing, "stats": dict(stats)}
+
+    timing, (_, summary) = timed(
+        lambda: compare_regions_id.compare(
+            old_dir / "regions_id.csv", datasets / "regions_id.csv", work / "regions_id_diff"
+        ),
+        repeat,
+    )
+    results["compare_regions_id"] = {**timing, "summary": summary}
+    return results
+
+
+# =========================
+# Report
+# =========================
+
+def flatten_timings(report: dict, prefix: str = "") -> dict[str, float]:
+    """Every `best` timing and stage timing (p50 per page), keyed by dotted path."""
+    out = {}
+    for k, v in report.items():
+        path = f"{prefix}{k}"
+        if isinstance(v, dict):
+            if "best" in v:
+                out[path] = v["best"]
+            if k in ("steps", "stages"):
+                for s, t in v.items():
+                    # per page type stages are summaries: compare medians
+                    out[f"{path}.{s}"] = t["p50"] if isinstance(t, dict) else t
+            else:
+                out.update(flatten_timings(v, f"{path}."))
+    return out
+
+
+def print_baseline_diff(report: dict, baseline: dict):
+    current = flatten_timings(report["results"])
+    previous = flatten_timings(baseline.get("results", {}))
+
+    print(f"\n=== CHANGE VS BASELINE ({baseline.get('git_commit') or 'unknown commit'}) ===")
+    for key in sorted(current):
+        if key not in previous or not previous[key]:
+            continue
+        ratio = current[key] / previous[key]
+        flag = "  ⚠️" if ratio > 1.1 else ""
+        print(f"{key:60} {previous[key]:10.4f}s → {current[key]:10.4f}s  ({ratio:5.2f}x){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark the pipeline on synthetic Kepmendagri-style PDFs"
+    )
+    parser.add_argument("--size", choices=sorted(SIZES), default="small")
+    parser.add_argument("--provinces", type=int, help="Override the size preset")
+    parser.add_argument("--regencies", type=int, help="Per province")
+    parser.add_argument("--districts", type=int, help="Per regency")
+    parser.add_argument("--villages", type=int, help="Per district")
+    parser.add_argument("--engine", choices=sorted(ENGINES), default=DEFAULT_ENGINE)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per benchmark (best is kept)")
+    parser.add_argument("--workdir", type=Path, help="Keep generated files here")
+    parser.add_argument("--output", type=Path, help="Write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="Previous results JSON to compare with")
+    args = parser.parse_args()
+
+    preset = SIZES[args.size]
+    sizes = SyntheticSizes(
+        provinces=args.provinces or preset.provinces,
+        regencies_per_province=args.regencies or preset.regencies_per_province,
+        districts_per_regency=args.districts or preset.districts_per_regency,
+        villages_per_district=args.villages or preset.villages_per_district,
+        rows_per_page=preset.rows_per_page,
+    )
+
+    work = args.workdir or Path(tempfile.mkdtemp(prefix="kepmendagri-bench-"))
+    work.mkdir(parents=True, exist_ok=True)
+
+    try:
+        pdf_path = work / "synthetic.pdf"
+        generate_timing, info = timed(lambda: generate_synthetic_pdf(pdf_path, sizes), 1)
+        print(f"📄 Synthetic PDF: {info['pages']} pages, {info['villages']} villages")
+
+        pipeline = bench_pipeline(pdf_path, work, args.engine, args.workers, args.repeat)
+        datasets = pipeline.pop("datasets")
+        print(f"⏱️ run_pipeline : {pipeline['best']:.3f}s")
+
+        raw = parse_raw_rows(pdf_path, args.engine)
+        build = bench_build(raw, work / "build", args.repeat)
+        for name, r in build.items():
+            identical = r.get("identical_to_build_dataset")
+            parity = "" if identical is None else f", {'identical' if identical else 'DIFFERENT'} CSVs"
+            print(
+                f"⏱️ {name:24}: {r['best']:.3f}s "
+                f"(unchanged rebuild {r['unchanged_rebuild']['best']:.3f}s{parity})"
+            )
+
+        compare = bench_compare(datasets, work / "compare", args.repeat)
+        for name, r in compare.items():
+            print(f"⏱️ {name:24}: {r['best']:.3f}s")
+
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "engine": args.engine,
+            "workers": args.workers,
+            "sizes": vars(sizes),
+            "pdf": info,
+            "results": {
+                "generate_pdf": generate_timing,
+                "run_pipeline": pipeline,
+                **build,
+                **compare,
+            },
+        }
+
+        if args.output:
+            args.output.write_text(
+                json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8"
+            )
+            print(f"✔ Results written to {args.output}")
+
+        if args.baseline:
+            print_baseline_diff(report, json.loads(args.baseline.read_text(encoding="utf-8")))
+
+    finally:
+        if not args.workdir:
+            shutil.rmtree(work, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark and parity check for kepmendagri_parser.utils.text_normalize.
+
+Runs the shared, precompiled helpers and the inline `re.sub` code they
+replaced over the same synthetic cells (header cells, village and
+district names with numbering, tabs, newlines, repeated and non-breaking
+spaces). Every result must be identical to the previous behaviour;
+the script exits 1 on any difference. The expected outputs themselves
+are pinned by tests/test_text_normalize.py.
+
+normalize_header is memoised and the synthetic headers repeat, so the
+"normalize_header" case times the uncached function; the cached call
+is reported separately.
+
+Usage (from the repository root):
+
+    python -m benchmarks.bench_text_normalize --cells 100000
+"""
+
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+from kepmendagri_parser.utils.text_normalize import (
+    clean_name,
+    normalize_header,
+    strip_leading_number,
+    strip_leading_number_word,
+)
+
+# =========================
+# Previous inline implementations (reference behaviour)
+# =========================
+
+def legacy_normalize_header(cell):
+    # page_classifier compiled this and redefined the helper on every page
+    LETTER_SPACING_RE = re.compile(r"(?<=\b[A-Z])\s+(?=[A-Z]\b)")
+    if not cell:
+        return ""
+    s = cell.upper()
+    s = LETTER_SPACING_RE.sub("", s)
+    s = re.sub(r"\*+\)", "", s)
+    s = re.sub(r"\s+", " ", s).strip()
+    return s.split()[-1] if s else ""
+
+
+def legacy_clean_name(value):
+    if not value:
+        return None
+    value = re.sub(r"[\n\r\t]+", " ", value)
+    value = re.sub(r"\s{2,}", " ", value)
+    return value.strip()
+
+
+def legacy_village_name(name):
+    return legacy_clean_name(re.sub(r"^\d+\s*", "", name))
+
+
+def legacy_district_name(name):
+    return re.sub(r"^\d+\s+", "", name)
+
+
+def village_name(name):
+    return clean_name(strip_leading_number(name))
+
+
+# =========================
+# Synthetic cells
+# =========================
+
+HEADERS = [
+    "NO", "N O", "KODE", "K O D E", "PROVINSI", "P R O V I N S I *)",
+    "NAMA KABUPATEN /\nKOTA", "NAMA PROVINSI /\nKAB/KOTA /\nKECAMATAN",
+    "NAMA\nKELURAHAN **)", "NAMA DESA", "IBUKOTA", "JUMLAH\nPENDUDUK *)", "",
+]
+
+WORDS = [
+    "Sukamaju", "Tanjung", "Sari", "Mekar", "Jaya", "Batu", "Gunung",
+    "Kampung", "Baru", "Lama", "Rejo", "Sumber", "Padang", "Air",
+]
+
+SEPARATORS = [" ", " ", " ", " ", "  ", "\n", "\t", "\xa0", " \n "]
+
+
+def synthetic_names(n: int, rng: random.Random) -> list[str]:
+    names = []
+    for _ in range(n):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(1, 3))]
+        name = words[0]
+        for w in words[1:]:
+            name += rng.choice(SEPARATORS) + w
+
+        kind = rng.random()
+        if kind < 0.5:
+            name = f"{rng.randint(1, 300)} {name}"
+        elif kind < 0.6:
+            name = f"{rng.randint(1, 300)}{name}"
+        if rng.random() < 0.1:
+            name += rng.choice([" ", "\n", "  "])
+        names.append(name)
+    return names
+
+
+def synthetic_headers(n: int, rng: random.Random) -> list[str]:
+    return [rng.choice(HEADERS) for _ in range(n)]
+
+
+# =========================
+# Benchmark
+# =========================
+
+def best_of(fn, cells, repeat: int) -> tuple[float, list]:
+    best = None
+    out = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        out = [fn(c) for c in cells]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, out
+
+
+CASES = [
+    ("normalize_header", "headers", legacy_normalize_header, normalize_header.__wrapped__),
+    ("  (cached)", "headers", legacy_normalize_header, normalize_header),
+    ("clean_name", "names", legacy_clean_name, clean_name),
+    ("village name", "names", legacy_village_name, village_name),
+    ("district name", "names", legacy_district_name, strip_leading_number_word),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark shared text normalisation against the inline regex code"
+    )
+    parser.add_argument("--cells", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", type=Path, help="Write results as JSON")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cells = {
+        "headers": synthetic_headers(args.cells, rng),
+        "names": synthetic_names(args.cells, rng),
+    }
+
+    report = {"cells": args.cells, "cases": {}}
+    failed = False
+
+    print(f"\n=== TEXT NORMALISATION ({args.cells} cells) ===")
+    for name, kind, legacy, shared in CASES:
+        legacy_s, expected = best_of(legacy, cells[kind], args.repeat)
+        shared_s, actual = best_of(shared, cells[kind], args.repeat)
+
+        mismatches = [
+            {"cell": c, "expected": e, "actual": a}
+            for c, e, a in zip(cells[kind], expected, actual)
+            if e != a
+        ]
+        failed |= bool(mismatches)
+
+        report["cases"][name] = {
+            "legacy_seconds": round(legacy_s, 6),
+            "shared_seconds": round(shared_s, 6),
+            "speedup": round(legacy_s / shared_s, 2) if shared_s else None,
+            "mismatches": len(mismatches),
+        }
+        print(
+            f"{name:18}: {legacy_s * 1000:8.1f} ms → {shared_s * 1000:8.1f} ms "
+            f"({legacy_s / shared_s:4.1f}x), parity "
+            f"{'OK' if not mismatches else f'{len(mismatches)} MISMATCHES'}"
+        )
+        for m in mismatches[:5]:
+            print(f"  {m['cell']!r}: {m['expected']!r} != {m['actual']!r}")
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+"""
+Synthetic Kepmendagri-style PDF generator (offline, no third-party deps).
+
+The generated document mimics the four table layouts recognised by
+`classify_page`:
+
+- PROVINSI       : NO | KODE | PROVINSI | aggregates...
+- KAB_KOTA       : NO | KODE | NAMA KABUPATEN / KOTA | aggregates... | IBUKOTA
+- KECAMATAN      : NO | KODE | NAMA PROVINSI / KAB/KOTA / KECAMATAN | IBUKOTA | ...
+- KELURAHAN_DESA : KODE | ... | NAMA KELURAHAN | NAMA DESA | KET
+
+plus a text-only cover page and a trailing text-only page so the pipeline
+sees the same UNKNOWN → sections → UNKNOWN shape as the real document.
+
+Usage (from the repository root):
+
+    python -m benchmarks.synthetic_pdf synthetic.pdf --provinces 5 --villages 20
+"""
+
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+
+PAGE_WIDTH = 842
+PAGE_HEIGHT = 595
+MARGIN_X = 30
+TOP_Y = 560
+ROW_HEIGHT = 14
+FONT_SIZE = 7
+
+WORDS = [
+    "Aceh", "Banda", "Batu", "Bukit", "Danau", "Gunung", "Indah", "Jaya",
+    "Karang", "Kuala", "Lama", "Makmur", "Mulia", "Padang", "Pasir", "Rejo",
+    "Sari", "Sejahtera", "Sido", "Sumber", "Tanjung", "Teluk", "Wangi",
+]
+
+
+@dataclass
+class SyntheticSizes:
+    provinces: int = 3
+    regencies_per_province: int = 4
+    districts_per_regency: int = 5
+    villages_per_district: int = 12
+    rows_per_page: int = 30
+
+
+def region_name(seed: int, words: int = 2) -> str:
+    parts = []
+    for i in range(words):
+        parts.append(WORDS[(seed * 7 + i * 13) % len(WORDS)])
+    return " ".join(parts)
+
+
+# =========================
+# Minimal PDF writer
+# =========================
+
+def _escape(text: str) -> str:
+    return (
+        text.replace("\\", "\\\\")
+        .replace("(", "\\(")
+        .replace(")", "\\)")
+    )
+
+
+class PdfCanvas:
+    def __init__(self):
+        self.ops: list[str] = []
+
+    def line(self, x0, y0, x1, y1):
+        self.ops.append(f"{x0:.2f} {y0:.2f} m {x1:.2f} {y1:.2f} l S")
+
+    def text(self, x, y, value: str, size: int = FONT_SIZE):
+        self.ops.append(
+            f"BT /F1 {size} Tf {x:.2f} {y:.2f} Td ({_escape(value)}) Tj ET"
+        )
+
+    def table(self, col_widths: list[float], rows: list[list[str]]):
+        xs = [MARGIN_X]
+        for w in col_widths:
+            xs.append(xs[-1] + w)
+
+        ys = [TOP_Y - i * ROW_HEIGHT for i in range(len(rows) + 1)]
+
+        for y in ys:
+            self.line(xs[0], y, xs[-1], y)
+        for x in xs:
+            self.line(x, ys[0], x, ys[-1])
+
+        for r, row in enumerate(rows):
+            baseline = ys[r] - ROW_HEIGHT + 4
+            for c, cell in enumerate(row):
+                if cell:
+                    self.text(xs[c] + 2, baseline, cell)
+
+    def content(self) -> bytes:
+        return ("0.5 w\n" + "\n".join(self.ops)).encode("latin-1")
+
+
+def write_pdf(pages: list[PdfCanvas], path: Path):
+    objects: list[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog_id = add(b"")
+    pages_id = add(b"")
+    font_id = add(
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>"
+    )
+
+    page_ids = []
+    for canvas in pages:
+        data = canvas.content()
+        content_id = add(
+            b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+        )
+        page_ids.append(add(
+            (
+                f"<< /Type /Page /Parent {pages_id} 0 R "
+                f"/MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+                f"/Contents {content_id} 0 R >>"
+            ).encode("latin-1")
+        ))
+
+    kids = " ".join(f"{i} 0 R" for i in page_ids)
+    objects[catalog_id - 1] = f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode()
+    objects[pages_id - 1] = (
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for i, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{i} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_at = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n".encode()
+    out += b"0000000000 65535 f \n"
+    for off in offsets:
+        out += f"{off:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
+        f"startxref\n{xref_at}\n%%EOF\n"
+    ).encode()
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(bytes(out))
+
+
+# =========================
+# Kepmendagri layouts
+# =========================
+
+def _chunks(rows: list, size: int):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def text_page(lines: list[str]) -> PdfCanvas:
+    canvas = PdfCanvas()
+    y = TOP_Y
+    for line in lines:
+        canvas.text(MARGIN_X, y, line, size=10)
+        y -= 16
+    return canvas
+
+
+def build_hierarchy(sizes: SyntheticSizes) -> list[dict]:
+    provinces = []
+    seed = 0
+    for p in range(sizes.provinces):
+        prov_code = f"{11 + p:02d}"
+        regencies = []
+        for r in range(sizes.regencies_per_province):
+            seed += 1
+            is_city = r % 4 == 3
+            reg_code = f"{prov_code}.{(71 + r) if is_city else (1 + r):02d}"
+            districts = []
+            for d in range(sizes.districts_per_regency):
+                seed += 1
+                dist_code = f"{reg_code}.{d + 1:02d}"
+                villages = []
+                for v in range(sizes.villages_per_district):
+                    seed += 1
+                    urban = v % 5 == 0
+                    villages.append({
+                        "code": f"{dist_code}.{(1001 if urban else 2001) + v:04d}",
+                        "name": region_name(seed),
+                        "urban": urban,
+                    })
+                districts.append({
+                    "code": dist_code,
+                    "name": region_name(seed + 3),
+                    "villages": villages,
+                })
+            regencies.append({
+                "code": reg_code,
+                "kind": "Kota" if is_city else "Kabupaten",
+                "name": region_name(seed + 5),
+                "capital": region_name(seed + 11, 1) + " Kota",
+                "districts": districts,
+            })
+        provinces.append({
+            "code": prov_code,
+            "name": region_name(p + 101),
+            "capital": region_name(p + 41, 1) + " Raya",
+            "regencies": regencies,
+        })
+    return provinces
+
+
+def province_pages(hierarchy, sizes) -> list[PdfCanvas]:
+    header = [
+        "NO", "KODE", "PROVINSI", "KAB", "KOTA", "KEC", "KEL", "DESA",
+        "LUAS", "PENDUDUK", "PULAU",
+    ]
+    widths = [25, 35, 150, 45, 45, 45, 45, 45, 60, 70, 45]
+    body = [
+        [str(i + 1), p["code"], p["name"], "1", "1", "1", "1", "1",
+         "100", "1000", str(10 + i)]
+        for i, p in enumerate(hierarchy)
+    ]
+    pages = []
+    for chunk in _chunks(body, sizes.rows_per_page):
+        canvas = PdfCanvas()
+        canvas.table(widths, [header] + chunk)
+        pages.append(canvas)
+    return pages
+
+
+def regency_pages(hierarchy, sizes) -> list[PdfCanvas]:
+    header = ["NO", "KODE", "NAMA KABUPATEN / KOTA", "KEC", "KEL", "DESA", "IBUKOTA"]
+    widths = [25, 40, 200, 40, 40, 40, 120]
+    body = []
+    n = 0
+    for p in hierarchy:
+        for r in p["regencies"]:
+            n += 1
+            body.append([
+                str(n), r["code"], f'{r["kind"]} {r["name"]}',
+                str(len(r["districts"])), "1", "1", r["capital"],
+            ])
+    pages = []
+    for chunk in _chunks(body, sizes.rows_per_page):
+        canvas = PdfCanvas()
+        canvas.table(widths, [header] + chunk)
+        pages.append(canvas)
+    return pages
+
+
+def district_pages(hierarchy, sizes) -> list[PdfCanvas]:
+    header = ["NO", "KODE", "NAMA PROVINSI / KAB/KOTA / KECAMATAN", "IBUKOTA", "KEL", "DESA"]
+    widths = [25, 50, 220, 140, 40, 40]
+    body = []
+    for p in hierarchy:
+        body.append(["", p["code"], p["name"], p["capital"], "", ""])
+        for r in p["regencies"]:
+            body.append(["", r["code"], f'{r["kind"]} {r["name"]}', r["capital"], "", ""])
+            for i, d in enumerate(r["districts"], start=1):
+                body.append([str(i), d["code"], d["name"], "", "1", "1"])
+    pages = []
+    for chunk in _chunks(body, sizes.rows_per_page):
+        canvas = PdfCanvas()
+        canvas.table(widths, [header] + chunk)
+        pages.append(canvas)
+    return pages
+
+
+def village_pages(hierarchy, sizes) -> list[PdfCanvas]:
+    header = ["KODE", "NAMA", "JML", "LUAS", "PDDK", "NAMA KELURAHAN", "NAMA DESA", "KET"]
+    widths = [70, 150, 30, 40, 40, 140, 140, 40]
+    body = []
+    for p in hierarchy:
+        for r in p["regencies"]:
+            for d in r["districts"]:
+                body.append([d["code"], d["name"], "", "", "", "", "", ""])
+                for i, v in enumerate(d["villages"], start=1):
+                    kel = f'{i} {v["name"]}' if v["urban"] else ""
+                    desa = "" if v["urban"] else f'{i} {v["name"]}'
+                    body.append([v["code"], "", "", "", "", kel, desa, ""])
+    pages = []
+    for chunk in _chunks(body, sizes.rows_per_page):
+        canvas = PdfCanvas()
+        canvas.table(widths, [header] + chunk)
+        pages.append(canvas)
+    return pages
+
+
+def generate_synthetic_pdf(path: Path, sizes: SyntheticSizes | None = None) -> dict:
+    sizes = sizes or SyntheticSizes()
+    hierarchy = build_hierarchy(sizes)
+
+    sections = {
+        "provinsi": province_pages(hierarchy, sizes),
+        "kab_kota": regency_pages(hierarchy, sizes),
+        "kecamatan": district_pages(hierarchy, sizes),
+        "kelurahan_desa": village_pages(hierarchy, sizes),
+    }
+
+    pages = [text_page([
+        "KEPUTUSAN MENTERI DALAM NEGERI REPUBLIK INDONESIA",
+        "TENTANG PEMBERIAN DAN PEMUTAKHIRAN KODE, DATA WILAYAH ADMINISTRASI",
+    ])]
+    layout = {}
+    for name, section in sections.items():
+        layout[name] = [len(pages) + 1, len(pages) + len(section)]
+        pages.extend(section)
+    pages.append(text_page(["MENTERI DALAM NEGERI REPUBLIK INDONESIA"]))
+
+    write_pdf(pages, path)
+
+    return {
+        "pages": len(pages),
+        "sections": layout,
+        "provinces": sizes.provinces,
+        "regencies": sizes.provinces * sizes.regencies_per_province,
+        "districts": (
+            sizes.provinces * sizes.regencies_per_province
+            * sizes.districts_per_regency
+        ),
+        "villages": (
+            sizes.provinces * sizes.regencies_per_province
+            * sizes.districts_per_regency * sizes.villages_per_district
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Generate a synthetic Kepmendagri-style PDF"
+    )
+    parser.add_argument("output", type=Path)
+    parser.add_argument("--provinces", type=int, default=3)
+    parser.add_argument("--regencies", type=int, default=4, help="Per province")
+    parser.add_argument("--districts", type=int, default=5, help="Per regency")
+    parser.add_argument("--villages", type=int, default=12, help="Per district")
+    parser.add_argument("--rows-per-page", type=int, default=30)
+    args = parser.parse_args()
+
+    info = generate_synthetic_pdf(
+        args.output,
+        SyntheticSizes(
+            provinces=args.provinces,
+            regencies_per_province=args.regencies,
+            districts_per_regency=args.districts,
+            villages_per_district=args.villages,
+            rows_per_page=args.rows_per_page,
+        ),
+    )
+    print(f"✔ Synthetic PDF written: {args.output} ({info['pages']} pages)")
+
+
+if __name__ == "__main__":
+    main()
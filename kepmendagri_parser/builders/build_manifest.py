@@ -0,0 +1,106 @@
+import json
+import os
+from pathlib import Path
+
+# manifests live in the pipeline's work dir next to the output directory
+# (<parent>/.tmp/build-manifests/<out_dir name>.json), so they never end
+# up in the published datasets
+WORK_DIR_NAME = ".tmp"
+MANIFEST_DIR = "build-manifests"
+# where builds before that kept it: inside the output directory
+LEGACY_MANIFEST_NAME = ".build-manifest.json"
+
+
+def manifest_path(out_dir: Path) -> Path:
+    out_dir = out_dir.resolve()
+    return out_dir.parent / WORK_DIR_NAME / MANIFEST_DIR / f"{out_dir.name}.json"
+
+
+class BuildManifest:
+    """
+    Content hashes of the files written by the last build of `out_dir`.
+
+    An output is current when the file still has the size and mtime
+    recorded after it was written, and the content hash of the rows about
+    to be written (or of the inputs it is derived from) is unchanged.
+    Current outputs are not rewritten, so their mtime, and everything
+    downstream of them, stays untouched. CSV entries also hold their row
+    count, so release metadata never has to re-read the files.
+    """
+
+    def __init__(self, out_dir: Path):
+        self.path = manifest_path(out_dir)
+        self.legacy_path = out_dir / LEGACY_MANIFEST_NAME
+        self.out_dir = out_dir
+        self.files = {}
+        for path in (self.path, self.legacy_path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.files = json.load(f).get("files", {})
+                break
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        self.rebuilt: list[str] = []
+        self.unchanged: list[str] = []
+
+    def _intact(self, name: str, entry: dict) -> bool:
+        try:
+            st = (self.out_dir / name).stat()
+        except FileNotFoundError:
+            return False
+        return st.st_size == entry.get("bytes") and st.st_mtime_ns == entry.get("mtime_ns")
+
+    def is_current(self, name: str, sha256: str | None = None, inputs: str | None = None) -> bool:
+        entry = self.files.get(name)
+        if not entry or not self._intact(name, entry):
+            return False
+        if sha256 is not None and entry.get("sha256") != sha256:
+            return False
+        if inputs is not None and entry.get("inputs") != inputs:
+            return False
+        return True
+
+    def keep(self, name: str, inputs: str | None = None, rows: int | None = None):
+        if inputs is not None:
+            self.files[name]["inputs"] = inputs
+        if rows is not None:
+            self.files[name]["rows"] = rows
+        self.unchanged.append(name)
+
+    def record(
+        self, name: str, sha256: str, inputs: str | None = None, rows: int | None = None
+    ):
+        st = (self.out_dir / name).stat()
+        entry = {"sha256": sha256, "bytes": st.st_size, "mtime_ns": st.st_mtime_ns}
+        if inputs is not None:
+            entry["inputs"] = inputs
+        if rows is not None:
+            entry["rows"] = rows
+        self.files[name] = entry
+        self.rebuilt.append(name)
+
+    def sha256(self, name: str) -> str | None:
+        entry = self.files.get(name)
+        return entry["sha256"] if entry else None
+
+    def rows(self, name: str) -> int | None:
+        entry = self.files.get(name)
+        return entry.get("rows") if entry else None
+
+    def intact_entry(self, name: str) -> dict | None:
+        """The recorded entry of `name`, if the file is still the one recorded."""
+        entry = self.files.get(name)
+        if entry and self._intact(name, entry):
+            return entry
+        return None
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"files": self.files}, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+        self.legacy_path.unlink(missing_ok=True)
+
+    def report(self) -> dict[str, list[str]]:
+        return {"rebuilt": list(self.rebuilt), "unchanged": list(self.unchanged)}
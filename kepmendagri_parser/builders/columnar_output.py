@@ -0,0 +1,113 @@
+"""
+Optional columnar copies of the CSV datasets (needs `pyarrow`).
+
+- parquet   Parquet with dictionary encoding (the repeated province /
+            regency names of regions_id compress to a few KB)
+- arrow     Arrow IPC file (Feather v2), uncompressed so readers can
+            memory-map it without copying; low-cardinality columns are
+            dictionary-encoded
+
+Each file is converted from the CSV the build has just written, so it
+holds exactly the same rows for every builder. Codes stay strings (they
+are identifiers, "1101" not 1101); empty CSV fields are nulls. A file
+is only rewritten when its CSV changed (BuildManifest inputs).
+"""
+
+from pathlib import Path
+
+from kepmendagri_parser.builders.build_manifest import BuildManifest
+from kepmendagri_parser.utils.generate_release_metadata import sha256_file
+
+COLUMNAR_FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+# CSV columns that are not plain strings
+BOOL_COLUMNS = {"regencies.csv": ["is_administrative"]}
+
+# at most this many distinct values per row count: dictionary-encode (arrow)
+DICTIONARY_RATIO = 0.5
+
+
+def _pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise RuntimeError(
+            "Parquet / Arrow outputs need pyarrow (pip install pyarrow)"
+        ) from None
+    import pyarrow.csv
+    import pyarrow.feather
+    import pyarrow.parquet
+
+    return pyarrow
+
+
+def read_csv_table(csv_path: Path):
+    """A dataset CSV as an Arrow table with the column types of the dataset."""
+    pa = _pyarrow()
+
+    with open(csv_path, encoding="utf-8") as f:
+        header = f.readline().rstrip("\r\n").split(",")
+
+    bools = set(BOOL_COLUMNS.get(csv_path.name, ()))
+    types = {c: pa.bool_() if c in bools else pa.string() for c in header}
+    return pa.csv.read_csv(
+        csv_path,
+        convert_options=pa.csv.ConvertOptions(
+            column_types=types,
+            # only empty fields are nulls ("NA" is a name, not a missing value)
+            null_values=[""],
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _dictionary_encoded(table):
+    pa = _pyarrow()
+    columns = []
+    for column in table.columns:
+        if (
+            pa.types.is_string(column.type)
+            and len(column)
+            and len(column.unique()) <= len(column) * DICTIONARY_RATIO
+        ):
+            column = column.dictionary_encode()
+        columns.append(column)
+    return pa.table(columns, names=table.column_names)
+
+
+def write_columnar(csv_path: Path, fmt: str) -> Path:
+    """Write the `fmt` copy of a dataset CSV next to it; returns its path."""
+    pa = _pyarrow()
+    table = read_csv_table(csv_path)
+    path = csv_path.with_suffix(COLUMNAR_FORMATS[fmt])
+    tmp = path.with_name(path.name + ".tmp")
+
+    if fmt == "parquet":
+        pa.parquet.write_table(
+            table, tmp, use_dictionary=True, compression="zstd"
+        )
+    else:
+        pa.feather.write_feather(_dictionary_encoded(table), tmp, compression="uncompressed")
+
+    tmp.replace(path)
+    return path
+
+
+def write_columnar_outputs(
+    manifest: BuildManifest, csv_names: list[str], formats: list[str], stage
+):
+    """
+    Columnar copies of `csv_names` in every format of `formats`, rebuilt
+    only when the CSV they were converted from changed.
+    """
+    for fmt in formats:
+        for csv_name in csv_names:
+            name = Path(csv_name).with_suffix(COLUMNAR_FORMATS[fmt]).name
+            inputs = manifest.sha256(csv_name)
+            rows = manifest.rows(csv_name)
+            if manifest.is_current(name, inputs=inputs):
+                manifest.keep(name, rows=rows)
+                continue
+            with stage(f"write.{name}"):
+                path = write_columnar(manifest.out_dir / csv_name, fmt)
+            manifest.record(name, sha256_file(path), inputs=inputs, rows=rows)
@@ -1,18 +1,134 @@
+import hashlib
+import heapq
+import os
+from contextlib import nullcontext
 from pathlib import Path
 from collections import defaultdict
+from typing import Iterable
 import csv
 
+from kepmendagri_parser.builders.build_manifest import BuildManifest
+from kepmendagri_parser.builders.columnar_output import (
+    COLUMNAR_FORMATS,
+    write_columnar_outputs,
+)
+from kepmendagri_parser.builders.sqlite_output import (
+    SQLITE_FORMAT,
+    write_sqlite_output,
+)
+from kepmendagri_parser.builders.validation import (
+    ForeignKeyValidator,
+    assert_foreign_keys,
+)
+from kepmendagri_parser.models.columns import INVALID_CODE, VillageColumns, VillageType
+from kepmendagri_parser.models.region_code import Level, parse_code
+
 # =========================
 # Helpers: CSV IO
 # =========================
 
-def write_csv(path: Path, rows: list[dict], fieldnames: list[str]):
+class HashingWriter:
+    """
+    Text sink for csv writers that hashes the UTF-8 bytes it receives and
+    forwards them to `f` (if any). The digest equals the SHA256 of the
+    file that `write_csv` produces for the same rows.
+    """
+
+    def __init__(self, f=None):
+        self._f = f
+        self._hash = hashlib.sha256()
+
+    def write(self, s: str):
+        self._hash.update(s.encode("utf-8"))
+        if self._f is not None:
+            self._f.write(s)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _write_rows(sink, rows: Iterable[dict], fieldnames: list[str]) -> int:
+    w = csv.DictWriter(sink, fieldnames=fieldnames)
+    w.writeheader()
+    count = 0
+    for r in rows:
+        w.writerow({k: r.get(k) for k in fieldnames})
+        count += 1
+    return count
+
+
+def write_csv(path: Path, rows: Iterable[dict], fieldnames: list[str]) -> tuple[str, int]:
+    """Write rows as CSV; returns the SHA256 of the written file and its row count."""
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=fieldnames)
-        w.writeheader()
+        sink = HashingWriter(f)
+        count = _write_rows(sink, rows, fieldnames)
+    return sink.hexdigest(), count
+
+
+class StagedCsvWriter:
+    """
+    Row-by-row CSV writer that writes to `<path>.tmp` and only replaces
+    the final file on `publish()`, so a validation error raised midway
+    through a streaming build never leaves partial datasets behind.
+    Output is byte-identical to `write_csv`.
+    """
+
+    def __init__(self, path: Path, fieldnames: list[str]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self.fieldnames = fieldnames
+        self._f = open(self.tmp_path, "w", newline="", encoding="utf-8")
+        self._sink = HashingWriter(self._f)
+        self._w = csv.DictWriter(self._sink, fieldnames=fieldnames)
+        self._w.writeheader()
+        self.rows = 0
+
+    @property
+    def sha256(self) -> str:
+        """SHA256 of everything written so far."""
+        return self._sink.hexdigest()
+
+    def writerow(self, r: dict):
+        self._w.writerow({k: r.get(k) for k in self.fieldnames})
+        self.rows += 1
+
+    def writerows(self, rows: Iterable[dict]):
         for r in rows:
-            w.writerow({k: r.get(k) for k in fieldnames})
+            self.writerow(r)
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def publish(self):
+        self.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self):
+        self.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+PROVINCE_FIELDS = ["code", "name", "capital"]
+REGENCY_FIELDS = ["code", "province_code", "name", "capital", "type", "is_administrative"]
+DISTRICT_FIELDS = ["code", "regency_code", "name"]
+VILLAGE_FIELDS = ["code", "district_code", "name", "type"]
+REGIONS_ID_FIELDS = [
+    "province_code",
+    "province_name",
+    "province_capital",
+    "regency_code",
+    "regency_name",
+    "regency_type",
+    "regency_capital",
+    "district_code",
+    "district_name",
+    "village_code",
+    "village_name",
+    "village_type",
+]
 
 
 # =========================
@@ -51,12 +167,17 @@ def assert_fk(
                     if k in c:
                         lines.append(f"  {k} = {c[k]}")
 
-            sample = sorted(list(parent_values))[:10]
+            sample = heapq.nsmallest(10, parent_values)
             lines.append(f"  known {parent_key}s (sample): {sample}")
 
             raise ValueError("\n".join(lines))
 
 
+def code_key(row: dict) -> int:
+    """Sort key of a row: its integer region code (sorts like the code string)."""
+    return parse_code(row["code"])
+
+
 # =========================
 # Normalize Builders
 # =========================
@@ -73,7 +194,7 @@ def normalize_district(district_rows: list[dict]) -> list[dict]:
 
     # validations
     assert_unique(out, "code", "district")
-    return sorted(out, key=lambda x: x["code"])
+    return sorted(out, key=code_key)
 
 def normalize_regency_name_and_flags(name: str):
     if not name:
@@ -125,7 +246,7 @@ def normalize_regency(regency_rows: list[dict], districts: list[dict]):
         })
 
     assert_unique(out, "code", "regency")
-    return sorted(out, key=lambda x: x["code"])
+    return sorted(out, key=code_key)
 
 def normalize_province(province_rows: list[dict], districts: list[dict]) -> list[dict]:
     by_province = defaultdict(set)
@@ -155,22 +276,49 @@ def normalize_province(province_rows: list[dict], districts: list[dict]) -> list
 
     # validations
     assert_unique(out, "code", "province")
-    return sorted(out, key=lambda x: x["code"])
-
-
-def normalize_village(village_rows: list[dict]) -> list[dict]:
-    out = []
-    for v in village_rows:
-        out.append({
-            "code": v["code"],
-            "district_code": v["district_code"],
-            "name": v.get("name"),
-            "type": v["type"],
-        })
-
-    # validations
-    assert_unique(out, "code", "village")
-    return sorted(out, key=lambda x: x["code"])
+    return sorted(out, key=code_key)
+
+
+def normalize_village(village_rows: Iterable[dict]) -> VillageColumns:
+    """
+    Villages as a VillageColumns store sorted by code. Iterating the
+    result yields the normalized rows (plus `source_page`).
+    """
+    villages = VillageColumns.from_rows(village_rows)
+
+    # validations: rows the store could not encode (a bad district_code
+    # is left to the foreign key check) ...
+    assert_encoded_villages(villages)
+
+    # ... and duplicates (sorted ints: duplicates are adjacent)
+    villages = villages.sorted_by_code()
+    codes = villages.code
+    for i in range(1, len(codes)):
+        if codes[i] == codes[i - 1]:
+            raise ValueError(f"[village] duplicate code: {villages.row(i)['code']}")
+    return villages
+
+
+def assert_encoded_villages(villages: VillageColumns):
+    """Raise one ValueError listing every village with a malformed code or an unknown type."""
+    lines = []
+    for i, row in sorted(villages.invalid.items()):
+        page = villages.source_page[i] or "?"
+        if villages.code[i] == INVALID_CODE:
+            lines.append(f"  page {page}: invalid code {row['code']!r}")
+        elif villages.type[i] == VillageType.UNKNOWN:
+            lines.append(f"  page {page}: {row['code']}: unknown type {row['type']!r}")
+    if lines:
+        raise ValueError("\n".join([f"[village] {len(lines)} invalid row(s)"] + lines))
+
+
+def normalize_village_row(v: dict) -> dict:
+    return {
+        "code": v["code"],
+        "district_code": v["district_code"],
+        "name": v.get("name"),
+        "type": v["type"],
+    }
 
 def build_regions_id(
     provinces: list[dict],
@@ -179,26 +327,43 @@ def build_regions_id(
     villages: list[dict],
 ) -> list[dict]:
 
-    province_by_code = {p["code"]: p for p in provinces}
-    regency_by_code  = {r["code"]: r for r in regencies}
-    district_by_code = {d["code"]: d for d in districts}
+    out = list(iter_regions_id(provinces, regencies, districts, villages))
 
-    out = []
+    assert_unique(out, "village_code", "village_denormalized")
+    return sorted(out, key=lambda x: parse_code(x["village_code"]))
 
-    for v in villages:
-        d = district_by_code.get(v["district_code"])
-        if not d:
-            continue
 
-        r = regency_by_code.get(d["regency_code"])
-        if not r:
-            continue
+def iter_regions_id(
+    provinces: list[dict],
+    regencies: list[dict],
+    districts: list[dict],
+    villages: Iterable[dict],
+) -> Iterable[dict]:
+    """
+    Denormalized village rows, in the order of `villages`.
+
+    Parents are joined on the stored parent codes: a village's
+    `district_code`, and that district's `regency_code` and
+    `province_code`. Villages whose parents are missing are skipped.
+    """
+    province_by_code = {p["code"]: p for p in provinces}
+    regency_by_code = {r["code"]: r for r in regencies}
 
+    # (district, regency, province) per district code, resolved once
+    parents_by_district = {}
+    for d in districts:
+        r = regency_by_code.get(d["regency_code"])
         p = province_by_code.get(d["province_code"])
-        if not p:
+        if r and p:
+            parents_by_district[d["code"]] = (d, r, p)
+
+    for v in villages:
+        parents = parents_by_district.get(v["district_code"])
+        if not parents:
             continue
+        d, r, p = parents
 
-        out.append({
+        yield {
             "province_code": p["code"],
             "province_name": p["name"],
             "province_capital": p["capital"],
@@ -211,10 +376,68 @@ def build_regions_id(
             "village_code": v["code"],
             "village_name": v["name"],
             "village_type": v["type"],
-        })
+        }
+
+# =========================
+# Incremental outputs
+# =========================
+
+LEVEL_OUTPUTS = ("provinces.csv", "regencies.csv", "districts.csv", "villages.csv")
+REGIONS_ID_OUTPUT = "regions_id.csv"
+
+
+def levels_digest(manifest: BuildManifest) -> str:
+    """Input hash of regions_id.csv: the hashes of the four level files."""
+    return digest_of_levels({name: manifest.sha256(name) for name in LEVEL_OUTPUTS})
+
+
+def digest_of_levels(sha256s: dict[str, str]) -> str:
+    """Combined hash of the four level files, from their SHA256 by file name."""
+    h = hashlib.sha256()
+    for name in LEVEL_OUTPUTS:
+        h.update(f"{name}:{sha256s[name]}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def write_format_outputs(manifest: BuildManifest, formats: Iterable[str], stage):
+    """The `--formats` outputs next to the CSVs written by this build."""
+    columnar = [f for f in formats if f in COLUMNAR_FORMATS]
+    write_columnar_outputs(manifest, [*LEVEL_OUTPUTS, REGIONS_ID_OUTPUT], columnar, stage)
+    if SQLITE_FORMAT in formats:
+        write_sqlite_output(manifest, stage, inputs=levels_digest(manifest))
+
+
+def write_csv_if_changed(
+    manifest: BuildManifest, name: str, rows: Iterable[dict], fieldnames: list[str]
+):
+    # hashed while staged: the rows are serialized once, changed or not
+    writer = StagedCsvWriter(manifest.out_dir / name, fieldnames)
+    try:
+        writer.writerows(rows)
+    except BaseException:
+        writer.discard()
+        raise
+    publish_if_changed(manifest, name, writer)
+
+
+def publish_if_changed(
+    manifest: BuildManifest, name: str, writer: StagedCsvWriter, inputs: str | None = None
+):
+    writer.close()
+    if manifest.is_current(name, sha256=writer.sha256):
+        writer.discard()
+        manifest.keep(name, inputs=inputs, rows=writer.rows)
+        return
+    writer.publish()
+    manifest.record(name, writer.sha256, inputs=inputs, rows=writer.rows)
+
+
+def _stage_timer(metrics):
+    """`metrics.stage` of a PipelineMetrics, or a no-op timer without one."""
+    if metrics is None:
+        return lambda name: nullcontext()
+    return lambda name: metrics.stage(f"build.{name}")
 
-    assert_unique(out, "village_code", "village_denormalized")
-    return sorted(out, key=lambda x: x["village_code"])
 
 # =========================
 # Orchestrator (1x run)
@@ -224,9 +447,28 @@ def build_dataset(
     province_rows: list[dict],
     regency_rows: list[dict],
     district_rows: list[dict],
-    village_rows: list[dict],
+    village_rows: Iterable[dict],
     out_dir: Path,
-):
+    metrics=None,
+    formats: list[str] = (),
+    strict_codes: bool = False,
+) -> dict[str, list[str]]:
+    """
+    Normalize, validate and write the five CSV datasets.
+
+    `village_rows` may be a list of dicts or a VillageColumns store; both
+    are normalized into a VillageColumns store.
+
+    Outputs whose content hash matches the previous build of `out_dir`
+    (see BuildManifest) are left untouched; regions_id.csv is not even
+    rebuilt when none of the four level files changed. `formats` adds
+    columnar copies ("parquet", "arrow") of every CSV. Returns the names
+    of the rebuilt and unchanged files. Sub-steps are timed into
+    `metrics` (a PipelineMetrics) when given. `strict_codes` also
+    requires every parent code column to be the prefix of the row's own
+    code (see builders.validation).
+    """
+    stage = _stage_timer(metrics)
 
     # districts_raw is used only for capital derivation
     # normalized districts intentionally drop capital fields
@@ -234,55 +476,165 @@ def build_dataset(
     districts_raw = district_rows
 
     # 1) normalize base
-    districts = normalize_district(district_rows)
+    with stage("normalize_district"):
+        districts = normalize_district(district_rows)
 
     # 2) regency (capital from district)
-    regencies = normalize_regency(regency_rows, districts_raw)
+    with stage("normalize_regency"):
+        regencies = normalize_regency(regency_rows, districts_raw)
 
     # 3) province (capital from regency → district)
-    provinces = normalize_province(province_rows, districts_raw)
+    with stage("normalize_province"):
+        provinces = normalize_province(province_rows, districts_raw)
 
     # 4) village (pure)
-    villages = normalize_village(village_rows)
+    with stage("normalize_village"):
+        villages = normalize_village(village_rows)
 
     # 5) foreign key validations (now all parents exist)
-    # assert_fk(regencies, "province_code", provinces, "code", "regency")
-    assert_fk(districts, "regency_code", regencies, "code", "district")
-    assert_fk(villages, "district_code", districts, "code", "village")
-
-    # 6) write FINAL datasets
-    write_csv(out_dir / "provinces.csv", provinces,
-              ["code", "name", "capital"])
-    write_csv(out_dir / "regencies.csv", regencies,
-              ["code", "province_code", "name", "capital", "type", "is_administrative"])
-    write_csv(out_dir / "districts.csv", districts,
-              ["code", "regency_code", "name", ])
-    write_csv(out_dir / "villages.csv", villages,
-              ["code", "district_code", "name", "type"])
-
-    # 7) denormalized village dataset
-    villages_denorm = build_regions_id(
-        provinces,
-        regencies,
-        districts,
-        villages,
-    )
-
-    write_csv(
-        out_dir / "regions_id.csv",
-        villages_denorm,
-        [
-            "province_code",
-            "province_name",
-            "province_capital",
-            "regency_code",
-            "regency_name",
-            "regency_type",
-            "regency_capital",
-            "district_code",
-            "district_name",
-            "village_code",
-            "village_name",
-            "village_type",
-        ],
-    )
\ No newline at end of file
+    with stage("validate_fk"):
+        assert_foreign_keys(
+            provinces,
+            regencies,
+            districts,
+            villages,
+            regency_rows=regency_rows,
+            district_rows=district_rows,
+            check_prefix=strict_codes,
+        )
+
+    # 6) write FINAL datasets (only those whose content changed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest = BuildManifest(out_dir)
+
+    with stage("write.provinces.csv"):
+        write_csv_if_changed(manifest, "provinces.csv", provinces, PROVINCE_FIELDS)
+    with stage("write.regencies.csv"):
+        write_csv_if_changed(manifest, "regencies.csv", regencies, REGENCY_FIELDS)
+    with stage("write.districts.csv"):
+        write_csv_if_changed(manifest, "districts.csv", districts, DISTRICT_FIELDS)
+    with stage("write.villages.csv"):
+        write_csv_if_changed(manifest, "villages.csv", villages, VILLAGE_FIELDS)
+
+    # 7) denormalized village dataset (derived from the four levels only)
+    inputs = levels_digest(manifest)
+    if manifest.is_current(REGIONS_ID_OUTPUT, inputs=inputs):
+        manifest.keep(REGIONS_ID_OUTPUT)
+    else:
+        # villages are sorted and unique: denormalized rows are streamed
+        # straight into the file instead of being built as a list first
+        with stage("write.regions_id.csv"):
+            digest, rows = write_csv(
+                out_dir / REGIONS_ID_OUTPUT,
+                iter_regions_id(provinces, regencies, districts, villages),
+                REGIONS_ID_FIELDS,
+            )
+        manifest.record(REGIONS_ID_OUTPUT, digest, inputs=inputs, rows=rows)
+
+    write_format_outputs(manifest, formats, stage)
+
+    manifest.save()
+    return manifest.report()
+
+
+# =========================
+# Orchestrator (streaming)
+# =========================
+
+def build_dataset_streaming(
+    province_rows: list[dict],
+    regency_rows: list[dict],
+    district_rows: list[dict],
+    village_rows,
+    out_dir: Path,
+    metrics=None,
+    formats: list[str] = (),
+    strict_codes: bool = False,
+) -> dict[str, list[str]]:
+    """
+    Bounded-memory variant of `build_dataset`.
+
+    `village_rows` is a SpillSorter (or any iterable yielding villages
+    sorted by code). Villages are validated and written to villages.csv
+    and regions_id.csv in a single merge pass, one row at a time; only
+    the small parent levels are held in memory. Outputs are identical to
+    `build_dataset`, and are published only once every check passed.
+    Staged files identical to the previous build are discarded instead
+    of replacing the published ones.
+    """
+    stage = _stage_timer(metrics)
+
+    districts_raw = district_rows
+
+    with stage("normalize_district"):
+        districts = normalize_district(district_rows)
+    with stage("normalize_regency"):
+        regencies = normalize_regency(regency_rows, districts_raw)
+    with stage("normalize_province"):
+        provinces = normalize_province(province_rows, districts_raw)
+
+    with stage("validate_fk"):
+        # villages are checked while streaming; all violations are
+        # reported together once the stream is done
+        fk = ForeignKeyValidator(provinces, regencies, districts, strict_codes)
+        fk.check_regencies(regency_rows)
+        fk.check_districts(district_rows)
+
+    writers = [
+        StagedCsvWriter(out_dir / "provinces.csv", PROVINCE_FIELDS),
+        StagedCsvWriter(out_dir / "regencies.csv", REGENCY_FIELDS),
+        StagedCsvWriter(out_dir / "districts.csv", DISTRICT_FIELDS),
+        StagedCsvWriter(out_dir / "villages.csv", VILLAGE_FIELDS),
+        StagedCsvWriter(out_dir / "regions_id.csv", REGIONS_ID_FIELDS),
+    ]
+    w_prov, w_reg, w_dist, w_vill, w_denorm = writers
+
+    def villages_checked():
+        previous = None
+        for v in village_rows:
+            row = normalize_village_row(v)
+
+            code = parse_code(row["code"], Level.VILLAGE)
+
+            # sorted input: duplicates are always adjacent
+            if code == previous:
+                raise ValueError(f"[village] duplicate code: {row['code']}")
+            previous = code
+
+            fk.check_village(v, code)
+
+            w_vill.writerow(row)
+            yield row
+
+    try:
+        with stage("write.provinces.csv"):
+            w_prov.writerows(provinces)
+        with stage("write.regencies.csv"):
+            w_reg.writerows(regencies)
+        with stage("write.districts.csv"):
+            w_dist.writerows(districts)
+
+        # villages: merge, validate and write villages.csv + regions_id.csv
+        with stage("stream_villages"):
+            w_denorm.writerows(
+                iter_regions_id(provinces, regencies, districts, villages_checked())
+            )
+        fk.raise_if_invalid()
+
+    except BaseException:
+        for w in writers:
+            w.discard()
+        raise
+
+    with stage("publish"):
+        manifest = BuildManifest(out_dir)
+        for name, w in zip(LEVEL_OUTPUTS, writers):
+            publish_if_changed(manifest, name, w)
+        publish_if_changed(
+            manifest, REGIONS_ID_OUTPUT, w_denorm, inputs=levels_digest(manifest)
+        )
+
+    write_format_outputs(manifest, formats, stage)
+
+    manifest.save()
+    return manifest.report()
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Delta of a build against a previous release (`--delta-from`).
+
+    delta/provinces.csv   op,code,name,capital
+    delta/regencies.csv   op,code,province_code,...
+    delta/districts.csv   op,code,regency_code,name
+    delta/villages.csv    op,code,district_code,name,type
+    delta/delta.json      base / target hashes and counts
+
+Every delta CSV holds the level columns plus `op`: `insert` and
+`update` rows carry the whole new row, `delete` rows only the code.
+Rows are sorted by code, like the datasets, so the applier
+(utils.apply_delta) patches a file in one streaming pass.
+
+delta.json records the SHA256 of each base file and their combined
+hash (`base_levels_sha256`, as in the SQLite bundle's meta table), so a
+delta is never applied to another release. It also records the hashes
+of the files the patch must produce, regions_id.csv included (the
+applier rebuilds it from the patched levels).
+"""
+
+import csv
+import json
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from kepmendagri_parser.builders.build_manifest import BuildManifest
+from kepmendagri_parser.builders.dataset_builder import (
+    LEVEL_OUTPUTS,
+    REGIONS_ID_OUTPUT,
+    digest_of_levels,
+)
+from kepmendagri_parser.utils.generate_release_metadata import sha256_file
+
+DELTA_DIR = "delta"
+DELTA_MANIFEST = "delta.json"
+DELTA_FORMAT_VERSION = 1
+
+INSERT, UPDATE, DELETE = "insert", "update", "delete"
+
+
+def read_csv_rows(path: Path) -> Iterator[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def join_by_code(
+    old_rows: Iterable[dict], new_rows: Iterable[dict]
+) -> Iterator[tuple[str, dict | None, dict | None]]:
+    """
+    (code, old row, new row) over two row streams sorted by code. Codes
+    of one level all have the same width, so string order is code order.
+    """
+    old_iter, new_iter = iter(old_rows), iter(new_rows)
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+
+    while old is not None or new is not None:
+        if new is None or (old is not None and old["code"] < new["code"]):
+            yield old["code"], old, None
+            old = next(old_iter, None)
+        elif old is None or new["code"] < old["code"]:
+            yield new["code"], None, new
+            new = next(new_iter, None)
+        else:
+            yield old["code"], old, new
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+
+
+def delta_rows(old_rows: Iterable[dict], new_rows: Iterable[dict]) -> Iterator[dict]:
+    """Delta rows (`op` plus the level columns) turning old_rows into new_rows."""
+    for code, old, new in join_by_code(old_rows, new_rows):
+        if new is None:
+            yield {"op": DELETE, "code": code}
+        elif old is None:
+            yield {"op": INSERT, **new}
+        elif old != new:
+            yield {"op": UPDATE, **new}
+
+
+def write_delta(base_dir: Path, manifest: BuildManifest) -> Path:
+    """
+    Write `<out_dir>/delta/` turning the release in `base_dir` into the
+    one just built (described by `manifest`). Returns the delta directory.
+    """
+    out_dir = manifest.out_dir
+    delta_dir = out_dir / DELTA_DIR
+    delta_dir.mkdir(parents=True, exist_ok=True)
+
+    base = {}
+    for name in LEVEL_OUTPUTS:
+        path = base_dir / name
+        if not path.exists():
+            raise FileNotFoundError(f"Missing base dataset file: {path}")
+        base[name] = sha256_file(path)
+
+    counts = {}
+    for name in LEVEL_OUTPUTS:
+        with open(out_dir / name, encoding="utf-8") as f:
+            fieldnames = f.readline().rstrip("\r\n").split(",")
+        level_counts = {INSERT: 0, UPDATE: 0, DELETE: 0}
+        tmp = delta_dir / (name + ".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            w = csv.DictWriter(f, fieldnames=["op", *fieldnames])
+            w.writeheader()
+            for row in delta_rows(read_csv_rows(base_dir / name), read_csv_rows(out_dir / name)):
+                level_counts[row["op"]] += 1
+                w.writerow(row)
+        tmp.replace(delta_dir / name)
+        counts[name] = level_counts
+
+    target = {
+        name: {"sha256": manifest.sha256(name), "bytes": (out_dir / name).stat().st_size}
+        for name in [*LEVEL_OUTPUTS, REGIONS_ID_OUTPUT]
+    }
+    delta = {
+        "format_version": DELTA_FORMAT_VERSION,
+        "base": base,
+        "base_levels_sha256": digest_of_levels(base),
+        "target": target,
+        "target_levels_sha256": digest_of_levels({n: target[n]["sha256"] for n in LEVEL_OUTPUTS}),
+        "changes": counts,
+    }
+    (delta_dir / DELTA_MANIFEST).write_text(json.dumps(delta, indent=2), encoding="utf-8")
+    return delta_dir
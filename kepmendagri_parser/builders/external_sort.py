@@ -0,0 +1,86 @@
+import heapq
+import json
+from itertools import count
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+_sorter_ids = count()
+
+
+class SpillSorter:
+    """
+    External merge sort for row dicts.
+
+    Rows are buffered in memory up to `max_rows_in_memory`, then sorted
+    and spilled to a JSONL run file in `spill_dir`. `sorted()` merges all
+    runs in a single pass, so resident memory stays bounded by the buffer
+    size no matter how many rows are appended.
+
+    Drop-in for the row lists used by the stitcher (append / extend / len).
+    """
+
+    def __init__(
+        self,
+        spill_dir: Path,
+        key: Callable[[dict], object],
+        max_rows_in_memory: int = 50_000,
+    ):
+        self.spill_dir = spill_dir
+        self.key = key
+        self.max_rows_in_memory = max_rows_in_memory
+
+        self._id = next(_sorter_ids)
+        self._buffer: list[dict] = []
+        self._runs: list[Path] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, row: dict):
+        self._buffer.append(row)
+        self._count += 1
+        if len(self._buffer) >= self.max_rows_in_memory:
+            self._spill()
+
+    def extend(self, rows: Iterable[dict]):
+        for r in rows:
+            self.append(r)
+
+    def _spill(self):
+        if not self._buffer:
+            return
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"run-{self._id}-{len(self._runs):05d}.jsonl"
+
+        self._buffer.sort(key=self.key)
+        with open(path, "w", encoding="utf-8") as f:
+            for r in self._buffer:
+                f.write(json.dumps(r, ensure_ascii=False))
+                f.write("\n")
+
+        self._runs.append(path)
+        self._buffer = []
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[dict]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def sorted(self) -> Iterator[dict]:
+        """Yield all rows ordered by key (stable: ties keep append order)."""
+        self._buffer.sort(key=self.key)
+        runs = [self._read_run(p) for p in self._runs]
+        return heapq.merge(*runs, self._buffer, key=self.key)
+
+    def __iter__(self) -> Iterator[dict]:
+        return self.sorted()
+
+    def close(self):
+        for p in self._runs:
+            p.unlink(missing_ok=True)
+        self._runs = []
+        self._buffer = []
+        self._count = 0
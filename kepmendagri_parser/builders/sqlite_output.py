@@ -0,0 +1,202 @@
+"""
+Optional SQLite bundle of the datasets (`--formats sqlite`).
+
+One file, region-id.sqlite, meant to be opened read-only by lookup
+services:
+
+    sqlite3.connect("file:region-id.sqlite?mode=ro&immutable=1", uri=True)
+    PRAGMA mmap_size = 268435456;
+
+- provinces / regencies / districts / villages: the CSV rows, code as
+  primary key (WITHOUT ROWID, so a code lookup is one B-tree search) and
+  a foreign key to the parent table
+- an index on every parent code column (children of a region are one
+  index range) and on `name_key`, the normalised name of utils.name_key
+- names_fts: FTS5 index over district and village names
+- regions_id: view with the columns of regions_id.csv
+- meta: schema version and the hash of the level CSVs it was built from
+
+The bundle is loaded from the CSVs the build has just written (empty
+fields become NULL) and rebuilt only when one of them changed. The
+statements are the same on every build, so identical CSVs give a
+byte-identical file.
+"""
+
+import csv
+import sqlite3
+from pathlib import Path
+
+from kepmendagri_parser.builders.build_manifest import BuildManifest
+from kepmendagri_parser.utils.generate_release_metadata import sha256_file
+from kepmendagri_parser.utils.name_key import name_key
+
+SQLITE_FORMAT = "sqlite"
+SQLITE_OUTPUT = "region-id.sqlite"
+SCHEMA_VERSION = 1
+
+# table → source CSV, in parent before child order
+TABLES = {
+    "provinces": "provinces.csv",
+    "regencies": "regencies.csv",
+    "districts": "districts.csv",
+    "villages": "villages.csv",
+}
+
+SCHEMA = """
+CREATE TABLE meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE provinces (
+    code TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    capital TEXT,
+    name_key TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE regencies (
+    code TEXT PRIMARY KEY,
+    province_code TEXT NOT NULL REFERENCES provinces (code),
+    name TEXT NOT NULL,
+    capital TEXT,
+    type TEXT NOT NULL,
+    is_administrative INTEGER NOT NULL,
+    name_key TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE districts (
+    code TEXT PRIMARY KEY,
+    regency_code TEXT NOT NULL REFERENCES regencies (code),
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE villages (
+    code TEXT PRIMARY KEY,
+    district_code TEXT NOT NULL REFERENCES districts (code),
+    name TEXT NOT NULL,
+    type TEXT,
+    name_key TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE VIRTUAL TABLE names_fts USING fts5 (
+    name_key,
+    name UNINDEXED,
+    level UNINDEXED,
+    code UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+CREATE VIEW regions_id AS
+SELECT
+    p.code AS province_code,
+    p.name AS province_name,
+    p.capital AS province_capital,
+    r.code AS regency_code,
+    r.name AS regency_name,
+    r.type AS regency_type,
+    r.capital AS regency_capital,
+    d.code AS district_code,
+    d.name AS district_name,
+    v.code AS village_code,
+    v.name AS village_name,
+    v.type AS village_type
+FROM villages v
+JOIN districts d ON d.code = v.district_code
+JOIN regencies r ON r.code = d.regency_code
+JOIN provinces p ON p.code = r.province_code;
+"""
+
+# created after the bulk load (one sorted build instead of row-by-row inserts)
+INDEXES = """
+CREATE INDEX regencies_province_code ON regencies (province_code);
+CREATE INDEX districts_regency_code ON districts (regency_code);
+CREATE INDEX villages_district_code ON villages (district_code);
+CREATE INDEX provinces_name_key ON provinces (name_key);
+CREATE INDEX regencies_name_key ON regencies (name_key);
+CREATE INDEX districts_name_key ON districts (name_key);
+CREATE INDEX villages_name_key ON villages (name_key);
+"""
+
+# level → table with the names indexed by names_fts
+FTS_LEVELS = {"district": "districts", "village": "villages"}
+
+
+def _read_rows(csv_path: Path):
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            # empty CSV fields are NULLs
+            yield {k: (v if v != "" else None) for k, v in row.items()}
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows, columns: list[str]):
+    placeholders = ", ".join(f":{c}" for c in columns)
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})",
+        rows,
+    )
+
+
+def write_sqlite(out_dir: Path, digest: str) -> Path:
+    """Build region-id.sqlite from the level CSVs in `out_dir`; returns its path."""
+    path = out_dir / SQLITE_OUTPUT
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    conn = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        # a fresh temporary file: no journal needed, a crash just discards it
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.executescript(SCHEMA)
+
+        conn.execute("BEGIN")
+        conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?)",
+            [("schema_version", str(SCHEMA_VERSION)), ("levels_sha256", digest)],
+        )
+        for table, csv_name in TABLES.items():
+            rows = _read_rows(out_dir / csv_name)
+            if table == "regencies":
+                rows = (
+                    {**r, "is_administrative": int(r["is_administrative"] == "True")}
+                    for r in rows
+                )
+            rows = ({**r, "name_key": name_key(r["name"])} for r in rows)
+            with open(out_dir / csv_name, encoding="utf-8") as f:
+                columns = f.readline().rstrip("\r\n").split(",")
+            _insert(conn, table, rows, [*columns, "name_key"])
+
+        for level, table in FTS_LEVELS.items():
+            conn.execute(
+                "INSERT INTO names_fts (name_key, name, level, code) "
+                f"SELECT name_key, name, '{level}', code FROM {table} ORDER BY code"
+            )
+        conn.execute("COMMIT")
+        conn.executescript(INDEXES)
+
+        # one FTS segment, planner statistics, no free pages
+        conn.execute("INSERT INTO names_fts (names_fts) VALUES ('optimize')")
+        conn.execute("ANALYZE")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    tmp.replace(path)
+    return path
+
+
+def write_sqlite_output(manifest: BuildManifest, stage, inputs: str):
+    """
+    region-id.sqlite, rebuilt only when the level CSVs changed
+    (`inputs` is their combined hash, see dataset_builder.levels_digest).
+    """
+    if manifest.is_current(SQLITE_OUTPUT, inputs=inputs):
+        manifest.keep(SQLITE_OUTPUT)
+        return
+    with stage(f"write.{SQLITE_OUTPUT}"):
+        path = write_sqlite(manifest.out_dir, inputs)
+    manifest.record(SQLITE_OUTPUT, sha256_file(path), inputs=inputs)
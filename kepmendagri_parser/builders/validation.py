@@ -0,0 +1,196 @@
+"""
+Foreign key validation over all region levels in one pass.
+
+Parent code sets are indexed once (as integer codes, see
+models.region_code). Every child row is checked against them and every
+violation is collected instead of stopping at the first one. The report
+groups violations by the PDF page the child row was parsed from, so a
+single run shows every problem of a bad parse.
+
+Relations checked (the parent column must be a known parent code):
+
+- regency  → province   (`province_code`)
+- district → regency    (`regency_code`, and `province_code`)
+- village  → district   (`district_code`)
+
+With `check_prefix=True` (`--strict-codes`) the parent column must also
+be the parent derived from the row's own code: code // 100 for regencies
+and districts (code // 10^4 for a district's province), code // 10^4
+for villages.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable
+
+from kepmendagri_parser.models.columns import VillageColumns
+from kepmendagri_parser.models.region_code import (
+    PARENT_DIVISORS,
+    Level,
+    ancestor_code,
+    parse_code,
+)
+
+# violations listed per page before the rest is summarised
+MAX_PER_PAGE = 20
+
+
+@dataclass
+class FkViolation:
+    label: str              # child level: "regency", "district", "village"
+    code: str               # child code
+    key: str                # parent column, e.g. "district_code"
+    value: str | None       # parent column value
+    expected: str           # parent code derived from the child code
+    known: bool             # whether `value` is a known parent code
+    source_page: int | None
+
+    def describe(self) -> str:
+        if not self.known:
+            problem = f"unknown {self.key.removesuffix('_code')}"
+        else:
+            problem = "not the parent of the code"
+        return (
+            f"[{self.label}] {self.code}: {self.key} = {self.value} "
+            f"({problem}, expected {self.expected})"
+        )
+
+
+class ForeignKeyError(ValueError):
+    """All foreign key violations of a build, grouped by source page."""
+
+    def __init__(self, violations: list[FkViolation]):
+        self.violations = violations
+        super().__init__(format_violations(violations))
+
+
+def format_violations(violations: list[FkViolation]) -> str:
+    by_page = defaultdict(list)
+    for v in violations:
+        by_page[v.source_page].append(v)
+
+    lines = [f"[fk] {len(violations)} invalid foreign key(s) on {len(by_page)} page(s)"]
+    # known pages in order, rows without a page last
+    for page in sorted(by_page, key=lambda p: (p is None, p or 0)):
+        page_violations = by_page[page]
+        lines.append(f"  page {page if page is not None else '?'}:")
+        for v in page_violations[:MAX_PER_PAGE]:
+            lines.append(f"    {v.describe()}")
+        if len(page_violations) > MAX_PER_PAGE:
+            lines.append(f"    … {len(page_violations) - MAX_PER_PAGE} more")
+    return "\n".join(lines)
+
+
+class ForeignKeyValidator:
+    """
+    Precomputed parent indexes plus the violations found so far.
+
+    `check_*` may be called in any order (the streaming builder checks
+    villages while it writes them); `raise_if_invalid()` raises one
+    ForeignKeyError with everything collected. `check_prefix` enables
+    the code prefix rule (see the module docstring).
+    """
+
+    def __init__(
+        self,
+        provinces: Iterable[dict],
+        regencies: Iterable[dict],
+        districts: Iterable[dict],
+        check_prefix: bool = False,
+    ):
+        self.province_codes = {parse_code(p["code"]) for p in provinces}
+        self.regency_codes = {parse_code(r["code"]) for r in regencies}
+        self.district_codes = {parse_code(d["code"]) for d in districts}
+        self.check_prefix = check_prefix
+        self.violations: list[FkViolation] = []
+
+    def _check(
+        self,
+        label: str,
+        row: dict,
+        key: str,
+        expected: int,
+        parent_codes: set[int],
+    ):
+        value = row.get(key)
+        known = _known(value, parent_codes)
+        if known and (not self.check_prefix or value == str(expected)):
+            return
+        self.violations.append(FkViolation(
+            label=label,
+            code=row["code"],
+            key=key,
+            value=value,
+            expected=str(expected),
+            known=known,
+            source_page=row.get("source_page"),
+        ))
+
+    def check_regencies(self, rows: Iterable[dict]):
+        divisor = PARENT_DIVISORS[Level.REGENCY]
+        for r in rows:
+            code = parse_code(r["code"])
+            self._check("regency", r, "province_code", code // divisor, self.province_codes)
+
+    def check_districts(self, rows: Iterable[dict]):
+        divisor = PARENT_DIVISORS[Level.DISTRICT]
+        for d in rows:
+            code = parse_code(d["code"])
+            self._check("district", d, "regency_code", code // divisor, self.regency_codes)
+            self._check(
+                "district", d, "province_code",
+                ancestor_code(code, Level.PROVINCE), self.province_codes,
+            )
+
+    def check_village(self, row: dict, code: int):
+        parent = code // PARENT_DIVISORS[Level.VILLAGE]
+        self._check("village", row, "district_code", parent, self.district_codes)
+
+    def check_villages(self, villages: Iterable[dict]):
+        if isinstance(villages, VillageColumns):
+            # compare the integer columns, build rows only for violations
+            divisor = PARENT_DIVISORS[Level.VILLAGE]
+            for i, (code, district_code) in enumerate(
+                zip(villages.code, villages.district_code)
+            ):
+                if district_code not in self.district_codes or (
+                    self.check_prefix and district_code != code // divisor
+                ):
+                    self.check_village(villages.row(i), code)
+            return
+
+        for v in villages:
+            self.check_village(v, parse_code(v["code"]))
+
+    def raise_if_invalid(self):
+        if self.violations:
+            raise ForeignKeyError(self.violations)
+
+
+def _known(value: str | None, parent_codes: set[int]) -> bool:
+    try:
+        return parse_code(value) in parent_codes
+    except (TypeError, AttributeError, ValueError):
+        return False
+
+
+def assert_foreign_keys(
+    provinces: list[dict],
+    regencies: list[dict],
+    districts: list[dict],
+    villages: Iterable[dict],
+    regency_rows: Iterable[dict] | None = None,
+    district_rows: Iterable[dict] | None = None,
+    check_prefix: bool = False,
+):
+    """
+    Check every relation against the normalized parent levels and raise
+    one ForeignKeyError listing all violations. Pass the raw
+    `regency_rows` / `district_rows` (which keep `source_page`) to have
+    pages in the report; the normalized rows are checked otherwise.
+    """
+    validator = ForeignKeyValidator(provinces, regencies, districts, check_prefix)
+    validator.check_regencies(regency_rows if regency_rows is not None else regencies)
+    validator.check_districts(district_rows if district_rows is not None else districts)
+    validator.check_villages(villages)
+    validator.raise_if_invalid()
@@ -1,38 +1,12 @@
-import re
 from kepmendagri_parser.pipeline.context import PageType
-from kepmendagri_parser.extractors.page_table import extract_page_table
+from kepmendagri_parser.utils.text_normalize import normalize_header
+from kepmendagri_parser.extractors.page_extraction import PageExtraction
 
 
-def classify_page(page) -> PageType:
-    tables = extract_page_table(page)
-    if not tables:
-        return PageType.UNKNOWN 
-
-    header = tables[0]
-
+def classify_header(header: list | None) -> PageType:
     if not header:
         return PageType.UNKNOWN
 
-    # helper
-    LETTER_SPACING_RE = re.compile(r"(?<=\b[A-Z])\s+(?=[A-Z]\b)")
-    def normalize_header(cell: str | None) -> str:
-        if not cell:
-            return ""
-
-        s = cell.upper()
-
-        # 1️⃣ rapatkan huruf yang terpisah satu-satu (K O D E → KODE)
-        s = LETTER_SPACING_RE.sub("", s)
-
-        # 2️⃣ buang footnote (*), **), dll
-        s = re.sub(r"\*+\)", "", s)
-
-        # 3️⃣ normalisasi whitespace biasa
-        s = re.sub(r"\s+", " ", s).strip()
-
-        return s.split()[-1]
-    
-
     col1_last = normalize_header(header[0])
     col3_last = normalize_header(header[2]) if len(header) >= 3 else ""
 
@@ -58,3 +32,16 @@ def classify_page(page) -> PageType:
 
 
     return PageType.UNKNOWN
+
+
+def classify_page(extraction: PageExtraction) -> PageType:
+    # cheap path: only the header band of the first table
+    page_type = classify_header(extraction.header)
+    if page_type != PageType.UNKNOWN:
+        return page_type
+
+    tables = extraction.table
+    if not tables:
+        return PageType.UNKNOWN 
+
+    return classify_header(tables[0])
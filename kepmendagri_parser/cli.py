@@ -5,10 +5,132 @@ from pathlib import Path
 from tqdm import tqdm
 
 from .pipeline.runner import run_pipeline
+from .extractors.engines import ENGINES, DEFAULT_ENGINE, get_engine
 from .utils.input_resolver import is_url, download_file
+from .utils.page_index import (
+    SECTION_NAMES,
+    build_page_index,
+    verify_page_index,
+)
+from .utils.generate_release_metadata import sha256_file
+from .builders.columnar_output import COLUMNAR_FORMATS
+from .builders.sqlite_output import SQLITE_FORMAT
+
+
+def default_index_path(pdf_path: Path) -> Path:
+    return pdf_path.with_name(pdf_path.name + ".index.json")
+
+
+def parse_sections(value: str) -> list:
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    unknown = [n for n in names if n not in SECTION_NAMES]
+    if unknown or not names:
+        raise argparse.ArgumentTypeError(
+            f"invalid section(s): {', '.join(unknown) or value} "
+            f"(choose from {', '.join(SECTION_NAMES)})"
+        )
+    return [SECTION_NAMES[n] for n in names]
+
+
+def parse_formats(value: str) -> list[str]:
+    names = [v.strip() for v in value.split(",") if v.strip()]
+    known = ["csv", *COLUMNAR_FORMATS, SQLITE_FORMAT]
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"invalid format(s): {', '.join(unknown)} "
+            f"(choose from {', '.join(known)})"
+        )
+    # CSV is always written
+    return [n for n in dict.fromkeys(names) if n != "csv"]
+
+
+def resolve_input(
+    parser,
+    input_arg: str,
+    sha256: str | None,
+    debug_level: int,
+    cache_dir: Path | None = None,
+) -> Path:
+    if is_url(input_arg):
+        return download_file(
+            url=input_arg,
+            expected_sha256=sha256,
+            debug_level=debug_level,
+            # downloads live next to the page cache when one is given
+            cache_dir=cache_dir / "downloads" if cache_dir else None,
+        )
+
+    pdf_path = Path(input_arg).resolve()
+    if not pdf_path.exists():
+        parser.error(f"Input PDF not found: {pdf_path}")
+    return pdf_path
+
+
+def index_main(argv: list[str]):
+    parser = argparse.ArgumentParser(
+        prog="kepmendagri-parser index",
+        description=(
+            "Build the page → page type index of a Kepmendagri PDF "
+            "(section boundaries found by binary search)"
+        ),
+    )
+    parser.add_argument("--input", required=True, help="Path or URL to Kepmendagri PDF")
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="Index file (default: <pdf>.index.json next to the PDF)",
+    )
+    parser.add_argument("--sha256", help="Expected SHA256 hash of the PDF")
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="PDF extraction backend (default: pdfplumber)",
+    )
+    parser.add_argument(
+        "--verify",
+        action="store_true",
+        help="Also classify every data page and check the index against it (slow)",
+    )
+    args = parser.parse_args(argv)
+
+    pdf_path = resolve_input(parser, args.input, args.sha256, debug_level=0)
+    index_path = (args.output or default_index_path(pdf_path)).resolve()
+
+    engine = get_engine(args.engine)
+    pdf_sha256 = sha256_file(pdf_path)
+
+    with engine.open(pdf_path) as pdf:
+        index = build_page_index(pdf, engine, pdf_sha256)
+        mismatches = verify_page_index(pdf, engine, index) if args.verify else []
+
+    index.save(index_path)
+
+    print(f"🗂️ Page index : {index_path}")
+    print(f"  Pages classified : {index.probes} of {index.page_count}")
+    if index.linear_scan:
+        print("  ⚠️ Section boundary pages did not match, every data page was classified")
+    for section in index.sections:
+        print(
+            f"  {section.page_type.value:15}: pages {section.start}-{section.end} "
+            f"({section.pages})"
+        )
+
+    if args.verify:
+        for m in mismatches[:20]:
+            print(f"  ❌ page {m['page']}: index says {m['expected']}, page is {m['actual']}")
+        if mismatches:
+            print(f"❌ Index verification failed ({len(mismatches)} pages)", file=sys.stderr)
+            sys.exit(1)
+        print("✅ Index verified against every data page")
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "index":
+        index_main(sys.argv[2:])
+        return
+
     parser = argparse.ArgumentParser(
         prog="kepmendagri-parser",
         description="Parse Kepmendagri PDF into structured regional datasets",
@@ -40,6 +162,129 @@ def main():
         help="Reuse cached raw parsed data if available (skip PDF parsing)",
     )
 
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help=(
+            "Persistent per-page cache directory, keyed by PDF SHA256, page "
+            "and parser version (re-runs only re-parse what changed)"
+        ),
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted parse from its last checkpoint",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=100,
+        help="Save a parse checkpoint every N pages (0 disables, default: 100)",
+    )
+
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help=(
+            "Bounded-memory mode: spill villages to disk and write the "
+            "final CSVs in a single merge pass"
+        ),
+    )
+
+    parser.add_argument(
+        "--formats",
+        type=parse_formats,
+        default=[],
+        help=(
+            "Comma separated extra output formats next to the CSVs: "
+            "parquet, arrow (need pyarrow), sqlite"
+        ),
+    )
+
+    parser.add_argument(
+        "--strict-codes",
+        action="store_true",
+        help=(
+            "Also fail the build when a parent code column is not the prefix "
+            "of the row's own code (e.g. village 1101012001 in district 110102)"
+        ),
+    )
+
+    parser.add_argument(
+        "--delta-from",
+        type=Path,
+        help=(
+            "Previous release directory: also write <output>/delta/ with the "
+            "inserts, updates and deletes per level (see utils.apply_delta)"
+        ),
+    )
+
+    parser.add_argument(
+        "--release-version",
+        help=(
+            "Also write the release metadata (e.g. v1.0.2) from the hashes "
+            "and row counts recorded while the datasets were written"
+        ),
+    )
+    parser.add_argument(
+        "--release-dir",
+        type=Path,
+        default=Path("metadata/releases"),
+        help="Output directory for release metadata (default: metadata/releases)",
+    )
+
+    parser.add_argument(
+        "--builder",
+        choices=["python", "pandas"],
+        default="python",
+        help=(
+            "Dataset builder: plain Python (default) or vectorised pandas; "
+            "both write identical files"
+        ),
+    )
+
+    parser.add_argument(
+        "--engine",
+        choices=sorted(ENGINES),
+        default=DEFAULT_ENGINE,
+        help="PDF extraction backend (default: pdfplumber)",
+    )
+
+    parser.add_argument(
+        "--index",
+        type=Path,
+        help=(
+            "Page index file (see `kepmendagri-parser index`); built and "
+            "saved there when missing or stale. Pages are not classified "
+            "and only the data sections are read"
+        ),
+    )
+    parser.add_argument(
+        "--sections",
+        type=parse_sections,
+        help=(
+            "Comma separated sections to parse (province,regency,district,village). "
+            "A subset only writes the parsed raw rows, no dataset"
+        ),
+    )
+
+    parser.add_argument(
+        "--metrics-out",
+        type=Path,
+        help=(
+            "Write a JSON timing report: per-stage p50/p95/max per page "
+            "type, slowest pages, build steps and pages/second"
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes for page parsing (default: 1, sequential)",
+    )
+
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -55,6 +300,19 @@ def main():
 
     args = parser.parse_args()
 
+    if args.streaming and args.builder != "python":
+        parser.error("--streaming has its own builder, it cannot be combined with --builder")
+
+    if args.delta_from and args.delta_from.resolve() == args.output.resolve():
+        parser.error("--delta-from must be another directory than --output")
+
+    columnar = [f for f in args.formats if f in COLUMNAR_FORMATS]
+    if columnar:
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error(f"--formats {','.join(columnar)} needs pyarrow (pip install pyarrow)")
+
     # -------------------------
     # Resolve debug level
     # -------------------------
@@ -71,16 +329,10 @@ def main():
     # -------------------------
     # Resolve input PDF
     # -------------------------
-    if is_url(args.input):
-        pdf_path = download_file(
-            url=args.input,
-            expected_sha256=args.sha256,
-            debug_level=debug_level,
-        )
-    else:
-        pdf_path = Path(args.input).resolve()
-        if not pdf_path.exists():
-            parser.error(f"Input PDF not found: {pdf_path}")
+    pdf_path = resolve_input(
+        parser, args.input, args.sha256, debug_level,
+        cache_dir=args.cache_dir.resolve() if args.cache_dir else None,
+    )
 
     # -------------------------
     # Progress bar (CLI concern only)
@@ -100,7 +352,7 @@ def main():
                 parse_pbar.n = current
                 parse_pbar.refresh()
 
-            run_pipeline(
+            report = run_pipeline(
                 pdf_path=pdf_path,
                 out_dir=out_dir,
                 start_page=args.start_page,
@@ -108,6 +360,21 @@ def main():
                 debug_level=debug_level,
                 on_progress=on_parse_progress if show_progress else None,
                 reuse_raw=args.reuse_raw,
+                workers=args.workers,
+                cache_dir=args.cache_dir.resolve() if args.cache_dir else None,
+                resume=args.resume,
+                checkpoint_every=args.checkpoint_every,
+                streaming=args.streaming,
+                engine_name=args.engine,
+                index_path=args.index.resolve() if args.index else None,
+                sections=args.sections,
+                metrics_out=args.metrics_out.resolve() if args.metrics_out else None,
+                builder=args.builder,
+                formats=args.formats,
+                strict_codes=args.strict_codes,
+                delta_from=args.delta_from.resolve() if args.delta_from else None,
+                release_version=args.release_version,
+                release_dir=args.release_dir.resolve(),
             )
 
     except Exception as e:
@@ -115,7 +382,15 @@ def main():
         print(str(e), file=sys.stderr)
         sys.exit(1)
 
-    print("✅ Dataset generation completed successfully")
+    if args.sections and set(args.sections) != set(SECTION_NAMES.values()):
+        print("✅ Sections parsed (raw rows only, no dataset built)")
+    else:
+        print("✅ Dataset generation completed successfully")
+        if report["unchanged"]:
+            print(
+                f"   rebuilt: {', '.join(report['rebuilt']) or 'nothing'} "
+                f"(unchanged: {', '.join(report['unchanged'])})"
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+import pdfplumber
+
+from kepmendagri_parser.extractors.page_table import extract_page_table
+from kepmendagri_parser.extractors.page_text import extract_page_text
+from kepmendagri_parser.extractors.table_header import header_row
+
+DEFAULT_ENGINE = "pdfplumber"
+
+
+class PdfplumberEngine:
+    name = "pdfplumber"
+    module = "kepmendagri_parser.extractors.engines"
+
+    def open(self, pdf_path):
+        return pdfplumber.open(pdf_path)
+
+    def extract_table(self, page) -> list:
+        return extract_page_table(page)
+
+    def extract_text(self, page) -> str:
+        return extract_page_text(page)
+
+    def extract_header_row(self, page) -> list | None:
+        horizontal = []
+        vertical = []
+        for e in page.edges:
+            if e["orientation"] == "h":
+                horizontal.append((e["top"], e["x0"], e["x1"]))
+            else:
+                vertical.append((e["x0"], e["top"], e["bottom"]))
+
+        chars = [(c["text"], c["x0"], c["top"], c["x1"], c["bottom"]) for c in page.chars]
+        return header_row(chars, horizontal, vertical)
+
+
+class PdfiumEngine:
+    name = "pdfium"
+    module = "kepmendagri_parser.extractors.pdfium_engine"
+
+    def open(self, pdf_path):
+        from kepmendagri_parser.extractors import pdfium_engine
+
+        return pdfium_engine.open_document(pdf_path)
+
+    def extract_table(self, page) -> list:
+        from kepmendagri_parser.extractors import pdfium_engine
+
+        return pdfium_engine.extract_table(page)
+
+    def extract_text(self, page) -> str:
+        from kepmendagri_parser.extractors import pdfium_engine
+
+        return pdfium_engine.extract_text(page)
+
+    def extract_header_row(self, page) -> list | None:
+        from kepmendagri_parser.extractors import pdfium_engine
+
+        return pdfium_engine.extract_header_row(page)
+
+
+ENGINES = {
+    PdfplumberEngine.name: PdfplumberEngine(),
+    PdfiumEngine.name: PdfiumEngine(),
+}
+
+
+def get_engine(name: str | None = None):
+    try:
+        return ENGINES[name or DEFAULT_ENGINE]
+    except KeyError:
+        raise ValueError(
+            f"Unknown extraction engine: {name} (available: {', '.join(ENGINES)})"
+        ) from None
@@ -0,0 +1,104 @@
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+from kepmendagri_parser.pipeline.context import PageType
+from kepmendagri_parser.extractors.engines import get_engine
+
+
+@dataclass
+class ExtractionStats:
+    pages: int = 0
+    table_extractions: int = 0
+    text_extractions: int = 0
+    header_extractions: int = 0
+    max_table_extractions_per_page: int = 0
+    cached_extractions: int = 0
+    cached_rows: int = 0
+
+    def record(self, result):
+        # accepts PageExtraction or PageResult (both carry call counters)
+        self.pages += 1
+        self.table_extractions += result.table_calls
+        self.text_extractions += result.text_calls
+        self.header_extractions += getattr(result, "header_calls", 0)
+        self.max_table_extractions_per_page = max(
+            self.max_table_extractions_per_page, result.table_calls
+        )
+        self.cached_extractions += getattr(result, "cached_extraction", False)
+        self.cached_rows += getattr(result, "cached_rows", False)
+
+
+class PageExtraction:
+    """
+    Single-pass extraction result for one PDF page.
+
+    `page.extract_table()` is by far the most expensive call in the
+    pipeline, so the table (and the text, for pages that need it) is
+    extracted lazily at most once and shared by the classifier and
+    the parsers.
+    """
+
+    def __init__(self, page, page_number: int, engine=None):
+        self.page = page
+        self.page_number = page_number
+        self.engine = engine or get_engine()
+        self.page_type: PageType | None = None
+
+        self._table: list | None = None
+        self._text: str | None = None
+        self._header = None
+
+        self.table_calls = 0
+        self.text_calls = 0
+        self.header_calls = 0
+
+        # seconds spent per extraction call
+        self.timings: dict[str, float] = defaultdict(float)
+
+    def _timed(self, stage: str, extract):
+        started = time.perf_counter()
+        try:
+            return extract(self.page)
+        finally:
+            self.timings[stage] += time.perf_counter() - started
+
+    @property
+    def extraction_seconds(self) -> float:
+        return sum(self.timings.values())
+
+    def load(self, table: list | None, text: str | None):
+        """Seed from a cached extraction; seeded parts are not extracted again."""
+        self._table = table
+        self._text = text
+
+    def extracted(self) -> tuple[list | None, str | None]:
+        """Table and text extracted so far, without triggering extraction."""
+        return self._table, self._text
+
+    @property
+    def table(self) -> list:
+        if self._table is None:
+            self.table_calls += 1
+            self._table = self._timed("extract_page_table", self.engine.extract_table)
+        return self._table
+
+    @property
+    def header(self) -> list | None:
+        """
+        First table row read from the ruling lines only (cheap), or None.
+        Reuses the full table when it has already been extracted.
+        """
+        if self._table is not None:
+            return self._table[0] if self._table else None
+        if self.header_calls == 0:
+            self.header_calls += 1
+            self._header = self._timed("extract_header_row", self.engine.extract_header_row)
+        return self._header
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self.text_calls += 1
+            self._text = self._timed("extract_page_text", self.engine.extract_text)
+        return self._text
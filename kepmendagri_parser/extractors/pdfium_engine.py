@@ -0,0 +1,264 @@
+"""
+pdfium-backed extraction engine.
+
+pdfplumber/pdfminer interpret the page content in pure Python. pdfium
+does it in C, so this engine reads character boxes and path objects
+from pdfium and rebuilds the Kepmendagri table grid itself:
+
+- ruling lines come from thin path objects (rectangles contribute
+  their four edges), snapped together within SNAP_TOLERANCE
+- cells are the grid squares, merged where a separating ruling line
+  is missing (spanning cells)
+- text is assembled from characters whose centre falls in a cell,
+  with the same word/line grouping rules as pdfplumber's extract_text
+
+The output mirrors `page.extract_table()` / `page.extract_text()`.
+"""
+
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+from kepmendagri_parser.extractors.text_layout import (
+    EDGE_MIN_LENGTH,
+    chars_to_text,
+    covered,
+    snap,
+    nearest,
+)
+from kepmendagri_parser.extractors.table_header import header_row
+
+# path objects thinner than this are ruling lines, not rectangles
+LINE_MAX_THICKNESS = 2
+
+
+class PdfiumPage:
+    """Lazily loaded pdfium page with its text page and path objects."""
+
+    def __init__(self, document: pdfium.PdfDocument, index: int):
+        self._document = document
+        self._index = index
+        self._page = None
+        self._chars = None
+        self._edges = None
+
+    @property
+    def page(self) -> pdfium.PdfPage:
+        if self._page is None:
+            self._page = self._document[self._index]
+        return self._page
+
+    @property
+    def height(self) -> float:
+        return self.page.get_height()
+
+    @property
+    def width(self) -> float:
+        return self.page.get_width()
+
+    def chars(self) -> list[tuple[str, float, float, float, float]]:
+        """(text, x0, top, x1, bottom) in top-left origin coordinates."""
+        if self._chars is None:
+            self._chars = _load_chars(self.page)
+        return self._chars
+
+    def edges(self) -> tuple[list, list]:
+        if self._edges is None:
+            self._edges = _load_edges(self.page)
+        return self._edges
+
+    def close(self):
+        if self._page is not None:
+            self._page.close()
+            self._page = None
+
+
+class PdfiumPages:
+    def __init__(self, document: pdfium.PdfDocument):
+        self._document = document
+        self._count = len(document)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> PdfiumPage:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+        return PdfiumPage(self._document, index)
+
+
+class PdfiumDocument:
+    def __init__(self, pdf_path):
+        self._document = pdfium.PdfDocument(str(pdf_path))
+        self.pages = PdfiumPages(self._document)
+
+    def close(self):
+        self._document.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# =========================
+# Characters & text
+# =========================
+
+def _load_chars(page: pdfium.PdfPage) -> list[tuple]:
+    height = page.get_height()
+    textpage = page.get_textpage()
+    try:
+        n = textpage.count_chars()
+        text = textpage.get_text_range(0, n) if n else ""
+        if len(text) != n:
+            text = "".join(textpage.get_text_range(i, 1) for i in range(n))
+
+        chars = []
+        for i, c in enumerate(text):
+            if c in "\r\n" or pdfium_c.FPDFText_IsGenerated(textpage.raw, i) == 1:
+                continue
+            left, bottom, right, top = textpage.get_charbox(i, loose=True)
+            chars.append((c, left, height - top, right, height - bottom))
+        return chars
+    finally:
+        textpage.close()
+
+
+# =========================
+# Ruling lines & grid
+# =========================
+
+def _load_edges(page: pdfium.PdfPage) -> tuple[list, list]:
+    """
+    Horizontal edges as (y, x0, x1) and vertical edges as (x, top, bottom),
+    top-left origin.
+    """
+    height = page.get_height()
+    horizontal = []
+    vertical = []
+
+    for obj in page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_PATH], max_depth=5):
+        left, bottom, right, top = obj.get_bounds()
+        top, bottom = height - top, height - bottom
+        w = right - left
+        h = bottom - top
+
+        if h <= LINE_MAX_THICKNESS and w >= EDGE_MIN_LENGTH:
+            horizontal.append(((top + bottom) / 2, left, right))
+        elif w <= LINE_MAX_THICKNESS and h >= EDGE_MIN_LENGTH:
+            vertical.append(((left + right) / 2, top, bottom))
+        elif w >= EDGE_MIN_LENGTH and h >= EDGE_MIN_LENGTH:
+            horizontal.append((top, left, right))
+            horizontal.append((bottom, left, right))
+            vertical.append((left, top, bottom))
+            vertical.append((right, top, bottom))
+
+    return horizontal, vertical
+
+
+def _build_grid(horizontal: list, vertical: list):
+    ys = snap([e[0] for e in horizontal])
+    xs = snap([e[0] for e in vertical])
+    if len(ys) < 2 or len(xs) < 2:
+        return None
+
+    h_segments = {i: [] for i in range(len(ys))}
+    for y, x0, x1 in horizontal:
+        h_segments[nearest(ys, y)].append((x0, x1))
+
+    v_segments = {i: [] for i in range(len(xs))}
+    for x, top, bottom in vertical:
+        v_segments[nearest(xs, x)].append((top, bottom))
+
+    return xs, ys, h_segments, v_segments
+
+
+def extract_table(page: PdfiumPage) -> list:
+    horizontal, vertical = page.edges()
+    grid = _build_grid(horizontal, vertical)
+    if grid is None:
+        return []
+
+    xs, ys, h_segments, v_segments = grid
+    n_rows, n_cols = len(ys) - 1, len(xs) - 1
+
+    # atomic grid squares that actually have a border on each side are
+    # table cells; squares are merged across missing inner borders
+    def has_top(r, c):
+        return covered(h_segments[r], xs[c], xs[c + 1])
+
+    def has_left(r, c):
+        return covered(v_segments[c], ys[r], ys[r + 1])
+
+    owner = {}
+    for r in range(n_rows):
+        for c in range(n_cols):
+            if c > 0 and not has_left(r, c) and (r, c - 1) in owner:
+                owner[(r, c)] = owner[(r, c - 1)]
+            elif r > 0 and not has_top(r, c) and (r - 1, c) in owner:
+                owner[(r, c)] = owner[(r - 1, c)]
+            else:
+                owner[(r, c)] = (r, c)
+
+    # cell bounding boxes (top-left anchor → x0, top, x1, bottom)
+    boxes = {}
+    for (r, c), anchor in owner.items():
+        x0, top, x1, bottom = xs[c], ys[r], xs[c + 1], ys[r + 1]
+        if anchor in boxes:
+            bx0, btop, bx1, bbottom = boxes[anchor]
+            boxes[anchor] = (min(bx0, x0), min(btop, top), max(bx1, x1), max(bbottom, bottom))
+        else:
+            boxes[anchor] = (x0, top, x1, bottom)
+
+    # only keep cells fully enclosed by ruling lines
+    boxes = {
+        a: b for a, b in boxes.items()
+        if covered(h_segments[nearest(ys, b[1])], b[0], b[2])
+        and covered(h_segments[nearest(ys, b[3])], b[0], b[2])
+        and covered(v_segments[nearest(xs, b[0])], b[1], b[3])
+        and covered(v_segments[nearest(xs, b[2])], b[1], b[3])
+    }
+    if not boxes:
+        return []
+
+    cell_chars = {a: [] for a in boxes}
+    for ch in page.chars():
+        cx = (ch[1] + ch[3]) / 2
+        cy = (ch[2] + ch[4]) / 2
+        if not (xs[0] <= cx <= xs[-1] and ys[0] <= cy <= ys[-1]):
+            continue
+        c = max(0, min(n_cols - 1, sum(1 for x in xs[1:-1] if x <= cx)))
+        r = max(0, min(n_rows - 1, sum(1 for y in ys[1:-1] if y <= cy)))
+        anchor = owner.get((r, c))
+        if anchor in cell_chars:
+            cell_chars[anchor].append(ch)
+
+    table = []
+    for r in range(n_rows):
+        if not any(a[0] == r for a in boxes):
+            continue
+        row = []
+        for c in range(n_cols):
+            if (r, c) in boxes:
+                row.append(chars_to_text(cell_chars[(r, c)]))
+            else:
+                row.append(None)
+        table.append(row)
+
+    return table
+
+
+def extract_header_row(page: PdfiumPage) -> list | None:
+    horizontal, vertical = page.edges()
+    return header_row(page.chars(), horizontal, vertical)
+
+
+def extract_text(page: PdfiumPage) -> str:
+    return chars_to_text(page.chars())
+
+
+def open_document(pdf_path) -> PdfiumDocument:
+    return PdfiumDocument(pdf_path)
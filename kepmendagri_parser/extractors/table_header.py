@@ -0,0 +1,72 @@
+from kepmendagri_parser.extractors.text_layout import (
+    SNAP_TOLERANCE,
+    chars_to_text,
+    covered,
+    nearest,
+    snap,
+)
+
+
+def table_top(ys: list[float], vertical: list) -> int | None:
+    """
+    Index in `ys` of the table's top line: the first horizontal line with
+    vertical rulings hanging from it, at least two cells wide. Rules above
+    the table (letterhead, underlined title) have no rulings hanging from
+    them, and a boxed title only has its own two sides.
+    """
+    for i, y in enumerate(ys):
+        hanging = snap([
+            x for x, v_top, v_bottom in vertical
+            if abs(v_top - y) <= SNAP_TOLERANCE and v_bottom - y > SNAP_TOLERANCE
+        ])
+        if len(hanging) >= 3:
+            return i
+    return None
+
+
+def header_row(chars: list, horizontal: list, vertical: list) -> list | None:
+    """
+    First table row, cut from the ruling lines alone.
+
+    Mirrors `extract_table()[0]` (columns covered by a spanning cell are
+    None) without running the table finder over the whole page: only the
+    band between the table's top line and the next horizontal line is
+    read. Returns None when the page has no ruled table.
+    """
+    ys = snap([e[0] for e in horizontal])
+    top_index = table_top(ys, vertical)
+    if top_index is None or top_index + 1 >= len(ys):
+        return None
+
+    top, bottom = ys[top_index], ys[top_index + 1]
+
+    table_vertical = [e for e in vertical if e[2] > top]
+    xs = snap([e[0] for e in table_vertical])
+    if len(xs) < 2:
+        return None
+
+    v_segments = {i: [] for i in range(len(xs))}
+    for x, v_top, v_bottom in table_vertical:
+        v_segments[nearest(xs, x)].append((v_top, v_bottom))
+
+    # column index → index of the cell that owns it in the header band
+    owner = []
+    for i in range(len(xs) - 1):
+        if i == 0 or covered(v_segments[i], top, bottom):
+            owner.append(i)
+        else:
+            owner.append(owner[-1])
+
+    cell_chars = {i: [] for i in set(owner)}
+    for ch in chars:
+        cx = (ch[1] + ch[3]) / 2
+        cy = (ch[2] + ch[4]) / 2
+        if not (top <= cy <= bottom and xs[0] <= cx <= xs[-1]):
+            continue
+        col = max(0, min(len(owner) - 1, sum(1 for x in xs[1:-1] if x <= cx)))
+        cell_chars[owner[col]].append(ch)
+
+    return [
+        chars_to_text(cell_chars[i]) if owner[i] == i else None
+        for i in range(len(owner))
+    ]
@@ -0,0 +1,80 @@
+"""
+Geometry helpers shared by the extraction engines.
+
+Characters are (text, x0, top, x1, bottom) tuples and ruling lines are
+(y, x0, x1) / (x, top, bottom) tuples, all in top-left origin points.
+Tolerances match pdfplumber's defaults so every engine groups text and
+lines the same way.
+"""
+
+SNAP_TOLERANCE = 3
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+EDGE_MIN_LENGTH = 3
+
+
+def chars_to_text(chars: list[tuple]) -> str:
+    """
+    Group characters into lines (by top, Y_TOLERANCE) and words (split on
+    spaces and gaps wider than X_TOLERANCE), then join words with single
+    spaces and lines with newlines, like pdfplumber's default extract_text.
+    """
+    if not chars:
+        return ""
+
+    lines = []
+    for ch in sorted(chars, key=lambda c: (c[2], c[1])):
+        if lines and ch[2] - lines[-1][0] <= Y_TOLERANCE:
+            lines[-1][1].append(ch)
+        else:
+            lines.append((ch[2], [ch]))
+
+    out = []
+    for _, line_chars in lines:
+        words = []
+        current = ""
+        last_x1 = None
+        for c, x0, _, x1, _ in sorted(line_chars, key=lambda c: c[1]):
+            if c.isspace():
+                if current:
+                    words.append(current)
+                current = ""
+            else:
+                if current and last_x1 is not None and x0 - last_x1 > X_TOLERANCE:
+                    words.append(current)
+                    current = ""
+                current += c
+            last_x1 = x1
+        if current:
+            words.append(current)
+        if words:
+            out.append(" ".join(words))
+
+    return "\n".join(out)
+
+
+def snap(values: list[float]) -> list[float]:
+    """Cluster coordinates within SNAP_TOLERANCE, return cluster means."""
+    clusters = []
+    for v in sorted(values):
+        if clusters and v - clusters[-1][-1] <= SNAP_TOLERANCE:
+            clusters[-1].append(v)
+        else:
+            clusters.append([v])
+    return [sum(c) / len(c) for c in clusters]
+
+
+def nearest(grid: list[float], v: float) -> int:
+    return min(range(len(grid)), key=lambda i: abs(grid[i] - v))
+
+
+def covered(segments: list[tuple[float, float]], a: float, b: float) -> bool:
+    """True if the union of segments covers [a, b] (within SNAP_TOLERANCE)."""
+    pos = a
+    for s0, s1 in sorted(segments):
+        if s0 - SNAP_TOLERANCE > pos:
+            break
+        pos = max(pos, s1)
+        if pos + SNAP_TOLERANCE >= b:
+            return True
+    return pos + SNAP_TOLERANCE >= b
@@ -0,0 +1,350 @@
+"""
+Fuzzy name search over district and village names.
+
+    search = NameSearch.load("datasets")
+    search.search("Kel. Menteng Atas, Setiabudi")[0].region.code
+    search.search("menteng", parent="3174")              # within a regency
+
+Names are compared as `utils.name_key` keys (the regency parser's
+abbreviation expansion, case and diacritics folded). A leading level
+word of the query ("Kel.", "Desa", "Kec.", …) is dropped and restricts
+the search to that level. Text after the first comma is context: it is
+matched against the names of each candidate's ancestors and breaks ties
+between equal names (there are hundreds of "Sukamaju").
+
+Scoring is the Dice coefficient of the trigram sets of the two keys,
+so typos and missing words still rank close. Trigrams are indexed per
+distinct key as CSR posting lists (numpy arrays); a query counts the
+trigrams it shares with every key in one bincount over its postings
+instead of comparing against every name. A `parent` restricts the
+candidates to one contiguous range of codes per level.
+"""
+
+import math
+from array import array
+from dataclasses import dataclass
+
+import numpy as np
+
+from kepmendagri_parser.lookup.region_index import Region, RegionIndex
+from kepmendagri_parser.models.region_code import (
+    LEVEL_WIDTHS,
+    Level,
+    code_level,
+    parse_code,
+)
+from kepmendagri_parser.utils.name_key import name_key
+
+SEARCH_LEVELS = (Level.DISTRICT, Level.VILLAGE)
+CONTEXT_LEVELS = (Level.PROVINCE, Level.REGENCY, Level.DISTRICT)
+
+# code width by level value (index 0 unused)
+_WIDTHS = np.array([0, *(LEVEL_WIDTHS[level] for level in Level)])
+
+# leading query words naming the level searched for
+QUERY_LEVEL_WORDS = {
+    "kelurahan": Level.VILLAGE,
+    "kel": Level.VILLAGE,
+    "desa": Level.VILLAGE,
+    "ds": Level.VILLAGE,
+    "kecamatan": Level.DISTRICT,
+    "kec": Level.DISTRICT,
+    "distrik": Level.DISTRICT,
+}
+
+# level words ignored when context is compared with ancestor names
+CONTEXT_STOP_WORDS = {
+    *QUERY_LEVEL_WORDS,
+    "kabupaten", "kab", "kota", "kotamadya", "administrasi", "adm",
+    "provinsi", "prov",
+}
+
+# best name matches re-ranked with the context of the query
+CONTEXT_POOL = 200
+# candidates kept at most (entries tied with the last kept one are kept
+# too, so equal names are decided by code or context, not by accident)
+MAX_POOL = 5000
+# weight of the context score in the final score
+CONTEXT_WEIGHT = 0.5
+
+
+@dataclass(slots=True)
+class Match:
+    region: Region
+    score: float
+
+
+def trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def dice(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def parse_query(query: str) -> tuple[str, Level | None, list[str]]:
+    """(name key, level named by the query, context keys)."""
+    name, *context = query.split(",")
+    words = name_key(name).split()
+    level = None
+    if len(words) > 1 and words[0] in QUERY_LEVEL_WORDS:
+        level = QUERY_LEVEL_WORDS[words.pop(0)]
+    context_keys = [context_key(c) for c in context]
+    return " ".join(words), level, [c for c in context_keys if c]
+
+
+def context_key(name: str) -> str:
+    return " ".join(w for w in name_key(name).split() if w not in CONTEXT_STOP_WORDS)
+
+
+class TrigramIndex:
+    """Distinct keys with a posting list (key ids) per trigram."""
+
+    def __init__(self):
+        self.key_ids: dict[str, int] = {}
+        self.gram_ids: dict[str, int] = {}
+        self._sizes = array("H")
+        self._postings: list[array] = []
+
+    def add(self, key: str) -> int:
+        """Id of `key`, indexed on first sight."""
+        key_id = self.key_ids.get(key)
+        if key_id is None:
+            key_id = self.key_ids[key] = len(self._sizes)
+            grams = trigrams(key)
+            self._sizes.append(len(grams))
+            for gram in grams:
+                gram_id = self.gram_ids.get(gram)
+                if gram_id is None:
+                    gram_id = self.gram_ids[gram] = len(self._postings)
+                    self._postings.append(array("l"))
+                self._postings[gram_id].append(key_id)
+        return key_id
+
+    def freeze(self):
+        """Move the postings into numpy arrays (no `add` afterwards)."""
+        self.sizes = np.frombuffer(self._sizes, dtype=np.uint16)
+        self.offsets = np.zeros(len(self._postings) + 1, dtype=np.int64)
+        np.cumsum([len(p) for p in self._postings], out=self.offsets[1:])
+        self.postings = np.empty(self.offsets[-1], dtype=np.int32)
+        for gram_id, posting in enumerate(self._postings):
+            self.postings[self.offsets[gram_id]:self.offsets[gram_id + 1]] = posting
+        self._postings = []
+
+    def __len__(self) -> int:
+        return len(self.sizes)
+
+    def shared(self, grams: set[str]) -> np.ndarray | None:
+        """Trigrams of `grams` found in each key (None if none is known)."""
+        ids = [self.gram_ids[g] for g in grams if g in self.gram_ids]
+        if not ids:
+            return None
+        hits = np.concatenate([
+            self.postings[self.offsets[i]:self.offsets[i + 1]] for i in ids
+        ])
+        return np.bincount(hits, minlength=len(self.sizes))
+
+    def scores(self, key: str) -> np.ndarray:
+        """Dice score of `key` against every key."""
+        grams = trigrams(key)
+        shared = self.shared(grams)
+        if shared is None:
+            return np.zeros(len(self.sizes))
+        return 2 * shared / (len(grams) + self.sizes)
+
+
+class NameSearch:
+    """Trigram index over the names of `levels` of a RegionIndex."""
+
+    def __init__(self, index: RegionIndex, levels=SEARCH_LEVELS):
+        self.index = index
+        self.levels = tuple(levels)
+
+        # entries (regions) in level, code order; names repeat a lot, so
+        # trigrams are indexed per distinct key and keys map to entries
+        self.names = TrigramIndex()
+        codes = array("q")
+        entry_levels = array("b")
+        entry_keys = array("l")
+        self.ranges: dict[Level, tuple[int, int]] = {}
+        for level in self.levels:
+            table = index.table(level)
+            self.ranges[level] = (len(codes), len(codes) + len(table))
+            codes.extend(table.codes)
+            entry_levels.extend([level] * len(table))
+            entry_keys.extend(self.names.add(name_key(name)) for name in table.names)
+        self.names.freeze()
+
+        self.codes = np.frombuffer(codes, dtype=np.int64)
+        self.entry_levels = np.frombuffer(entry_levels, dtype=np.int8)
+        self.entry_keys = np.frombuffer(entry_keys, dtype=np.int64)
+
+        # key → its entries of each level, in code order
+        self.key_counts: dict[Level, np.ndarray] = {}
+        self.key_offsets: dict[Level, np.ndarray] = {}
+        self.key_entries: dict[Level, np.ndarray] = {}
+        for level, (start, end) in self.ranges.items():
+            level_keys = self.entry_keys[start:end]
+            counts = np.bincount(level_keys, minlength=len(self.names))
+            self.key_counts[level] = counts.astype(np.int32)
+            self.key_offsets[level] = np.concatenate(([0], np.cumsum(counts)))
+            self.key_entries[level] = (
+                np.argsort(level_keys, kind="stable") + start
+            ).astype(np.int32)
+
+        # ancestor names for the query context, level words dropped
+        self.context = TrigramIndex()
+        self.ancestor_codes: dict[Level, np.ndarray] = {}
+        self.ancestor_keys: dict[Level, np.ndarray] = {}
+        for level in CONTEXT_LEVELS:
+            table = index.table(level)
+            self.ancestor_codes[level] = np.frombuffer(table.codes, dtype=np.int64)
+            self.ancestor_keys[level] = np.array(
+                [self.context.add(context_key(name)) for name in table.names],
+                dtype=np.int64,
+            )
+        self.context.freeze()
+
+    @classmethod
+    def load(cls, datasets_dir, levels=SEARCH_LEVELS) -> "NameSearch":
+        return cls(RegionIndex.load(datasets_dir), levels)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    # -------------------------
+    # Search
+    # -------------------------
+
+    def search(
+        self,
+        query: str,
+        parent: str | int | None = None,
+        level: Level | None = None,
+        limit: int = 10,
+        min_score: float = 0.3,
+    ) -> list[Match]:
+        """
+        Best matches for free text like "Kel. Menteng Atas, Setiabudi",
+        optionally only below `parent` (any level) and at `level`.
+        """
+        key, query_level, context = parse_query(query)
+        level = level or query_level
+        levels = [lv for lv in self.levels if level is None or lv == level]
+        if not key or not levels:
+            return []
+
+        grams = trigrams(key)
+        shared = self.names.shared(grams)
+        if shared is None:
+            return []
+
+        need = max(limit, CONTEXT_POOL) if context else limit
+        if parent is None:
+            entries, scores = self._best_keys(shared, len(grams), levels, need, min_score)
+        else:
+            entries = self._below(parent, levels)
+            keys = self.entry_keys[entries]
+            scores = 2 * shared[keys] / (len(grams) + self.names.sizes[keys])
+            keep = scores >= min_score
+            entries, scores = entries[keep], scores[keep]
+
+        entries, scores = _top(entries, scores, need)
+        if context:
+            scores = (scores + CONTEXT_WEIGHT * self._context_scores(entries, context)) / (
+                1 + CONTEXT_WEIGHT
+            )
+
+        codes = self.codes[entries]
+        best = np.lexsort((codes, -scores))[:limit]
+        return [Match(self.index[int(codes[i])], float(scores[i])) for i in best]
+
+    def _best_keys(
+        self, shared: np.ndarray, size: int, levels: list[Level], need: int, min_score: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Entries of the best scoring keys, enough to hold `need` entries."""
+        # Dice >= min_score needs at least this many shared trigrams
+        min_shared = max(1, math.ceil(min_score * size / (2 - min_score)))
+        keys = np.flatnonzero(shared >= min_shared)
+        scores = 2 * shared[keys] / (size + self.names.sizes[keys])
+        sizes = sum(self.key_counts[lv][keys] for lv in levels)
+        keep = (scores >= min_score) & (sizes > 0)
+        keys, scores = keys[keep], scores[keep]
+        # every key has an entry: the best `need` keys (and ties) suffice
+        if len(keys) > need:
+            cutoff = np.partition(scores, len(scores) - need)[len(scores) - need]
+            best = scores >= cutoff
+            keys, scores = keys[best], scores[best]
+
+        parts = [self._entries(lv, keys, scores) for lv in levels]
+        return (
+            np.concatenate([p[0] for p in parts]),
+            np.concatenate([p[1] for p in parts]),
+        )
+
+    def _entries(self, level: Level, keys: np.ndarray, scores: np.ndarray):
+        """Entries of `keys` at `level` with the score of their key."""
+        offsets = self.key_offsets[level]
+        starts = offsets[keys]
+        sizes = offsets[keys + 1] - starts
+        first = np.cumsum(sizes) - sizes
+        positions = np.repeat(starts - first, sizes) + np.arange(sizes.sum())
+        return self.key_entries[level][positions], np.repeat(scores, sizes)
+
+    def _below(self, parent: str | int, levels: list[Level]) -> np.ndarray:
+        """Entries below `parent`: one contiguous range of codes per level."""
+        parent = parse_code(parent) if isinstance(parent, str) else parent
+        parent_level = code_level(parent)
+        ranges = []
+        for level in levels:
+            if level <= parent_level:
+                continue
+            start, end = self.ranges[level]
+            scale = 10 ** (LEVEL_WIDTHS[level] - LEVEL_WIDTHS[parent_level])
+            lo, hi = np.searchsorted(
+                self.codes[start:end], [parent * scale, (parent + 1) * scale]
+            )
+            ranges.append(np.arange(start + lo, start + hi))
+        return np.concatenate(ranges) if ranges else np.zeros(0, dtype=np.int64)
+
+    def _context_scores(self, entries: np.ndarray, context: list[str]) -> np.ndarray:
+        """
+        Mean over the context parts of their best Dice score against the
+        names of each entry's ancestors.
+        """
+        codes = self.codes[entries]
+        entry_levels = self.entry_levels[entries]
+        best = np.zeros((len(context), len(entries)))
+        part_scores = [self.context.scores(part) for part in context]
+
+        for ancestor_level in CONTEXT_LEVELS:
+            has = entry_levels > ancestor_level
+            if not has.any():
+                continue
+            ancestors = codes[has] // 10 ** (
+                _WIDTHS[entry_levels[has]] - LEVEL_WIDTHS[ancestor_level]
+            )
+            ancestor_codes = self.ancestor_codes[ancestor_level]
+            rows = np.searchsorted(ancestor_codes, ancestors)
+            # an ancestor missing from its level scores 0, not the next code's name
+            found = rows < len(ancestor_codes)
+            found[found] = ancestor_codes[rows[found]] == ancestors[found]
+            targets = np.flatnonzero(has)[found]
+            keys = self.ancestor_keys[ancestor_level][rows[found]]
+            for c, scores in enumerate(part_scores):
+                best[c, targets] = np.maximum(best[c, targets], scores[keys])
+        return best.mean(axis=0)
+
+
+def _top(entries: np.ndarray, scores: np.ndarray, need: int):
+    """The `need` best entries plus any tied with the last (up to MAX_POOL)."""
+    if len(entries) > need:
+        cutoff = np.partition(scores, len(scores) - need)[len(scores) - need]
+        best = np.flatnonzero(scores >= cutoff)
+        if len(best) > MAX_POOL:
+            best = best[np.argsort(-scores[best], kind="stable")[:MAX_POOL]]
+        entries, scores = entries[best], scores[best]
+    return entries, scores
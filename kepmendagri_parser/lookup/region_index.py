@@ -0,0 +1,222 @@
+"""
+In-process lookups over the published datasets.
+
+    index = RegionIndex.load("datasets")
+    index["1101012001"].name
+    [r.name for r in index.ancestry("11.01.01.2001")]   # province → village
+    index.children("110101")                             # villages of a district
+
+Each level CSV is read on first use only (a service that resolves
+regencies never reads villages.csv). A level is held as columns: the
+integer codes (models.region_code) in CSV order, which is sorted by
+code, plus a dict code → row for O(1) resolution. Ancestors follow from
+the code by integer division, so `ancestry()` is one dict lookup per
+level. The children of a region are a contiguous run of the sorted
+child codes; the run boundaries of every parent are computed in one
+pass the first time `children()` needs them.
+"""
+
+import csv
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+
+from kepmendagri_parser.models.region_code import (
+    LEVEL_BY_WIDTH,
+    PARENT_DIVISORS,
+    Level,
+    ancestor_code,
+    code_level,
+    parse_code,
+)
+
+LEVEL_FILES = {
+    Level.PROVINCE: "provinces.csv",
+    Level.REGENCY: "regencies.csv",
+    Level.DISTRICT: "districts.csv",
+    Level.VILLAGE: "villages.csv",
+}
+
+# optional Region fields, in field order
+REGION_EXTRAS = ("capital", "type", "is_administrative")
+
+# columns held per level besides code and name (the parent code follows
+# from the code itself)
+LEVEL_COLUMNS = {
+    Level.PROVINCE: ("capital",),
+    Level.REGENCY: ("capital", "type", "is_administrative"),
+    Level.DISTRICT: (),
+    Level.VILLAGE: ("type",),
+}
+
+
+@dataclass(slots=True)
+class Region:
+    code: str
+    level: Level
+    name: str
+    parent_code: str | None
+    capital: str | None = None
+    type: str | None = None               # regency / city, village / urban_village
+    is_administrative: bool | None = None
+
+
+class LevelTable:
+    """One level of the datasets as columns, sorted by code."""
+
+    def __init__(self, level: Level, csv_path: Path):
+        self.level = level
+        self.codes = array("q")
+        self.names: list[str] = []
+        self.columns: dict[str, list] = {c: [] for c in LEVEL_COLUMNS[level]}
+        self._parent_divisor = PARENT_DIVISORS.get(level)
+        self._children: dict[int, tuple[int, int]] | None = None
+
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            code_at, name_at = header.index("code"), header.index("name")
+            extra = [(header.index(c), values) for c, values in self.columns.items()]
+            for row in reader:
+                self.codes.append(parse_code(row[code_at], level))
+                self.names.append(row[name_at])
+                for at, values in extra:
+                    values.append(row[at] or None)
+
+        if "is_administrative" in self.columns:
+            self.columns["is_administrative"] = [
+                v == "True" for v in self.columns["is_administrative"]
+            ]
+
+        if any(a >= b for a, b in zip(self.codes, self.codes[1:])):
+            raise ValueError(f"{csv_path.name}: codes are not sorted and unique")
+        self.rows = {code: i for i, code in enumerate(self.codes)}
+        self._extras = [self.columns.get(field) for field in REGION_EXTRAS]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def region(self, i: int) -> Region:
+        code = self.codes[i]
+        divisor = self._parent_divisor
+        capital, type_, is_administrative = self._extras
+        return Region(
+            str(code),
+            self.level,
+            self.names[i],
+            None if divisor is None else str(code // divisor),
+            None if capital is None else capital[i],
+            None if type_ is None else type_[i],
+            None if is_administrative is None else is_administrative[i],
+        )
+
+    def child_ranges(self) -> dict[int, tuple[int, int]]:
+        """parent code → [start, end) of its children in `codes`."""
+        if self._children is None:
+            ranges = {}
+            if self.level != Level.PROVINCE:
+                divisor = PARENT_DIVISORS[self.level]
+                start = 0
+                for i in range(1, len(self.codes) + 1):
+                    parent = self.codes[start] // divisor
+                    if i == len(self.codes) or self.codes[i] // divisor != parent:
+                        ranges[parent] = (start, i)
+                        start = i
+            self._children = ranges
+        return self._children
+
+
+class RegionIndex:
+    """Code lookups and hierarchy traversal over a datasets directory."""
+
+    def __init__(self, datasets_dir: Path):
+        self.datasets_dir = Path(datasets_dir)
+        self._levels: dict[Level, LevelTable] = {}
+
+    @classmethod
+    def load(cls, datasets_dir: str | Path) -> "RegionIndex":
+        """Index of the CSVs in `datasets_dir`; levels are read on first use."""
+        index = cls(datasets_dir)
+        missing = [
+            name for name in LEVEL_FILES.values()
+            if not (index.datasets_dir / name).exists()
+        ]
+        if missing:
+            raise FileNotFoundError(
+                f"Missing dataset file(s) in {index.datasets_dir}: {', '.join(missing)}"
+            )
+        return index
+
+    def table(self, level: Level) -> LevelTable:
+        table = self._levels.get(level)
+        if table is None:
+            table = LevelTable(level, self.datasets_dir / LEVEL_FILES[level])
+            self._levels[level] = table
+        return table
+
+    @property
+    def loaded_levels(self) -> list[Level]:
+        return sorted(self._levels)
+
+    # -------------------------
+    # Lookups
+    # -------------------------
+
+    def get(self, code: str | int) -> Region | None:
+        """The region with `code` (undotted, dotted or int), or None."""
+        try:
+            if isinstance(code, str):
+                code = parse_code(code)
+            level = LEVEL_BY_WIDTH[len(str(code))]
+        except (ValueError, KeyError):
+            return None
+        # not `_levels.get(level) or …`: a level without rows is falsy
+        table = self.table(level)
+        i = table.rows.get(code)
+        return None if i is None else table.region(i)
+
+    def __getitem__(self, code: str | int) -> Region:
+        region = self.get(code)
+        if region is None:
+            raise KeyError(code)
+        return region
+
+    def __contains__(self, code: str | int) -> bool:
+        return self.get(code) is not None
+
+    def ancestry(self, code: str | int) -> list[Region]:
+        """Province, regency, … down to the region itself; KeyError if unknown or malformed."""
+        key = _int_code(code)
+        own = code_level(key)
+        return [self[ancestor_code(key, level)] for level in Level if level <= own]
+
+    def parent(self, code: str | int) -> Region | None:
+        region = self[code]
+        return None if region.parent_code is None else self[region.parent_code]
+
+    def children(self, code: str | int | None = None) -> list[Region]:
+        """Regions directly below `code` in code order (provinces for None); KeyError if unknown."""
+        if code is None:
+            return self.regions(Level.PROVINCE)
+
+        code = _int_code(code)
+        level = self[code].level
+        if level == Level.VILLAGE:
+            return []
+        table = self.table(Level(level + 1))
+        start, end = table.child_ranges().get(code, (0, 0))
+        return [table.region(i) for i in range(start, end)]
+
+    def regions(self, level: Level) -> list[Region]:
+        table = self.table(level)
+        return [table.region(i) for i in range(len(table))]
+
+
+def _int_code(code: str | int) -> int:
+    """Integer code of a region code; KeyError (like an unknown code) if malformed."""
+    try:
+        key = parse_code(code) if isinstance(code, str) else code
+        code_level(key)
+    except ValueError:
+        raise KeyError(code) from None
+    return key
@@ -0,0 +1,159 @@
+import sys
+from array import array
+from enum import IntEnum
+from typing import Iterable, Iterator
+
+from kepmendagri_parser.models.region_code import Level, parse_code
+
+
+# code column value of a code that does not parse (codes never start with a 0)
+INVALID_CODE = 0
+
+
+class VillageType(IntEnum):
+    NONE = 0
+    VILLAGE = 1
+    URBAN_VILLAGE = 2
+    # any other label; the row keeps it in VillageColumns.invalid
+    UNKNOWN = 255
+
+    @property
+    def label(self) -> str | None:
+        return VILLAGE_TYPE_LABELS.get(self)
+
+
+VILLAGE_TYPE_LABELS = {
+    VillageType.NONE: None,
+    VillageType.VILLAGE: "village",
+    VillageType.URBAN_VILLAGE: "urban_village",
+}
+VILLAGE_TYPE_BY_LABEL = {label: t for t, label in VILLAGE_TYPE_LABELS.items()}
+
+
+class VillageColumns:
+    """
+    Column store for village rows.
+
+    83k villages as dicts cost a dict, five key slots and a code string
+    per row. Here codes are ints (see models.region_code) in arrays, the type is one
+    byte, names are interned (village names repeat a lot) and rows are
+    only materialised as dicts while iterating, one at a time.
+
+    Iteration yields the same dicts (same keys, same key order) the
+    village parser produces, so the store can stand in for a list of
+    village rows wherever rows are appended, extended, counted and
+    iterated.
+
+    Appending never fails: a code that does not parse is stored as
+    INVALID_CODE and an unknown type as VillageType.UNKNOWN, and the row's
+    original values are kept in `invalid` (by row index). Iteration yields
+    those rows as parsed; validation reports them (see normalize_village
+    and the foreign key check).
+    """
+
+    __slots__ = ("code", "district_code", "name", "type", "source_page", "invalid")
+
+    def __init__(self):
+        self.code = array("q")
+        self.district_code = array("q")
+        self.name: list[str | None] = []
+        self.type = bytearray()
+        self.source_page = array("l")
+        self.invalid: dict[int, dict] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict]) -> "VillageColumns":
+        if isinstance(rows, cls):
+            return rows
+        columns = cls()
+        columns.extend(rows)
+        return columns
+
+    def append(self, row: dict):
+        name = row.get("name")
+        vtype = row.get("type")
+        code = _code_or_invalid(row.get("code"), Level.VILLAGE)
+        district_code = _code_or_invalid(row.get("district_code"), Level.DISTRICT)
+        type_id = VILLAGE_TYPE_BY_LABEL.get(vtype, VillageType.UNKNOWN)
+
+        if INVALID_CODE in (code, district_code) or type_id == VillageType.UNKNOWN:
+            self.invalid[len(self.code)] = {
+                "code": row.get("code"),
+                "district_code": row.get("district_code"),
+                "type": vtype,
+            }
+
+        self.code.append(code)
+        self.district_code.append(district_code)
+        self.name.append(sys.intern(name) if name is not None else None)
+        self.type.append(type_id)
+        self.source_page.append(row.get("source_page") or 0)
+
+    def extend(self, rows: Iterable[dict]):
+        for row in rows:
+            self.append(row)
+
+    def __len__(self) -> int:
+        return len(self.code)
+
+    def row(self, i: int) -> dict:
+        invalid = self.invalid.get(i)
+        if invalid is not None:
+            return {
+                "code": invalid["code"],
+                "name": self.name[i],
+                "district_code": invalid["district_code"],
+                "type": invalid["type"],
+                "source_page": self.source_page[i],
+            }
+        return {
+            "code": str(self.code[i]),
+            "name": self.name[i],
+            "district_code": str(self.district_code[i]),
+            "type": VILLAGE_TYPE_LABELS[self.type[i]],
+            "source_page": self.source_page[i],
+        }
+
+    def __iter__(self) -> Iterator[dict]:
+        if self.invalid:
+            for i in range(len(self.code)):
+                yield self.row(i)
+            return
+
+        labels = VILLAGE_TYPE_LABELS
+        for code, name, district_code, vtype, page in zip(
+            self.code, self.name, self.district_code, self.type, self.source_page
+        ):
+            yield {
+                "code": str(code),
+                "name": name,
+                "district_code": str(district_code),
+                "type": labels[vtype],
+                "source_page": page,
+            }
+
+    def take(self, order: Iterable[int]) -> "VillageColumns":
+        """New store with the rows at `order`, in that order."""
+        order = list(order)
+        out = VillageColumns()
+        out.code = array("q", (self.code[i] for i in order))
+        out.district_code = array("q", (self.district_code[i] for i in order))
+        out.name = [self.name[i] for i in order]
+        out.type = bytearray(self.type[i] for i in order)
+        out.source_page = array("l", (self.source_page[i] for i in order))
+        if self.invalid:
+            out.invalid = {
+                j: self.invalid[i] for j, i in enumerate(order) if i in self.invalid
+            }
+        return out
+
+    def sorted_by_code(self) -> "VillageColumns":
+        """Stable sort by village code (ints sort like the fixed-width code strings)."""
+        return self.take(sorted(range(len(self.code)), key=self.code.__getitem__))
+
+
+def _code_or_invalid(code: str | None, level: Level) -> int:
+    try:
+        return parse_code(code, level)
+    except (TypeError, AttributeError, ValueError):
+        return INVALID_CODE
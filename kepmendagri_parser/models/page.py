@@ -1,7 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from kepmendagri_parser.pipeline.context import PageType
 
 @dataclass
 class PageResult:
     page: int
     content_type: PageType
+    # context-free row fragments, resolved later by PageStitcher
+    rows: list[dict] = field(default_factory=list)
+    table_calls: int = 0
+    text_calls: int = 0
+    header_calls: int = 0
+    cached_extraction: bool = False
+    cached_rows: bool = False
+    # seconds per stage (extraction calls, classifier, parser, page_total)
+    timings: dict[str, float] = field(default_factory=dict)
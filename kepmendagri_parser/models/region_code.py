@@ -0,0 +1,75 @@
+from enum import IntEnum
+
+
+class Level(IntEnum):
+    PROVINCE = 1
+    REGENCY = 2
+    DISTRICT = 3
+    VILLAGE = 4
+
+
+# digits of an undotted code per level: 11 / 1101 / 110101 / 1101012001
+LEVEL_WIDTHS = {
+    Level.PROVINCE: 2,
+    Level.REGENCY: 4,
+    Level.DISTRICT: 6,
+    Level.VILLAGE: 10,
+}
+LEVEL_BY_WIDTH = {width: level for level, width in LEVEL_WIDTHS.items()}
+
+# code // divisor of a level = code of its parent
+PARENT_DIVISORS = {
+    Level.REGENCY: 10 ** 2,
+    Level.DISTRICT: 10 ** 2,
+    Level.VILLAGE: 10 ** 4,
+}
+
+# smallest code of each level (codes never start with a 0)
+_LEVEL_FLOORS = tuple(
+    (10 ** (width - 1), level)
+    for level, width in sorted(LEVEL_WIDTHS.items(), reverse=True)
+)
+
+
+def parse_code(code: str, level: Level | None = None) -> int:
+    """
+    Region code ("1101012001" or "11.01.01.2001") as an int.
+
+    The decimal digits of the int are the undotted code, so the level
+    follows from its magnitude and integer division gives the parent.
+    Raises ValueError for anything else (or for another `level`).
+    """
+    digits = code.replace(".", "") if "." in code else code
+    width = len(digits)
+    if (
+        width not in LEVEL_BY_WIDTH
+        or not digits.isdigit()
+        or digits[0] == "0"
+        or (level is not None and LEVEL_WIDTHS[level] != width)
+    ):
+        raise ValueError(f"invalid region code: {code!r}")
+    return int(digits)
+
+
+def code_level(code: int) -> Level:
+    for floor, level in _LEVEL_FLOORS:
+        if code >= floor:
+            return level
+    raise ValueError(f"invalid region code: {code!r}")
+
+
+def parent_code(code: int) -> int | None:
+    """Code of the parent region (None for a province)."""
+    level = code_level(code)
+    if level == Level.PROVINCE:
+        return None
+    return code // PARENT_DIVISORS[level]
+
+
+def ancestor_code(code: int, level: Level) -> int:
+    """Code of the enclosing region at `level` (the code itself at its own level)."""
+    own = code_level(code)
+    if level > own:
+        raise ValueError(f"{code} has no {level.name.lower()} ancestor")
+    return code // 10 ** (LEVEL_WIDTHS[own] - LEVEL_WIDTHS[level])
+
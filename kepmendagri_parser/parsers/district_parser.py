@@ -1,18 +1,10 @@
-import re
-
-PROVINCE_CODE_RE = re.compile(r"^\d{2}$")
-REGENCY_CODE_RE  = re.compile(r"^\d{2}\.\d{2}$")
-DISTRICT_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}$")
-
-def clean_name(value: str | None) -> str | None:
-    if not value:
-        return None
-
-    value = re.sub(r"[\n\r\t]+", " ", value)
-
-    value = re.sub(r"\s{2,}", " ", value)
-
-    return value.strip()
+from kepmendagri_parser.utils.text_normalize import (
+    PROVINCE_CODE_RE,
+    REGENCY_CODE_RE,
+    DISTRICT_CODE_RE,
+    clean_name,
+    strip_leading_number_word,
+)
 
 def normalize_header_rows(table, max_rows=2):
     headers = table[:max_rows]
@@ -108,7 +100,7 @@ def extract_districts_from_table(table, page_num, initial_context=None):
                 "code": code.replace(".", ""),
                 "province_code": current_province_code,
                 "regency_code": current_regency_code,
-                "name": re.sub(r"^\d+\s+", "", name),
+                "name": strip_leading_number_word(name),
                 "province_capital": current_province_capital,
                 "regency_capital": current_regency_capital,
                 "source_page": page_num,
@@ -1,7 +1,4 @@
-def split_cell(cell):
-    if not cell:
-        return []
-    return [x.strip() for x in cell.split("\n") if x.strip()]
+from kepmendagri_parser.utils.text_normalize import split_cell
 
 
 def extract_provinces_from_table(table, page_num):
@@ -1,6 +1,8 @@
 import re
 from typing import List, Dict, Optional
 
+from kepmendagri_parser.utils.text_normalize import has_digit
+
 # ============================================================
 # 1. DETECTOR REGEX (HANYA UNTUK MENEMUKAN BARIS DATA)
 # ============================================================
@@ -173,7 +175,7 @@ def extract_regencies_from_page_text(
         # PRIORITAS 3 — LANJUTAN NAMA (MULTILINE)
         # ====================================================
         if current:
-            if re.search(r"\d", line):
+            if has_digit(line):
                 continue
             if looks_like_capital(line):
                 continue
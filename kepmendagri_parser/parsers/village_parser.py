@@ -1,17 +1,9 @@
-import re
-
-def clean_name(value: str | None) -> str | None:
-    if not value:
-        return None
-
-    value = re.sub(r"[\n\r\t]+", " ", value)
-    value = re.sub(r"\s{2,}", " ", value)
-
-    return value.strip()
-
-
-VILLAGE_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}\.\d{4}$")
-DISTRICT_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}$")
+from kepmendagri_parser.utils.text_normalize import (
+    DISTRICT_CODE_RE,
+    VILLAGE_CODE_RE,
+    clean_name,
+    strip_leading_number,
+)
 
 
 def extract_villages_from_table(table, page, initial_district_code=None):
@@ -54,9 +46,7 @@ def extract_villages_from_table(table, page, initial_district_code=None):
             else:
                 continue
 
-            name = clean_name(
-                re.sub(r"^\d+\s*", "", name)
-            )
+            name = clean_name(strip_leading_number(name))
 
             rows.append({
                 "code": kode.replace(".", ""),
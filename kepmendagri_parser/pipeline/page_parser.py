@@ -0,0 +1,151 @@
+import time
+from typing import Iterator
+
+from kepmendagri_parser.pipeline.context import PageType
+from kepmendagri_parser.models.page import PageResult
+
+from kepmendagri_parser.classifier.page_classifier import classify_page
+from kepmendagri_parser.extractors.page_extraction import PageExtraction
+
+from kepmendagri_parser.parsers.province_parser import extract_provinces_from_table
+from kepmendagri_parser.parsers.regency_parser import extract_regencies_from_page_text
+from kepmendagri_parser.parsers.district_parser import extract_districts_from_table
+from kepmendagri_parser.parsers.village_parser import extract_villages_from_table
+
+from kepmendagri_parser.utils.page_cache import PageCache
+from kepmendagri_parser.utils.page_index import PageIndex
+
+
+# Placeholder for values carried over from previous pages.
+# Pages are parsed without knowing the previous page, every
+# carried value is resolved later by PageStitcher (sequentially).
+CARRIED = "__carried__"
+
+DISTRICT_CONTEXT_KEYS = (
+    "province_code",
+    "regency_code",
+    "province_capital",
+    "regency_capital",
+)
+
+# timing stage name of each page parser
+PARSER_STAGES = {
+    PageType.PROVINSI: "extract_provinces_from_table",
+    PageType.KAB_KOTA: "extract_regencies_from_page_text",
+    PageType.KECAMATAN: "extract_districts_from_table",
+    PageType.KELURAHAN_DESA: "extract_villages_from_table",
+}
+
+
+def parse_page(extraction: PageExtraction, cache: PageCache | None = None) -> PageResult:
+    """
+    Classify and parse a single page into context-free row fragments.
+
+    A page type already set on the extraction (from a page index) is
+    trusted and the page is not classified.
+
+    With a cache, a cached extraction skips the PDF entirely and cached
+    rows skip the parser (both keyed by the code version that made them).
+    """
+    page_number = extraction.page_number
+    started = time.perf_counter()
+    timings = {}
+
+    cached = cache.load_extraction(page_number) if cache else None
+    if cached:
+        extraction.load(cached["table"], cached["text"])
+        page_type = PageType(cached["page_type"])
+    elif extraction.page_type is not None:
+        page_type = extraction.page_type
+    else:
+        page_type = _timed_stage(
+            timings, "classify_page", extraction, lambda: classify_page(extraction)
+        )
+    extraction.page_type = page_type
+
+    rows = cache.load_rows(page_number, page_type) if cache else None
+    cached_rows = rows is not None
+
+    if rows is None:
+        rows = _timed_stage(
+            timings,
+            PARSER_STAGES.get(page_type, "parse_rows"),
+            extraction,
+            lambda: parse_rows(extraction, page_type),
+        )
+        if cache:
+            cache.store_rows(page_number, page_type, rows)
+
+    if cache and (not cached or extraction.table_calls or extraction.text_calls):
+        table, text = extraction.extracted()
+        cache.store_extraction(page_number, page_type, table, text)
+
+    timings.update(extraction.timings)
+    timings["page_total"] = time.perf_counter() - started
+
+    return PageResult(
+        page=page_number,
+        content_type=page_type,
+        rows=rows,
+        table_calls=extraction.table_calls,
+        text_calls=extraction.text_calls,
+        header_calls=extraction.header_calls,
+        cached_extraction=cached is not None,
+        cached_rows=cached_rows,
+        timings=timings,
+    )
+
+
+def _timed_stage(timings: dict, stage: str, extraction: PageExtraction, run):
+    """Run a stage and record its time, excluding lazy extraction it triggered."""
+    started = time.perf_counter()
+    extracting = extraction.extraction_seconds
+    try:
+        return run()
+    finally:
+        timings[stage] = (
+            time.perf_counter() - started
+            - (extraction.extraction_seconds - extracting)
+        )
+
+
+def parse_rows(extraction: PageExtraction, page_type: PageType) -> list[dict]:
+    page_number = extraction.page_number
+    rows = []
+
+    if page_type == PageType.PROVINSI:
+        rows = extract_provinces_from_table(extraction.table, page_number)
+
+    elif page_type == PageType.KAB_KOTA:
+        rows = extract_regencies_from_page_text(extraction.text, page_number)
+
+    elif page_type == PageType.KECAMATAN:
+        rows = extract_districts_from_table(
+            extraction.table,
+            page_number,
+            initial_context={k: CARRIED for k in DISTRICT_CONTEXT_KEYS},
+        )
+
+    elif page_type == PageType.KELURAHAN_DESA:
+        rows = extract_villages_from_table(
+            extraction.table,
+            page_number,
+            initial_district_code=CARRIED,
+        )
+
+    return rows
+
+
+def iter_page_results(
+    pdf,
+    start_page: int,
+    end_page: int,
+    cache: PageCache | None = None,
+    engine=None,
+    index: PageIndex | None = None,
+) -> Iterator[PageResult]:
+    for page_number in range(start_page, end_page + 1):
+        extraction = PageExtraction(pdf.pages[page_number - 1], page_number, engine=engine)
+        if index:
+            extraction.page_type = index.page_type(page_number)
+        yield parse_page(extraction, cache=cache)
@@ -0,0 +1,76 @@
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+from kepmendagri_parser.extractors.engines import get_engine
+from kepmendagri_parser.models.page import PageResult
+from kepmendagri_parser.pipeline.page_parser import iter_page_results
+from kepmendagri_parser.utils.page_cache import PageCache
+from kepmendagri_parser.utils.page_index import PageIndex
+
+# pages per task: small enough to balance load across workers,
+# large enough to amortize opening the PDF in each task
+MAX_PAGES_PER_TASK = 50
+
+
+def parse_page_range(
+    pdf_path: Path,
+    start_page: int,
+    end_page: int,
+    cache: PageCache | None = None,
+    engine_name: str | None = None,
+    index: PageIndex | None = None,
+) -> list[PageResult]:
+    """
+    Worker entry point: parse a page range with its own PDF handle.
+    """
+    engine = get_engine(engine_name)
+    with engine.open(pdf_path) as pdf:
+        return list(
+            iter_page_results(
+                pdf, start_page, end_page, cache=cache, engine=engine, index=index
+            )
+        )
+
+
+def split_page_ranges(
+    page_ranges: list[tuple[int, int]], workers: int
+) -> list[tuple[int, int]]:
+    total = sum(last - first + 1 for first, last in page_ranges)
+    if total <= 0:
+        return []
+
+    size = max(1, min(MAX_PAGES_PER_TASK, -(-total // (workers * 4))))
+    return [
+        (first, min(first + size - 1, end_page))
+        for start_page, end_page in page_ranges
+        for first in range(start_page, end_page + 1, size)
+    ]
+
+
+def iter_page_results_parallel(
+    pdf_path: Path,
+    page_ranges: list[tuple[int, int]],
+    workers: int,
+    cache: PageCache | None = None,
+    engine_name: str | None = None,
+    index: PageIndex | None = None,
+) -> Iterator[PageResult]:
+    """
+    Fan page parsing out to worker processes, yield results in page order.
+
+    `page_ranges` are inclusive (first, last) ranges in ascending order.
+    Closing the generator early cancels page ranges not yet started.
+    """
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [
+            executor.submit(
+                parse_page_range, pdf_path, first, last, cache, engine_name, index
+            )
+            for first, last in split_page_ranges(page_ranges, workers)
+        ]
+        for future in futures:
+            yield from future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
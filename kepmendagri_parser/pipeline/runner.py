@@ -1,22 +1,43 @@
-import pdfplumber
+from contextlib import closing, nullcontext
 from pathlib import Path
 from typing import Callable
 
-from kepmendagri_parser.pipeline.state import ParsingState
 from kepmendagri_parser.pipeline.context import PageType
-
-from kepmendagri_parser.classifier.page_classifier import classify_page
-from kepmendagri_parser.extractors.page_table import extract_page_table
-from kepmendagri_parser.extractors.page_text import extract_page_text
-
-from kepmendagri_parser.parsers.province_parser import extract_provinces_from_table
-from kepmendagri_parser.parsers.regency_parser import extract_regencies_from_page_text
-from kepmendagri_parser.parsers.district_parser import extract_districts_from_table
-from kepmendagri_parser.parsers.village_parser import extract_villages_from_table
-
-from kepmendagri_parser.builders.dataset_builder import build_dataset
-
-from kepmendagri_parser.utils.raw_cache import dump_raw, load_raw,  cleanup_tmp
+from kepmendagri_parser.pipeline.state import ParsingState
+from kepmendagri_parser.pipeline.stitch import PageStitcher
+from kepmendagri_parser.pipeline.page_parser import iter_page_results
+from kepmendagri_parser.pipeline.parallel import iter_page_results_parallel
+
+from kepmendagri_parser.extractors.page_extraction import ExtractionStats
+from kepmendagri_parser.extractors.engines import get_engine
+
+from kepmendagri_parser.builders.build_manifest import MANIFEST_DIR, BuildManifest
+from kepmendagri_parser.builders.dataset_builder import build_dataset, build_dataset_streaming
+from kepmendagri_parser.builders.delta_output import write_delta
+from kepmendagri_parser.builders.external_sort import SpillSorter
+
+from kepmendagri_parser.utils.raw_cache import (
+    dump_raw,
+    load_raw,
+    iter_raw,
+    cleanup_tmp,
+    dump_raw_manifest,
+    raw_matches_pdf,
+)
+from kepmendagri_parser.utils.page_cache import PageCache
+from kepmendagri_parser.utils.checkpoint import Checkpoint, LEVELS
+from kepmendagri_parser.utils.page_index import (
+    PageIndex,
+    SECTION_ORDER,
+    build_page_index,
+    check_page_index_boundaries,
+)
+from kepmendagri_parser.utils.generate_release_metadata import (
+    release_metadata,
+    sha256_file,
+    write_release_metadata,
+)
+from kepmendagri_parser.utils.metrics import PipelineMetrics, peak_rss_mb
 
 
 def dbg(level: int, current: int, msg: str):
@@ -46,6 +67,33 @@ def report_and_validate_counts(
     if len(village_rows) == 0:
         raise ValueError("❌ No villages parsed at all")
 
+def resolve_page_index(
+    pdf, engine, pdf_sha256: str, index_path: Path | None, debug_level: int
+) -> PageIndex:
+    index = PageIndex.load(index_path, pdf_sha256) if index_path else None
+    if index:
+        mismatches = check_page_index_boundaries(pdf, engine, index)
+        if not mismatches:
+            dbg(1, debug_level, f"🗂️ Page index : {index_path}")
+            return index
+        dbg(
+            1,
+            debug_level,
+            f"⚠️ Page index {index_path} is wrong about page {mismatches[0]['page']}, rebuilding",
+        )
+
+    index = build_page_index(pdf, engine, pdf_sha256)
+    dbg(
+        1,
+        debug_level,
+        f"🗂️ Page index built from {index.probes} of {index.page_count} pages"
+        + (" (linear scan: sections out of order)" if index.linear_scan else ""),
+    )
+    if index_path:
+        index.save(index_path)
+        dbg(1, debug_level, f"💾 Page index saved to {index_path}")
+    return index
+
 def run_pipeline(
     pdf_path: Path,
     out_dir: Path,
@@ -54,13 +102,56 @@ def run_pipeline(
     debug_level: int = 0,
     on_progress: Callable[[int, int], None] | None = None,
     reuse_raw: bool = False,
+    workers: int = 1,
+    cache_dir: Path | None = None,
+    resume: bool = False,
+    checkpoint_every: int = 100,
+    streaming: bool = False,
+    engine_name: str = "pdfplumber",
+    index_path: Path | None = None,
+    sections: list[PageType] | None = None,
+    metrics_out: Path | None = None,
+    builder: str = "python",
+    formats: list[str] | None = None,
+    strict_codes: bool = False,
+    delta_from: Path | None = None,
+    release_version: str | None = None,
+    release_dir: Path = Path("metadata/releases"),
 ):
     dbg(1, debug_level, "🚀 Starting Kepmendagri Parser Pipeline")
     dbg(1, debug_level, f"📄 Source PDF : {pdf_path}")
     dbg(1, debug_level, f"📂 Output dir : {out_dir}")
     dbg(1, debug_level, "-" * 60)
 
+    metrics = PipelineMetrics() if metrics_out else None
+    stage = metrics.stage if metrics else (lambda name: nullcontext())
+
+    def write_metrics():
+        if metrics:
+            metrics.write(metrics_out)
+            dbg(1, debug_level, f"⏱️ Metrics written to {metrics_out}")
+
     tmp_dir = out_dir.parent / ".tmp"
+    with stage("hash_pdf"):
+        pdf_sha256 = sha256_file(pdf_path)
+    dbg(2, debug_level, f"🔑 Source PDF SHA256 : {pdf_sha256}")
+
+    # only some sections: re-parse for inspection, no dataset build
+    partial = sections is not None and set(sections) != set(SECTION_ORDER)
+    if partial:
+        reuse_raw = False
+        work_dir = tmp_dir / "partial"
+    else:
+        work_dir = tmp_dir
+
+    if streaming:
+        # spill runs never outlive the run that wrote them
+        cleanup_tmp(tmp_dir / "spill")
+
+    if reuse_raw and not raw_matches_pdf(tmp_dir, pdf_sha256):
+        if (tmp_dir / "province.raw.json").exists():
+            dbg(1, debug_level, "⚠️ Cached raw data belongs to a different PDF, re-parsing")
+        reuse_raw = False
 
     # ===============================
     # LOAD RAW (FAST PATH)
@@ -70,105 +161,175 @@ def run_pipeline(
         province_rows = load_raw(tmp_dir / "province.raw.json")
         regency_rows  = load_raw(tmp_dir / "regency.raw.json")
         district_rows = load_raw(tmp_dir / "district.raw.json")
-        village_rows  = load_raw(tmp_dir / "village.raw.json")
+
+        if streaming:
+            # villages go straight from the raw file into the spill runs
+            sorter = SpillSorter(tmp_dir / "spill", key=lambda r: r["code"])
+            sorter.extend(iter_raw(tmp_dir / "village.raw.json"))
+            village_rows = sorter
+        else:
+            village_rows = load_raw(tmp_dir / "village.raw.json")
 
     # ===============================
     # PARSE PDF (SLOW PATH)
     # ===============================
     else:
         state = ParsingState()
+        stitcher = PageStitcher(
+            village_rows=(
+                SpillSorter(tmp_dir / "spill", key=lambda r: r["code"])
+                if streaming else None
+            ),
+            journal=checkpoint_every > 0,
+        )
+        extraction_stats = ExtractionStats()
 
-        seen_province = False
-
-        province_rows = []
-        regency_rows = []
-        district_rows = []
-        village_rows = []
-
-        district_context = {
-            "province_code": None,
-            "regency_code": None,
-            "province_capital": None,
-            "regency_capital": None,
-        }
+        engine = get_engine(engine_name)
+        dbg(1, debug_level, f"⚙️ Extraction engine : {engine.name}")
 
-        village_context = {"district_code": None}
+        cache = PageCache(cache_dir, pdf_sha256, engine.name) if cache_dir else None
+        if cache:
+            dbg(1, debug_level, f"🗄️ Page cache : {cache.root}")
 
-        with pdfplumber.open(pdf_path) as pdf:
+        checkpoint = Checkpoint(
+            work_dir / "checkpoint",
+            pdf_sha256,
+            start_page,
+            end_page=end_page,
+            sections=[s.value for s in sections] if partial else None,
+        )
+        first_page = start_page
+
+        saved = checkpoint.load() if resume and checkpoint_every else None
+        if saved:
+            stitcher.restore(
+                saved,
+                {level: checkpoint.iter_rows(level) for level in LEVELS},
+            )
+            first_page = saved["last_page"] + 1
+            dbg(1, debug_level, f"⏯️ Resuming from checkpoint after page {saved['last_page']}")
+        else:
+            if resume:
+                dbg(1, debug_level, "⚠️ No usable checkpoint found, starting from scratch")
+            checkpoint.reset()
+
+        with engine.open(pdf_path) as pdf:
             total_pages = len(pdf.pages)
             end_page = min(end_page or total_pages, total_pages)
 
-            total_to_process = end_page - start_page + 1
-            processed = 0
-
-            for page_number in range(start_page, end_page + 1):
-                processed += 1
-
-                if on_progress:
-                    on_progress(processed, total_to_process)
-
-                page = pdf.pages[page_number - 1]
-                page_type = classify_page(page)
-
-                if seen_province and page_type == PageType.UNKNOWN:
-                    if on_progress:
-                        # force progress to 100%
-                        on_progress(total_to_process, total_to_process)
-                    break
-
-                if page_type == PageType.PROVINSI:
-                    seen_province = True
-                    rows = extract_provinces_from_table(
-                        extract_page_table(page), page_number
-                    )
-                    province_rows.extend(rows)
-
-                elif page_type == PageType.KAB_KOTA:
-                    rows = extract_regencies_from_page_text(
-                        extract_page_text(page), page_number
-                    )
-                    regency_rows.extend(rows)
-
-                elif page_type == PageType.KECAMATAN:
-                    rows = extract_districts_from_table(
-                        extract_page_table(page),
-                        page_number,
-                        initial_context=district_context,
-                    )
-                    if rows:
-                        last = rows[-1]
-                        last_provice_code =  last.get("province_code")
-                        last_regency_code = last.get("regency_code")
-                        last_province_capital = last.get("province_capital")
-                        last_regency_capital = last.get("regency_capital")
-
-                        district_rows.extend(r for r in rows if r.get("name") is not None)
-                        district_context.update({
-                            "province_code": last_provice_code,
-                            "regency_code": last_regency_code,
-                            "province_capital": last_province_capital,
-                            "regency_capital": last_regency_capital,
-                        })
-
-                elif page_type == PageType.KELURAHAN_DESA:
-                    rows = extract_villages_from_table(
-                        extract_page_table(page),
-                        page_number,
-                        initial_district_code=village_context["district_code"],
+            index = None
+            if index_path or sections:
+                with stage("page_index"):
+                    index = resolve_page_index(
+                        pdf, engine, pdf_sha256, index_path, debug_level
                     )
-                    if rows:
-                        last = rows[-1]
-                        last_district_code = last.get("district_code")
-                        village_rows.extend(r for r in rows if r.get("name") is not None)
-                        village_context["district_code"] = last_district_code
-
-                state.last_page_type = page_type
+                page_ranges = index.page_ranges(sections, start_page, end_page)
+                dbg(
+                    2,
+                    debug_level,
+                    "  Page ranges : "
+                    + ", ".join(f"{first}-{last}" for first, last in page_ranges),
+                )
+            else:
+                page_ranges = [(start_page, end_page)]
+
+            pending = [
+                (max(first, first_page), last)
+                for first, last in page_ranges
+                if last >= first_page
+            ]
+
+            total_to_process = sum(last - first + 1 for first, last in page_ranges)
+            processed = total_to_process - sum(last - first + 1 for first, last in pending)
+            last_page = first_page - 1
+
+            if workers > 1:
+                dbg(1, debug_level, f"🧵 Parsing pages with {workers} worker processes")
+                results = iter_page_results_parallel(
+                    pdf_path, pending, workers,
+                    cache=cache, engine_name=engine.name, index=index,
+                )
+            else:
+                def iter_ranges():
+                    for first, last in pending:
+                        yield from iter_page_results(
+                            pdf, first, last, cache=cache, engine=engine, index=index
+                        )
+
+                results = iter_ranges()
+
+            try:
+                with stage("parse_pages"), closing(results):
+                    for result in results:
+                        processed += 1
+
+                        if on_progress:
+                            on_progress(processed, total_to_process)
+
+                        extraction_stats.record(result)
+                        if metrics:
+                            metrics.record_page(result)
+
+                        if not stitcher.feed(result):
+                            if on_progress:
+                                # force progress to 100%
+                                on_progress(total_to_process, total_to_process)
+                            break
+
+                        state.last_page_type = result.content_type
+                        last_page = result.page
+
+                        if checkpoint_every and processed % checkpoint_every == 0:
+                            checkpoint.save(last_page, stitcher)
+
+            except BaseException:
+                # keep everything up to the last completed page for --resume
+                if checkpoint_every and last_page >= first_page:
+                    checkpoint.save(last_page, stitcher)
+                    dbg(1, debug_level, f"💾 Checkpoint saved after page {last_page}")
+                raise
+
+        province_rows = stitcher.province_rows
+        regency_rows = stitcher.regency_rows
+        district_rows = stitcher.district_rows
+        village_rows = stitcher.village_rows
+
+        dbg(1, debug_level, "🔎 Page extraction summary:")
+        dbg(1, debug_level, f"  Pages processed   : {extraction_stats.pages}")
+        dbg(1, debug_level, f"  Table extractions : {extraction_stats.table_extractions}")
+        dbg(1, debug_level, f"  Text extractions  : {extraction_stats.text_extractions}")
+        dbg(1, debug_level, f"  Header-only reads : {extraction_stats.header_extractions}")
+        dbg(
+            1,
+            debug_level,
+            f"  Max tables / page : {extraction_stats.max_table_extractions_per_page}",
+        )
+        if cache:
+            dbg(1, debug_level, f"  Cached extractions: {extraction_stats.cached_extractions}")
+            dbg(1, debug_level, f"  Cached page rows  : {extraction_stats.cached_rows}")
+        dbg(1, debug_level, "-" * 60)
+
+        if partial:
+            parsed = dict(zip(LEVELS, SECTION_ORDER))
+            for level, rows in zip(
+                LEVELS, (province_rows, regency_rows, district_rows, village_rows)
+            ):
+                if parsed[level] in sections:
+                    dump_raw(rows, work_dir / f"{level}.raw.json")
+                    dbg(1, debug_level, f"  {level:9} : {len(rows)} rows → {work_dir / f'{level}.raw.json'}")
+            if checkpoint_every:
+                checkpoint.reset()
+            dbg(1, debug_level, "ℹ️ Partial run (not all sections parsed), dataset build skipped")
+            write_metrics()
+            return
 
         # === dump raw parsed data (implicit cache) ===
-        dump_raw(province_rows, tmp_dir / "province.raw.json")
-        dump_raw(regency_rows,  tmp_dir / "regency.raw.json")
-        dump_raw(district_rows, tmp_dir / "district.raw.json")
-        dump_raw(village_rows,  tmp_dir / "village.raw.json")
+        with stage("dump_raw"):
+            dump_raw(province_rows, tmp_dir / "province.raw.json")
+            dump_raw(regency_rows,  tmp_dir / "regency.raw.json")
+            dump_raw(district_rows, tmp_dir / "district.raw.json")
+            dump_raw(village_rows,  tmp_dir / "village.raw.json")
+            dump_raw_manifest(tmp_dir, pdf_sha256)
     
     # ===============================
     # RAW DATA REPORT
@@ -186,14 +347,28 @@ def run_pipeline(
     # ===============================
     dbg(1, debug_level, "🛠️ Building final datasets…")
 
+    if streaming:
+        build = build_dataset_streaming
+    elif builder == "pandas":
+        # pandas is only imported when the vectorised builder is selected
+        from kepmendagri_parser.builders.dataset_builder_pandas import build_dataset_pandas
+
+        build = build_dataset_pandas
+    else:
+        build = build_dataset
+
     try:
-        build_dataset(
-            province_rows,
-            regency_rows,
-            district_rows,
-            village_rows,
-            out_dir,
-        )
+        with stage("build"):
+            report = build(
+                province_rows,
+                regency_rows,
+                district_rows,
+                village_rows,
+                out_dir,
+                metrics=metrics,
+                formats=formats or (),
+                strict_codes=strict_codes,
+            )
 
     except Exception as e:
         dbg(1, debug_level, "❌ Dataset build failed")
@@ -201,8 +376,29 @@ def run_pipeline(
         raise
 
     else:
-        cleanup_tmp(tmp_dir)
+        # build manifests stay for the next incremental build
+        cleanup_tmp(tmp_dir, keep=[MANIFEST_DIR])
         dbg(1, debug_level, "🧹 Temporary raw cache cleaned up")
 
+    if delta_from:
+        with stage("delta"):
+            delta_dir = write_delta(delta_from, BuildManifest(out_dir))
+        dbg(1, debug_level, f"🧩 Delta from {delta_from} written to {delta_dir}")
+
+    if release_version:
+        # hashes and row counts come from the build manifest, and the PDF
+        # was hashed above: no output is read again
+        with stage("release_metadata"):
+            metadata = release_metadata(release_version, out_dir, pdf_sha256)
+            metadata_path, _ = write_release_metadata(metadata, release_dir)
+        dbg(1, debug_level, f"🏷️ Release metadata : {metadata_path}")
+
+    dbg(1, debug_level, f"📦 Rebuilt   : {', '.join(report['rebuilt']) or '-'}")
+    dbg(1, debug_level, f"📦 Unchanged : {', '.join(report['unchanged']) or '-'}")
+    dbg(1, debug_level, f"🧠 Peak RSS  : {peak_rss_mb()} MiB")
+
+    write_metrics()
+
     dbg(1, debug_level, "✅ Pipeline finished successfully")
+    return report
 
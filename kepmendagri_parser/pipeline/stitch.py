@@ -0,0 +1,121 @@
+from kepmendagri_parser.pipeline.context import PageType
+from kepmendagri_parser.models.columns import VillageColumns
+from kepmendagri_parser.models.page import PageResult
+from kepmendagri_parser.pipeline.page_parser import CARRIED, DISTRICT_CONTEXT_KEYS
+
+LEVELS = ("province", "regency", "district", "village")
+
+
+class PageStitcher:
+    """
+    Sequential pass over context-free page fragments (in page order).
+
+    Resolves the province / regency / district carried across page
+    boundaries exactly like passing `initial_context` /
+    `initial_district_code` page by page, and collects the final rows.
+
+    Villages are collected in a VillageColumns store by default;
+    `village_rows` may be any sink with append/extend/len (e.g. a
+    SpillSorter in streaming mode). With `journal=True`, rows emitted
+    since the last `drain_journal()` are also kept for checkpointing.
+    """
+
+    def __init__(self, village_rows=None, journal: bool = False):
+        self.seen_province = False
+        self.finished = False
+
+        self.province_rows: list[dict] = []
+        self.regency_rows: list[dict] = []
+        self.district_rows: list[dict] = []
+        self.village_rows = village_rows if village_rows is not None else VillageColumns()
+
+        self.district_context = {k: None for k in DISTRICT_CONTEXT_KEYS}
+        self.village_context = {"district_code": None}
+
+        self._journal = {level: [] for level in LEVELS} if journal else None
+
+    def _sink(self, level: str):
+        return {
+            "province": self.province_rows,
+            "regency": self.regency_rows,
+            "district": self.district_rows,
+            "village": self.village_rows,
+        }[level]
+
+    def _emit(self, level: str, rows: list[dict]):
+        self._sink(level).extend(rows)
+        if self._journal is not None:
+            self._journal[level].extend(rows)
+
+    def drain_journal(self) -> dict[str, list[dict]]:
+        """Rows emitted since the previous drain, per level."""
+        drained = self._journal
+        self._journal = {level: [] for level in LEVELS}
+        return drained
+
+    def feed(self, result: PageResult) -> bool:
+        """
+        Consume one page. Returns False once the end of the data
+        sections has been reached (UNKNOWN page after provinces).
+        """
+        page_type = result.content_type
+
+        if self.seen_province and page_type == PageType.UNKNOWN:
+            self.finished = True
+            return False
+
+        if page_type == PageType.PROVINSI:
+            self.seen_province = True
+            self._emit("province", result.rows)
+
+        elif page_type == PageType.KAB_KOTA:
+            self._emit("regency", result.rows)
+
+        elif page_type == PageType.KECAMATAN:
+            rows = [self._resolve_district(r) for r in result.rows]
+            if rows:
+                last = rows[-1]
+                self._emit("district", [r for r in rows if r.get("name") is not None])
+                self.district_context.update({
+                    k: last.get(k) for k in DISTRICT_CONTEXT_KEYS
+                })
+
+        elif page_type == PageType.KELURAHAN_DESA:
+            rows = [self._resolve_village(r) for r in result.rows]
+            # villages before the first district marker are only kept
+            # when a district was carried over from a previous page
+            rows = [r for r in rows if r["district_code"]]
+            if rows:
+                last = rows[-1]
+                self._emit("village", [r for r in rows if r.get("name") is not None])
+                self.village_context["district_code"] = last.get("district_code")
+
+        return True
+
+    def context_state(self) -> dict:
+        """Carried state needed to continue stitching from a checkpoint."""
+        return {
+            "seen_province": self.seen_province,
+            "district_context": dict(self.district_context),
+            "village_context": dict(self.village_context),
+        }
+
+    def restore(self, state: dict, rows: dict):
+        """Restore carried state and previously stitched rows (iterables per level)."""
+        self.seen_province = state["seen_province"]
+        self.district_context.update(state["district_context"])
+        self.village_context.update(state["village_context"])
+
+        for level in LEVELS:
+            self._sink(level).extend(rows[level])
+
+    def _resolve_district(self, row: dict) -> dict:
+        for k in DISTRICT_CONTEXT_KEYS:
+            if row.get(k) == CARRIED:
+                row[k] = self.district_context[k]
+        return row
+
+    def _resolve_village(self, row: dict) -> dict:
+        if row.get("district_code") == CARRIED:
+            row["district_code"] = self.village_context["district_code"]
+        return row
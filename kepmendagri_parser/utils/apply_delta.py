@@ -0,0 +1,288 @@
+"""
+Patch a previous release to the next one with its delta (see
+builders.delta_output), instead of reloading every file:
+
+    python -m kepmendagri_parser.utils.apply_delta \
+        --delta delta --datasets datasets \
+        --release metadata/releases/region-id-1.0.2.json
+
+Patches whichever of the level CSVs and region-id.sqlite are in
+`--datasets`:
+
+- CSV: each level file is merged with its delta in one streaming pass
+  into `<file>.tmp`; regions_id.csv is rebuilt from the patched levels.
+  The files are replaced only once every SHA256 matches the delta's
+  target (and the release metadata, when given).
+- SQLite: the delta rows are applied in one transaction (parents
+  before children for inserts and updates, children first for
+  deletes). Each table is then rendered as the CSV it was loaded from,
+  and the transaction is committed only when those hashes match too.
+
+The base files are checked against the delta's base hashes first, so
+a delta is never applied to the wrong release.
+"""
+
+import argparse
+import csv
+import json
+import sqlite3
+from pathlib import Path
+
+from kepmendagri_parser.builders.dataset_builder import (
+    DISTRICT_FIELDS,
+    HashingWriter,
+    LEVEL_OUTPUTS,
+    PROVINCE_FIELDS,
+    REGENCY_FIELDS,
+    REGIONS_ID_FIELDS,
+    REGIONS_ID_OUTPUT,
+    VILLAGE_FIELDS,
+    iter_regions_id,
+    write_csv,
+)
+from kepmendagri_parser.builders.delta_output import (
+    DELETE,
+    DELTA_FORMAT_VERSION,
+    DELTA_MANIFEST,
+    join_by_code,
+    read_csv_rows,
+)
+from kepmendagri_parser.builders.sqlite_output import FTS_LEVELS, SQLITE_OUTPUT, TABLES
+from kepmendagri_parser.utils.generate_release_metadata import sha256_file
+from kepmendagri_parser.utils.name_key import name_key
+
+FIELDS = {
+    "provinces.csv": PROVINCE_FIELDS,
+    "regencies.csv": REGENCY_FIELDS,
+    "districts.csv": DISTRICT_FIELDS,
+    "villages.csv": VILLAGE_FIELDS,
+}
+
+
+class DeltaError(ValueError):
+    """The delta does not apply to these files, or the result is wrong."""
+
+
+def load_delta(delta_dir: Path) -> dict:
+    delta = json.loads((delta_dir / DELTA_MANIFEST).read_text(encoding="utf-8"))
+    if delta.get("format_version") != DELTA_FORMAT_VERSION:
+        raise DeltaError(f"unsupported delta format: {delta.get('format_version')}")
+    return delta
+
+
+def release_hashes(release_path: Path) -> dict[str, str]:
+    """SHA256 by file name from a metadata/releases/region-id-*.json file."""
+    release = json.loads(release_path.read_text(encoding="utf-8"))
+    files = release.get("files")
+    if not files:
+        raise DeltaError(f"{release_path} has no per-file hashes")
+    return {name: entry["sha256"] for name, entry in files.items()}
+
+
+def target_hashes(delta: dict, release: dict[str, str] | None) -> dict[str, str]:
+    """The hashes the patched files must have; the release must agree."""
+    target = {name: entry["sha256"] for name, entry in delta["target"].items()}
+    if release is not None:
+        for name, sha in target.items():
+            if name in release and release[name] != sha:
+                raise DeltaError(f"delta target of {name} is not the file of this release")
+    return target
+
+
+def _delta_rows(delta_dir: Path, name: str):
+    for row in read_csv_rows(delta_dir / name):
+        op = row.pop("op")
+        yield op, row
+
+
+# =========================
+# CSV
+# =========================
+
+def patched_rows(base_rows, delta_rows):
+    """Rows of the base file with the delta applied, in code order."""
+    delta = ({**row, "_op": op} for op, row in delta_rows)
+    for _, row, change in join_by_code(base_rows, delta):
+        if change is None:
+            yield row
+        elif change.pop("_op") != DELETE:
+            yield change
+
+
+def apply_csv(datasets_dir: Path, delta_dir: Path, delta: dict, target: dict[str, str]) -> list[str]:
+    for name in LEVEL_OUTPUTS:
+        if sha256_file(datasets_dir / name) != delta["base"][name]:
+            raise DeltaError(f"{datasets_dir / name} is not the base of this delta")
+
+    staged = {}
+    try:
+        for name in LEVEL_OUTPUTS:
+            tmp = datasets_dir / (name + ".tmp")
+            rows = patched_rows(read_csv_rows(datasets_dir / name), _delta_rows(delta_dir, name))
+            staged[name] = tmp
+            digest, _ = write_csv(tmp, rows, FIELDS[name])
+            if digest != target[name]:
+                raise DeltaError(f"patched {name} does not match the target hash")
+
+        levels = {
+            name: list(read_csv_rows(staged[name]))
+            for name in ("provinces.csv", "regencies.csv", "districts.csv")
+        }
+        tmp = datasets_dir / (REGIONS_ID_OUTPUT + ".tmp")
+        staged[REGIONS_ID_OUTPUT] = tmp
+        digest, _ = write_csv(
+            tmp,
+            iter_regions_id(
+                levels["provinces.csv"],
+                levels["regencies.csv"],
+                levels["districts.csv"],
+                read_csv_rows(staged["villages.csv"]),
+            ),
+            REGIONS_ID_FIELDS,
+        )
+        if digest != target[REGIONS_ID_OUTPUT]:
+            raise DeltaError(f"rebuilt {REGIONS_ID_OUTPUT} does not match the target hash")
+    except BaseException:
+        for tmp in staged.values():
+            tmp.unlink(missing_ok=True)
+        raise
+
+    for name, tmp in staged.items():
+        tmp.replace(datasets_dir / name)
+    return list(staged)
+
+
+# =========================
+# SQLite
+# =========================
+
+def _sqlite_value(table: str, column: str, value: str):
+    if value == "":
+        return None
+    if table == "regencies" and column == "is_administrative":
+        return int(value == "True")
+    return value
+
+
+def _csv_value(table: str, column: str, value):
+    # inverse of _sqlite_value: what the CSV holds
+    if value is None:
+        return ""
+    if table == "regencies" and column == "is_administrative":
+        return str(bool(value))
+    return value
+
+
+def table_digest(conn: sqlite3.Connection, table: str, fieldnames: list[str]) -> str:
+    """SHA256 of the table written as the CSV it was loaded from."""
+    sink = HashingWriter()
+    w = csv.writer(sink)
+    w.writerow(fieldnames)
+    for values in conn.execute(f"SELECT {', '.join(fieldnames)} FROM {table} ORDER BY code"):
+        w.writerow([_csv_value(table, c, v) for c, v in zip(fieldnames, values)])
+    return sink.hexdigest()
+
+
+def apply_sqlite(path: Path, delta_dir: Path, delta: dict, target: dict[str, str]):
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        conn.execute("PRAGMA foreign_keys = ON")
+        (levels_sha,) = conn.execute(
+            "SELECT value FROM meta WHERE key = 'levels_sha256'"
+        ).fetchone()
+        if levels_sha != delta["base_levels_sha256"]:
+            raise DeltaError(f"{path} is not the base of this delta")
+
+        fts_level = {table: level for level, table in FTS_LEVELS.items()}
+        conn.execute("BEGIN")
+        try:
+            deletes = {}
+            for table, name in TABLES.items():
+                columns = FIELDS[name]
+                upsert = (
+                    f"INSERT INTO {table} ({', '.join(columns)}, name_key) "
+                    f"VALUES ({', '.join('?' * (len(columns) + 1))}) "
+                    "ON CONFLICT (code) DO UPDATE SET "
+                    + ", ".join(f"{c} = excluded.{c}" for c in [*columns[1:], "name_key"])
+                )
+                deletes[table] = []
+                for op, row in _delta_rows(delta_dir, name):
+                    if op == DELETE:
+                        deletes[table].append(row["code"])
+                        continue
+                    values = [_sqlite_value(table, c, row[c]) for c in columns]
+                    conn.execute(upsert, [*values, name_key(row["name"])])
+                    if table in fts_level:
+                        conn.execute("DELETE FROM names_fts WHERE code = ?", (row["code"],))
+                        conn.execute(
+                            "INSERT INTO names_fts (name_key, name, level, code) VALUES (?, ?, ?, ?)",
+                            (name_key(row["name"]), row["name"], fts_level[table], row["code"]),
+                        )
+
+            # children before their parents
+            for table in reversed(TABLES):
+                for code in deletes[table]:
+                    conn.execute(f"DELETE FROM {table} WHERE code = ?", (code,))
+                    if table in fts_level:
+                        conn.execute("DELETE FROM names_fts WHERE code = ?", (code,))
+
+            for table, name in TABLES.items():
+                if table_digest(conn, table, FIELDS[name]) != target[name]:
+                    raise DeltaError(f"patched {table} table does not match the target hash of {name}")
+            conn.execute(
+                "UPDATE meta SET value = ? WHERE key = 'levels_sha256'",
+                (delta["target_levels_sha256"],),
+            )
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+# =========================
+# CLI
+# =========================
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Patch a previous region-id release with a delta"
+    )
+    parser.add_argument("--delta", type=Path, required=True, help="Delta directory")
+    parser.add_argument(
+        "--datasets",
+        type=Path,
+        default=Path("datasets"),
+        help="Directory with the base release (CSV and / or region-id.sqlite)",
+    )
+    parser.add_argument(
+        "--release",
+        type=Path,
+        help="Release metadata of the target (metadata/releases/region-id-*.json) to verify against",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    delta = load_delta(args.delta)
+    release = release_hashes(args.release) if args.release else None
+    target = target_hashes(delta, release)
+
+    patched = []
+    if (args.datasets / LEVEL_OUTPUTS[0]).exists():
+        patched += apply_csv(args.datasets, args.delta, delta, target)
+    if (args.datasets / SQLITE_OUTPUT).exists():
+        apply_sqlite(args.datasets / SQLITE_OUTPUT, args.delta, delta, target)
+        patched.append(SQLITE_OUTPUT)
+    if not patched:
+        raise FileNotFoundError(f"No dataset files in {args.datasets}")
+
+    changes = sum(sum(c.values()) for c in delta["changes"].values())
+    print(f"✔ Applied {changes} changes: {', '.join(patched)}")
+
+
+if __name__ == "__main__":
+    main()
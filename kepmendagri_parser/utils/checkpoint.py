@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Iterator
+
+LEVELS = ("province", "regency", "district", "village")
+
+
+class Checkpoint:
+    """
+    Periodic checkpoint of the page loop, stored in `directory`:
+
+        state.json       last completed page, carried contexts, row counts
+        <level>.jsonl    stitched rows, append-only
+
+    Rows are appended incrementally (only rows the stitcher emitted since
+    the previous save), then state.json is replaced atomically. Rows past
+    the counts recorded in state.json (an interrupted append) are
+    discarded on load.
+
+    A checkpoint only resumes the same page selection: PDF, start page,
+    end page and sections (None for all) must match the saved run.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        pdf_sha256: str,
+        start_page: int,
+        end_page: int | None = None,
+        sections: list[str] | None = None,
+    ):
+        self.directory = directory
+        self.pdf_sha256 = pdf_sha256
+        self.start_page = start_page
+        self.end_page = end_page
+        self.sections = sorted(sections) if sections is not None else None
+        self._written = {level: 0 for level in LEVELS}
+
+    @property
+    def state_path(self) -> Path:
+        return self.directory / "state.json"
+
+    def _rows_path(self, level: str) -> Path:
+        return self.directory / f"{level}.jsonl"
+
+    def load(self) -> dict | None:
+        """
+        Return the saved state, or None when there is no checkpoint for
+        this PDF and page selection. Rows are read with `iter_rows(level)`.
+        """
+        if not self.state_path.exists():
+            return None
+
+        with open(self.state_path, encoding="utf-8") as f:
+            state = json.load(f)
+
+        if (
+            state.get("pdf_sha256") != self.pdf_sha256
+            or state.get("start_page") != self.start_page
+            or state.get("end_page") != self.end_page
+            or state.get("sections") != self.sections
+        ):
+            return None
+
+        # continue appending right after the rows we trust
+        for level in LEVELS:
+            count = state["counts"][level]
+            kept = self._truncate(level, count)
+            if kept != count:
+                raise ValueError(
+                    f"[checkpoint] {self._rows_path(level)} has "
+                    f"{kept} rows, expected {count}"
+                )
+            self._written[level] = count
+
+        return state
+
+    def iter_rows(self, level: str) -> Iterator[dict]:
+        if not self._written[level]:
+            return
+        with open(self._rows_path(level), encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def reset(self):
+        """Discard any previous checkpoint (fresh run)."""
+        if self.directory.exists():
+            shutil.rmtree(self.directory)
+        self._written = {level: 0 for level in LEVELS}
+
+    def save(self, last_page: int, stitcher):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        for level, pending in stitcher.drain_journal().items():
+            if not pending:
+                continue
+            with open(self._rows_path(level), "a", encoding="utf-8") as f:
+                for r in pending:
+                    f.write(json.dumps(r, ensure_ascii=False))
+                    f.write("\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._written[level] += len(pending)
+
+        state = {
+            "pdf_sha256": self.pdf_sha256,
+            "start_page": self.start_page,
+            "end_page": self.end_page,
+            "sections": self.sections,
+            "last_page": last_page,
+            "counts": dict(self._written),
+            **stitcher.context_state(),
+        }
+
+        tmp = self.state_path.with_suffix(".json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False)
+        os.replace(tmp, self.state_path)
+
+    def _truncate(self, level: str, count: int) -> int:
+        """Cut the rows file to its first `count` lines, return lines kept."""
+        path = self._rows_path(level)
+        if not path.exists():
+            return 0
+
+        kept = 0
+        with open(path, "rb+") as f:
+            offset = 0
+            while kept < count:
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break
+                offset += len(line)
+                kept += 1
+            f.truncate(offset)
+        return kept
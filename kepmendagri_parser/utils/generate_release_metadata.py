@@ -4,17 +4,31 @@ import hashlib
 from pathlib import Path
 from datetime import datetime, timezone
 
+from kepmendagri_parser.builders.build_manifest import BuildManifest
+
 
 DATASET_NAME = "region-id"
 SOURCE_NAME = "Kementerian Dalam Negeri Republik Indonesia"
 SOURCE_DOCUMENT_NAME = "Kepmendagri - Kode dan Data Wilayah Administrasi"
 
+LEVEL_FILES = ["provinces", "regencies", "districts", "villages"]
+DATASET_FILES = [*LEVEL_FILES, "regions_id"]
+# published formats, by file extension (CSV always; the rest when built)
+FORMATS = {".csv": "csv", ".parquet": "parquet", ".arrow": "arrow"}
+# single-file formats holding every dataset
+BUNDLE_FILES = {"region-id.sqlite": "sqlite"}
+
+# read buffer of sha256_file: few syscalls for a multi-hundred MB PDF
+HASH_BUFFER_SIZE = 1 << 20
+
 
 def sha256_file(path: Path) -> str:
     h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
+    buf = bytearray(HASH_BUFFER_SIZE)
+    view = memoryview(buf)
+    with path.open("rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
     return h.hexdigest()
 
 
@@ -23,6 +37,112 @@ def count_rows(csv_path: Path) -> int:
         return sum(1 for _ in f) - 1  # exclude header
 
 
+def file_entry(datasets_dir: Path, name: str, manifest: BuildManifest) -> dict:
+    """
+    SHA256, size and (for CSVs) row count of a dataset file: taken from
+    the build manifest when the file is the one the build wrote, so
+    nothing is re-read; hashed / counted otherwise.
+    """
+    entry = manifest.intact_entry(name)
+    if entry is not None:
+        out = {"sha256": entry["sha256"], "bytes": entry["bytes"]}
+        if "rows" in entry:
+            out["rows"] = entry["rows"]
+        return out
+
+    path = datasets_dir / name
+    out = {"sha256": sha256_file(path), "bytes": path.stat().st_size}
+    if path.suffix == ".csv":
+        out["rows"] = count_rows(path)
+    return out
+
+
+def release_metadata(version: str, datasets_dir: Path, source_sha256: str) -> dict:
+    """Release metadata of the datasets in `datasets_dir`."""
+    version = version.lstrip("v")
+    manifest = BuildManifest(datasets_dir)
+
+    for level in LEVEL_FILES:
+        path = datasets_dir / f"{level}.csv"
+        if not path.exists():
+            raise FileNotFoundError(f"Missing dataset file: {path}")
+
+    # every published file with its hash, so downloads can be verified
+    entries = {}
+    for suffix in FORMATS:
+        for name in DATASET_FILES:
+            if (datasets_dir / f"{name}{suffix}").exists():
+                entries[f"{name}{suffix}"] = file_entry(datasets_dir, f"{name}{suffix}", manifest)
+    formats = [
+        fmt for suffix, fmt in FORMATS.items()
+        if any(name.endswith(suffix) for name in entries)
+    ]
+    for name, fmt in BUNDLE_FILES.items():
+        if (datasets_dir / name).exists():
+            entries[name] = file_entry(datasets_dir, name, manifest)
+            formats.append(fmt)
+
+    records = {}
+    for level in LEVEL_FILES:
+        entry = entries[f"{level}.csv"]
+        records[level] = entry["rows"] if "rows" in entry else count_rows(datasets_dir / f"{level}.csv")
+    files = {
+        name: {"sha256": entry["sha256"], "bytes": entry["bytes"]}
+        for name, entry in entries.items()
+    }
+
+    return {
+        "dataset": DATASET_NAME,
+        "version": version,
+        "tag": f"v{version}",
+        "status": "stable",
+        "source": {
+            "name": SOURCE_NAME,
+            "document": SOURCE_DOCUMENT_NAME,
+            "document_hash": {
+                "algorithm": "sha256",
+                "value": source_sha256
+            }
+        },
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "levels": [
+            "province",
+            "regency",
+            "district",
+            "village"
+        ],
+        "records": records,
+        "format": "csv",
+        "formats": formats,
+        "encoding": "utf-8",
+        "files": files,
+    }
+
+
+def write_release_metadata(metadata: dict, output_dir: Path) -> tuple[Path, bool]:
+    """
+    Write `region-id-<version>.json` into `output_dir`; returns its path
+    and whether it was (re)written.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output_path = output_dir / f"region-id-{metadata['version']}.json"
+
+    # same source and same datasets: keep the existing file (and its
+    # generated_at), so unchanged releases are not re-published
+    if output_path.exists():
+        previous = json.loads(output_path.read_text(encoding="utf-8"))
+        previous.pop("generated_at", None)
+        current = {k: v for k, v in metadata.items() if k != "generated_at"}
+        if previous == current:
+            return output_path, False
+
+    output_path.write_text(
+        json.dumps(metadata, indent=2, ensure_ascii=False),
+        encoding="utf-8"
+    )
+    return output_path, True
+
+
 def parse_args():
     parser = argparse.ArgumentParser(
         description="Generate release metadata for region-id dataset"
@@ -38,7 +158,7 @@ def parse_args():
         "--datasets",
         type=Path,
         default=Path("datasets"),
-        help="Path to dataset CSV directory"
+        help="Path to dataset directory (CSV, plus Parquet / Arrow / SQLite when built)"
     )
 
     parser.add_argument(
@@ -61,52 +181,13 @@ def parse_args():
 def main():
     args = parse_args()
 
-    datasets_dir = args.datasets
-    output_dir = args.output
-    source_doc = args.source
-    version = args.version.lstrip("v")
-
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    records = {}
-    for level in ["provinces", "regencies", "districts", "villages"]:
-        path = datasets_dir / f"{level}.csv"
-        if not path.exists():
-            raise FileNotFoundError(f"Missing dataset file: {path}")
-        records[level] = count_rows(path)
-
-    metadata = {
-        "dataset": DATASET_NAME,
-        "version": version,
-        "tag": f"v{version}",
-        "status": "stable",
-        "source": {
-            "name": SOURCE_NAME,
-            "document": SOURCE_DOCUMENT_NAME,
-            "document_hash": {
-                "algorithm": "sha256",
-                "value": sha256_file(source_doc)
-            }
-        },
-        "generated_at": datetime.now(timezone.utc).isoformat(),
-        "levels": [
-            "province",
-            "regency",
-            "district",
-            "village"
-        ],
-        "records": records,
-        "format": "csv",
-        "encoding": "utf-8"
-    }
-
-    output_path = output_dir / f"region-id-{version}.json"
-    output_path.write_text(
-        json.dumps(metadata, indent=2, ensure_ascii=False),
-        encoding="utf-8"
-    )
+    metadata = release_metadata(args.version, args.datasets, sha256_file(args.source))
+    output_path, written = write_release_metadata(metadata, args.output)
 
-    print(f"✔ Release metadata generated: {output_path}")
+    if written:
+        print(f"✔ Release metadata generated: {output_path}")
+    else:
+        print(f"✔ Release metadata unchanged: {output_path}")
 
 
 if __name__ == "__main__":
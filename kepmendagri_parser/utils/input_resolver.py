@@ -1,15 +1,24 @@
 import hashlib
+import json
 import logging
-import tempfile
+import os
 import urllib.parse
 from pathlib import Path
-from urllib.request import urlopen
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
 
 from tqdm import tqdm
 
 
 logger = logging.getLogger(__name__)
-CHUNK_SIZE = 8192
+CHUNK_SIZE = 1 << 20
+
+# default download cache: $XDG_CACHE_HOME/kepmendagri-parser/downloads
+DOWNLOAD_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "kepmendagri-parser"
+    / "downloads"
+)
 
 
 def is_url(value: str) -> bool:
@@ -17,57 +26,222 @@ def is_url(value: str) -> bool:
     return parsed.scheme in ("http", "https")
 
 
+class DownloadCache:
+    """
+    Content-addressed store of downloaded files:
+
+        <root>/sha256/<sha256>.pdf       complete, verified downloads
+        <root>/urls/<url hash>.json      URL → sha256, ETag, Last-Modified
+        <root>/partial/<key>.part        interrupted download (+ .json)
+        <root>/unverified/<sha256>.pdf   download whose completeness is unknown
+
+    Files only enter `sha256/` through an atomic rename once their hash
+    is known, so a file there always matches its name. Partial downloads
+    are keyed by the expected SHA256, or by the URL without one.
+    `unverified/` holds bodies that may be truncated; they are used once
+    and never returned from the cache.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    def blob(self, sha256: str) -> Path:
+        return self.root / "sha256" / f"{sha256}.pdf"
+
+    def _url_path(self, url: str) -> Path:
+        return self.root / "urls" / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def url_entry(self, url: str) -> dict | None:
+        try:
+            return json.loads(self._url_path(url).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_url_entry(self, url: str, entry: dict):
+        _write_json(self._url_path(url), {"url": url, **entry})
+
+    def partial(self, key: str) -> Path:
+        return self.root / "partial" / f"{key}.part"
+
+    def store(self, part: Path, sha256: str) -> Path:
+        blob = self.blob(sha256)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part, blob)
+        _partial_meta(part).unlink(missing_ok=True)
+        return blob
+
+    def store_unverified(self, part: Path, sha256: str) -> Path:
+        path = self.root / "unverified" / f"{sha256}.pdf"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(part, path)
+        _partial_meta(part).unlink(missing_ok=True)
+        return path
+
+
+def _partial_meta(part: Path) -> Path:
+    return part.with_suffix(".json")
+
+
+def _write_json(path: Path, data: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _hash_existing(path: Path, h) -> int:
+    """Feed the bytes already in `path` to `h`; returns their count."""
+    buf = bytearray(CHUNK_SIZE)
+    view = memoryview(buf)
+    size = 0
+    with open(path, "rb", buffering=0) as f:
+        while n := f.readinto(buf):
+            h.update(view[:n])
+            size += n
+    return size
+
+
+def _open(url: str, headers: dict):
+    """urlopen, with a 304 / 416 answer returned instead of raised."""
+    try:
+        return urlopen(Request(url, headers=headers))
+    except HTTPError as e:
+        if e.code in (304, 416):
+            return e
+        raise
+
+
 def download_file(
     url: str,
     expected_sha256: str | None = None,
     debug_level: int = 0,
+    cache_dir: Path | None = None,
 ) -> Path:
     """
-    Download PDF from URL into a temporary directory with progress bar.
+    Download PDF from URL into the download cache with progress bar.
+
+    With `expected_sha256`, a cached copy is returned without any
+    request. Without it, the URL's last download is revalidated with its
+    ETag / Last-Modified. An interrupted download is resumed with an
+    HTTP Range request (If-Range guards against a changed file).
     """
+    cache = DownloadCache(cache_dir or DOWNLOAD_CACHE_DIR)
+
+    if expected_sha256:
+        expected_sha256 = expected_sha256.lower()
+        cached = cache.blob(expected_sha256)
+        if cached.exists():
+            if debug_level >= 1:
+                logger.info("Source PDF found in download cache: %s", cached)
+            return cached
 
     if debug_level >= 1:
         logger.info("Downloading source PDF from URL")
         logger.info("URL: %s", url)
 
-    tmp_dir = Path(tempfile.mkdtemp(prefix="kepmendagri_"))
-    target = tmp_dir / "source.pdf"
+    # validators of the last complete download of this URL
+    known = cache.url_entry(url)
+    if known and not cache.blob(known["sha256"]).exists():
+        known = None
 
-    if debug_level >= 2:
-        logger.debug("Temporary directory created: %s", tmp_dir)
-        logger.debug("Writing PDF to: %s", target)
+    key = expected_sha256 or hashlib.sha256(url.encode("utf-8")).hexdigest()
+    part = cache.partial(key)
+    part.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        part_meta = json.loads(_partial_meta(part).read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        part_meta = {}
+    if part_meta.get("url") != url:
+        part.unlink(missing_ok=True)
+        part_meta = {}
 
     h = hashlib.sha256()
-    total_bytes = 0
+    offset = _hash_existing(part, h) if part.exists() else 0
+
+    headers = {}
+    validator = part_meta.get("etag") or part_meta.get("last_modified")
+    # resume only when a changed file would be noticed: by the server
+    # (If-Range) or by the final hash check
+    if offset and (validator or expected_sha256):
+        headers["Range"] = f"bytes={offset}-"
+        if validator:
+            headers["If-Range"] = validator
+    elif known and not expected_sha256:
+        if known.get("etag"):
+            headers["If-None-Match"] = known["etag"]
+        if known.get("last_modified"):
+            headers["If-Modified-Since"] = known["last_modified"]
+
+    with _open(url, headers) as r:
+        status = r.status
+
+        if status == 304:
+            if debug_level >= 1:
+                logger.info("Source PDF not modified, using download cache")
+            return cache.blob(known["sha256"])
+
+        if status == 416:
+            # nothing after `offset`: the partial file is either the whole
+            # expected file, or not a prefix of this resource
+            if expected_sha256 and h.hexdigest() == expected_sha256:
+                return cache.store(part, expected_sha256)
+            part.unlink(missing_ok=True)
+            _partial_meta(part).unlink(missing_ok=True)
+            return download_file(url, expected_sha256, debug_level, cache.root)
+
+        content_range = r.headers.get("Content-Range", "")
+        if status == 206 and content_range.startswith(f"bytes {offset}-"):
+            mode = "ab"
+            if debug_level >= 1:
+                logger.info("Resuming download at byte %d", offset)
+        else:
+            # full body: drop whatever was downloaded before
+            mode = "wb"
+            h = hashlib.sha256()
+            offset = 0
+
+        etag = r.headers.get("ETag")
+        last_modified = r.headers.get("Last-Modified")
+        _write_json(_partial_meta(part), {
+            "url": url, "etag": etag, "last_modified": last_modified,
+        })
 
-    with urlopen(url) as r:
         content_length = r.headers.get("Content-Length")
-        total_size = int(content_length) if content_length else None
+        total_size = offset + int(content_length) if content_length else None
+        # a truncated chunked body raises IncompleteRead; a body without
+        # length or chunking just ends, complete or not
+        delimited = total_size is not None or (
+            r.headers.get("Transfer-Encoding", "").lower() == "chunked"
+        )
 
-        with open(target, "wb") as f, tqdm(
+        buf = bytearray(CHUNK_SIZE)
+        view = memoryview(buf)
+        with open(part, mode) as f, tqdm(
             total=total_size,
+            initial=offset,
             unit="B",
             unit_scale=True,
             unit_divisor=1024,
             desc="Downloading PDF",
             disable=False,  # tqdm auto-disable on non-TTY
         ) as pbar:
-            while True:
-                chunk = r.read(CHUNK_SIZE)
-                if not chunk:
-                    break
+            while n := r.readinto(buf):
+                chunk = view[:n]
                 f.write(chunk)
                 h.update(chunk)
-                chunk_size = len(chunk)
-                total_bytes += chunk_size
-                pbar.update(chunk_size)
+                pbar.update(n)
 
+    total_bytes = part.stat().st_size
+    if total_size is not None and total_bytes < total_size:
+        # the partial file stays in the cache: the next run resumes it
+        raise ConnectionError(
+            f"Download interrupted at {total_bytes} of {total_size} bytes; run again to resume"
+        )
     if debug_level >= 1:
         logger.info("Download completed (%d bytes)", total_bytes)
 
+    actual = h.hexdigest()
     if expected_sha256:
-        actual = h.hexdigest()
-
         if debug_level >= 1:
             logger.info("Verifying SHA256 checksum")
 
@@ -77,6 +251,8 @@ def download_file(
                 expected_sha256,
                 actual,
             )
+            part.unlink(missing_ok=True)
+            _partial_meta(part).unlink(missing_ok=True)
             raise ValueError(
                 f"SHA256 mismatch: expected {expected_sha256}, got {actual}"
             )
@@ -84,4 +260,20 @@ def download_file(
         if debug_level >= 1:
             logger.info("SHA256 checksum verified")
 
+    elif not delimited:
+        logger.warning(
+            "The server sent no Content-Length: a truncated download cannot be "
+            "detected. Using it for this run without caching it; pass --sha256 "
+            "to verify and cache it"
+        )
+        return cache.store_unverified(part, actual)
+
+    target = cache.store(part, actual)
+    cache.save_url_entry(url, {
+        "sha256": actual, "etag": etag, "last_modified": last_modified,
+    })
+
+    if debug_level >= 2:
+        logger.debug("PDF cached at: %s", target)
+
     return target
@@ -0,0 +1,138 @@
+import json
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+# per-page stage holding the wall time of the whole page
+PAGE_TOTAL = "page_total"
+
+SLOWEST_PAGES = 20
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_mb() -> float | None:
+    """Peak resident set size of this process so far, in MiB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, KiB elsewhere
+    if sys.platform == "darwin":
+        return round(peak / (1024 * 1024), 1)
+    return round(peak / 1024, 1)
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of `values` (q in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * q // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize(values: list[float]) -> dict:
+    return {
+        "count": len(values),
+        "total": round(sum(values), 6),
+        "p50": round(percentile(values, 50), 6),
+        "p95": round(percentile(values, 95), 6),
+        "max": round(max(values), 6) if values else 0.0,
+    }
+
+
+class PipelineMetrics:
+    """
+    Timing report of one pipeline run.
+
+    Per-page stage timings come with each PageResult (measured where the
+    page was parsed, also in worker processes); pipeline and build stages
+    are timed here with `stage(name)`. `report()` summarizes pages per
+    page type (p50 / p95 / max per stage) and overall throughput, plus
+    the peak RSS of the process at the end of every stage.
+    """
+
+    def __init__(self):
+        self.pages: list[dict] = []
+        self.stages: dict[str, float] = defaultdict(float)
+        self.stage_peak_rss_mb: dict[str, float | None] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - started
+            self.stage_peak_rss_mb[name] = peak_rss_mb()
+
+    def record_page(self, result):
+        self.pages.append({
+            "page": result.page,
+            "page_type": result.content_type.value,
+            "cached": bool(result.cached_extraction and result.cached_rows),
+            "timings": dict(result.timings),
+        })
+
+    def report(self) -> dict:
+        by_type = defaultdict(list)
+        for p in self.pages:
+            by_type[p["page_type"]].append(p)
+
+        page_types = {}
+        for page_type, pages in sorted(by_type.items()):
+            stage_values = defaultdict(list)
+            for p in pages:
+                for name, seconds in p["timings"].items():
+                    stage_values[name].append(seconds)
+
+            busy = sum(p["timings"].get(PAGE_TOTAL, 0.0) for p in pages)
+            page_types[page_type] = {
+                "pages": len(pages),
+                "cached_pages": sum(p["cached"] for p in pages),
+                "pages_per_second": round(len(pages) / busy, 2) if busy else None,
+                "stages": {
+                    name: summarize(values)
+                    for name, values in sorted(stage_values.items())
+                },
+            }
+
+        slowest = sorted(
+            self.pages,
+            key=lambda p: p["timings"].get(PAGE_TOTAL, 0.0),
+            reverse=True,
+        )[:SLOWEST_PAGES]
+
+        parse_seconds = self.stages.get("parse_pages", 0.0)
+        return {
+            "wall_seconds": round(time.perf_counter() - self._started, 6),
+            "pages": len(self.pages),
+            "pages_per_second": (
+                round(len(self.pages) / parse_seconds, 2) if parse_seconds else None
+            ),
+            "stages": {name: round(s, 6) for name, s in self.stages.items()},
+            "peak_rss_mb": peak_rss_mb(),
+            "stage_peak_rss_mb": dict(self.stage_peak_rss_mb),
+            "page_types": page_types,
+            "slowest_pages": [
+                {
+                    "page": p["page"],
+                    "page_type": p["page_type"],
+                    "seconds": round(p["timings"].get(PAGE_TOTAL, 0.0), 6),
+                }
+                for p in slowest
+            ],
+        }
+
+    def write(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps(self.report(), indent=2, ensure_ascii=False),
+            encoding="utf-8",
+        )
@@ -0,0 +1,36 @@
+"""
+Normalised region names for lookups.
+
+`name_key("Kab. Kep. Siau Tagulandang Biaro")` is
+"kabupaten kepulauan siau tagulandang biaro": abbreviations expanded
+with the regency parser's ABBR_MAP, case folded, diacritics and
+apostrophes dropped, other punctuation turned into spaces. Two spellings
+of the same name that only differ in these ways share one key.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from kepmendagri_parser.parsers.regency_parser import normalize
+
+APOSTROPHE_RE = re.compile(r"['’`‘]")
+PUNCTUATION_RE = re.compile(r"[^\w\s]")
+
+
+@lru_cache(maxsize=65536)
+def name_key(name: str | None) -> str:
+    if not name:
+        return ""
+
+    s = normalize(name)
+
+    # strip diacritics (é → e)
+    if not s.isascii():
+        s = unicodedata.normalize("NFKD", s)
+        s = "".join(c for c in s if not unicodedata.combining(c))
+
+    s = s.casefold()
+    s = APOSTROPHE_RE.sub("", s)
+    s = PUNCTUATION_RE.sub(" ", s)
+    return " ".join(s.split())
@@ -0,0 +1,131 @@
+import hashlib
+import inspect
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from kepmendagri_parser.pipeline.context import PageType
+
+
+# Modules whose source determines what a cached entry contains.
+# Editing any of them invalidates only the entries that depend on it.
+EXTRACTOR_MODULES = (
+    "kepmendagri_parser.extractors.engines",
+    "kepmendagri_parser.extractors.page_table",
+    "kepmendagri_parser.extractors.page_text",
+    "kepmendagri_parser.extractors.text_layout",
+    "kepmendagri_parser.extractors.table_header",
+    "kepmendagri_parser.extractors.page_extraction",
+    "kepmendagri_parser.classifier.page_classifier",
+    "kepmendagri_parser.utils.text_normalize",
+)
+
+PARSER_MODULES = {
+    PageType.PROVINSI: "kepmendagri_parser.parsers.province_parser",
+    PageType.KAB_KOTA: "kepmendagri_parser.parsers.regency_parser",
+    PageType.KECAMATAN: "kepmendagri_parser.parsers.district_parser",
+    PageType.KELURAHAN_DESA: "kepmendagri_parser.parsers.village_parser",
+}
+
+# wires the carried-context placeholder into every parser
+PAGE_PARSER_MODULE = "kepmendagri_parser.pipeline.page_parser"
+# shared by every parser
+TEXT_NORMALIZE_MODULE = "kepmendagri_parser.utils.text_normalize"
+
+
+@lru_cache(maxsize=None)
+def _module_source_hash(*module_names: str) -> str:
+    import importlib
+
+    h = hashlib.sha256()
+    for name in module_names:
+        h.update(name.encode("utf-8"))
+        h.update(inspect.getsource(importlib.import_module(name)).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+def extractor_version(engine_name: str) -> str:
+    from kepmendagri_parser.extractors.engines import get_engine
+
+    return _module_source_hash(*EXTRACTOR_MODULES, get_engine(engine_name).module)
+
+
+def parser_version(page_type: PageType) -> str:
+    return _module_source_hash(
+        PARSER_MODULES[page_type], PAGE_PARSER_MODULE, TEXT_NORMALIZE_MODULE
+    )
+
+
+def _write_json_atomic(path: Path, payload):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class PageCache:
+    """
+    Persistent, content-addressed per-page cache.
+
+    Layout:
+        <cache_dir>/<pdf sha256>/<page>/extract-<engine>-<extractor version>.json
+        <cache_dir>/<pdf sha256>/<page>/rows-<engine>-<parser version>.json
+
+    Extraction (table, text, page type) and parsed rows are stored
+    separately, so a parser change re-parses pages from cached tables
+    without touching the PDF, and only for the affected page type.
+    Entries are written as soon as a page completes, so an interrupted
+    run resumes from the last completed page.
+    """
+
+    def __init__(self, cache_dir: Path, pdf_sha256: str, engine_name: str = "pdfplumber"):
+        self.cache_dir = cache_dir
+        self.pdf_sha256 = pdf_sha256
+        self.engine_name = engine_name
+        self.root = cache_dir / pdf_sha256
+
+    def _page_dir(self, page_number: int) -> Path:
+        return self.root / f"{page_number:05d}"
+
+    def _extraction_path(self, page_number: int) -> Path:
+        version = extractor_version(self.engine_name)
+        return self._page_dir(page_number) / f"extract-{self.engine_name}-{version}.json"
+
+    def _rows_path(self, page_number: int, page_type: PageType) -> Path:
+        version = parser_version(page_type)
+        return self._page_dir(page_number) / f"rows-{self.engine_name}-{version}.json"
+
+    def load_extraction(self, page_number: int) -> dict | None:
+        return _read_json(self._extraction_path(page_number))
+
+    def store_extraction(
+        self,
+        page_number: int,
+        page_type: PageType,
+        table: list | None,
+        text: str | None,
+    ):
+        _write_json_atomic(
+            self._extraction_path(page_number),
+            {"page_type": page_type.value, "table": table, "text": text},
+        )
+
+    def load_rows(self, page_number: int, page_type: PageType) -> list[dict] | None:
+        if page_type not in PARSER_MODULES:
+            return None
+        return _read_json(self._rows_path(page_number, page_type))
+
+    def store_rows(self, page_number: int, page_type: PageType, rows: list[dict]):
+        if page_type not in PARSER_MODULES:
+            return
+        _write_json_atomic(self._rows_path(page_number, page_type), rows)
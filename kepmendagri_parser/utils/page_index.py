@@ -0,0 +1,286 @@
+import json
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from kepmendagri_parser.pipeline.context import PageType
+from kepmendagri_parser.classifier.page_classifier import classify_page
+from kepmendagri_parser.extractors.page_extraction import PageExtraction
+
+INDEX_VERSION = 1
+
+# Data sections in the order they appear in the Kepmendagri PDF
+SECTION_ORDER = (
+    PageType.PROVINSI,
+    PageType.KAB_KOTA,
+    PageType.KECAMATAN,
+    PageType.KELURAHAN_DESA,
+)
+
+# CLI / level names → page type
+SECTION_NAMES = {
+    "province": PageType.PROVINSI,
+    "regency": PageType.KAB_KOTA,
+    "district": PageType.KECAMATAN,
+    "village": PageType.KELURAHAN_DESA,
+}
+
+
+@dataclass
+class Section:
+    page_type: PageType
+    start: int
+    end: int
+
+    @property
+    def pages(self) -> int:
+        return self.end - self.start + 1
+
+
+@dataclass
+class PageIndex:
+    """
+    Page → PageType map of a Kepmendagri PDF, stored as page ranges of
+    the data sections: one per section, unless a linear scan found pages
+    out of order. Pages outside every range (cover, closing pages, stray
+    pages) are UNKNOWN.
+    """
+
+    pdf_sha256: str
+    page_count: int
+    sections: list[Section] = field(default_factory=list)
+    probes: int = 0
+    linear_scan: bool = False
+
+    def page_type(self, page_number: int) -> PageType:
+        i = bisect_right([s.start for s in self.sections], page_number) - 1
+        if i >= 0 and page_number <= self.sections[i].end:
+            return self.sections[i].page_type
+        return PageType.UNKNOWN
+
+    def data_range(self) -> tuple[int, int] | None:
+        if not self.sections:
+            return None
+        return self.sections[0].start, self.sections[-1].end
+
+    def page_ranges(
+        self,
+        page_types=None,
+        start_page: int = 1,
+        end_page: int | None = None,
+    ) -> list[tuple[int, int]]:
+        """
+        Page ranges of the selected sections (all by default), clipped to
+        [start_page, end_page]; adjacent sections are merged.
+        """
+        end_page = end_page or self.page_count
+        ranges = []
+        for s in self.sections:
+            if page_types is not None and s.page_type not in page_types:
+                continue
+            first, last = max(s.start, start_page), min(s.end, end_page)
+            if first > last:
+                continue
+            if ranges and ranges[-1][1] + 1 == first:
+                ranges[-1] = (ranges[-1][0], last)
+            else:
+                ranges.append((first, last))
+        return ranges
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "pdf_sha256": self.pdf_sha256,
+            "page_count": self.page_count,
+            "sections": [
+                {"page_type": s.page_type.value, "start": s.start, "end": s.end}
+                for s in self.sections
+            ],
+        }
+
+    def save(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path, pdf_sha256: str | None = None) -> "PageIndex | None":
+        """Load an index, or None when missing, outdated or built for another PDF."""
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if data.get("version") != INDEX_VERSION:
+            return None
+        if pdf_sha256 and data.get("pdf_sha256") != pdf_sha256:
+            return None
+
+        return cls(
+            pdf_sha256=data["pdf_sha256"],
+            page_count=data["page_count"],
+            sections=[
+                Section(PageType(s["page_type"]), s["start"], s["end"])
+                for s in data["sections"]
+            ],
+        )
+
+
+def build_page_index(
+    pdf,
+    engine,
+    pdf_sha256: str,
+    start_page: int = 1,
+    end_page: int | None = None,
+    on_probe: Callable[[int, PageType], None] | None = None,
+) -> PageIndex:
+    """
+    Locate the section boundaries with as few classified pages as possible.
+
+    The leading pages are scanned until the first data page; from there
+    page types only move forward through SECTION_ORDER (anything else
+    marks the end of the data), so every boundary is found by an
+    exponential + binary search from the previous one.
+
+    The first and last page of every section found, and the pages after
+    the data, are then classified (see `boundary_pages`). If one of them
+    is of another type, the sections are not laid out as assumed and
+    every page from the first data page on is classified instead
+    (`linear_scan`).
+    """
+    page_count = len(pdf.pages)
+    end_page = min(end_page or page_count, page_count)
+    classified: dict[int, PageType] = {}
+
+    def classify(page_number: int) -> PageType:
+        if page_number not in classified:
+            classified[page_number] = _classify_page(pdf, engine, page_number)
+            if on_probe:
+                on_probe(page_number, classified[page_number])
+        return classified[page_number]
+
+    def rank(page_number: int) -> int:
+        page_type = classify(page_number)
+        if page_type in SECTION_ORDER:
+            return SECTION_ORDER.index(page_type)
+        return len(SECTION_ORDER)
+
+    first = start_page
+    while first <= end_page and classify(first) not in SECTION_ORDER:
+        first += 1
+
+    index = PageIndex(pdf_sha256=pdf_sha256, page_count=page_count)
+    if first > end_page:
+        index.probes = len(classified)
+        return index
+
+    section_start = first
+    for r in range(rank(first) + 1, len(SECTION_ORDER) + 1):
+        # first page in [section_start, end_page + 1) with rank >= r:
+        # gallop forward (short sections cost few probes), then bisect
+        lo, hi = section_start, end_page + 1
+        step = 1
+        probe = section_start
+        while probe < hi:
+            if rank(probe) >= r:
+                hi = probe
+                break
+            lo = probe + 1
+            step *= 2
+            probe = section_start + step - 1
+
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if rank(mid) >= r:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        if lo > section_start:
+            index.sections.append(
+                Section(SECTION_ORDER[r - 1], section_start, lo - 1)
+            )
+        section_start = lo
+
+    if any(
+        classify(page_number) != index.page_type(page_number)
+        for page_number in boundary_pages(index, end_page)
+    ):
+        index.sections = scan_sections(classify, first, end_page)
+        index.linear_scan = True
+
+    index.probes = len(classified)
+    return index
+
+
+def boundary_pages(index: PageIndex, end_page: int | None = None) -> list[int]:
+    """
+    Pages that show whether the sections are laid out as the index says:
+    the first and last page of every section, and every page after the
+    data (a data page there means the search stopped at a stray page).
+    """
+    end_page = end_page or index.page_count
+    pages = {p for s in index.sections for p in (s.start, s.end)}
+    data_range = index.data_range()
+    if data_range is not None:
+        pages.update(range(data_range[1] + 1, end_page + 1))
+    return sorted(pages)
+
+
+def scan_sections(
+    classify: Callable[[int], PageType], first: int, last: int
+) -> list[Section]:
+    """Sections as runs of same-type data pages in [first, last]; other pages are skipped."""
+    sections = []
+    for page_number in range(first, last + 1):
+        page_type = classify(page_number)
+        if page_type not in SECTION_ORDER:
+            continue
+        if (
+            sections
+            and sections[-1].page_type == page_type
+            and sections[-1].end == page_number - 1
+        ):
+            sections[-1].end = page_number
+        else:
+            sections.append(Section(page_type, page_number, page_number))
+    return sections
+
+
+def _classify_page(pdf, engine, page_number: int) -> PageType:
+    extraction = PageExtraction(pdf.pages[page_number - 1], page_number, engine=engine)
+    return classify_page(extraction)
+
+
+def _mismatches(pdf, engine, index: PageIndex, page_numbers, limit: int | None = None) -> list[dict]:
+    mismatches = []
+    for page_number in page_numbers:
+        actual = _classify_page(pdf, engine, page_number)
+        expected = index.page_type(page_number)
+        if actual != expected:
+            mismatches.append({
+                "page": page_number,
+                "expected": expected.value,
+                "actual": actual.value,
+            })
+            if len(mismatches) == limit:
+                break
+    return mismatches
+
+
+def check_page_index_boundaries(pdf, engine, index: PageIndex) -> list[dict]:
+    """Classify the `boundary_pages` of an index; report the first page it gets wrong."""
+    return _mismatches(pdf, engine, index, boundary_pages(index), limit=1)
+
+
+def verify_page_index(pdf, engine, index: PageIndex) -> list[dict]:
+    """Classify every page of the data sections and report pages the index gets wrong."""
+    data_range = index.data_range()
+    if data_range is None:
+        return []
+    return _mismatches(pdf, engine, index, range(data_range[0], data_range[1] + 1))
@@ -1,21 +1,84 @@
 import json
+import re
 import shutil
 from pathlib import Path
+from typing import Iterable, Iterator
 
-def cleanup_tmp(tmp_dir: Path):
-    if tmp_dir.exists() and tmp_dir.is_dir():
-        shutil.rmtree(tmp_dir)
-from pathlib import Path
+# whitespace and commas between the rows of a raw JSON array
+_SEPARATORS = re.compile(r"[\s,]*")
 
 def dump_raw(rows: list[dict], path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(rows, f, ensure_ascii=False)
+        if isinstance(rows, (list, dict)):
+            json.dump(rows, f, ensure_ascii=False)
+            return
+
+        # any other iterable (e.g. SpillSorter) is written row by row
+        f.write("[")
+        for i, r in enumerate(rows):
+            if i:
+                f.write(", ")
+            json.dump(r, f, ensure_ascii=False)
+        f.write("]")
 
 def load_raw(path: Path) -> list[dict]:
     with open(path, encoding="utf-8") as f:
         return json.load(f)
-    
-def cleanup_tmp(tmp_dir: Path):
-    if tmp_dir.exists() and tmp_dir.is_dir():
+
+def iter_raw(path: Path, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    """
+    Rows of a raw JSON array, decoded one at a time: only the current
+    chunk of the file is in memory, unlike `load_raw`.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buf = f.read(chunk_size)
+        pos = _SEPARATORS.match(buf).end()
+        if buf[pos:pos + 1] != "[":
+            raise ValueError(f"{path} is not a JSON array")
+        pos += 1
+        eof = False
+
+        while True:
+            pos = _SEPARATORS.match(buf, pos).end()
+            if buf.startswith("]", pos):
+                return
+            try:
+                row, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # row cut by the end of the chunk: read on
+                if eof:
+                    raise
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buf = buf[pos:] + chunk
+                pos = 0
+                continue
+            yield row
+
+def dump_raw_manifest(tmp_dir: Path, pdf_sha256: str):
+    dump_raw({"pdf_sha256": pdf_sha256}, tmp_dir / "manifest.raw.json")
+
+def raw_matches_pdf(tmp_dir: Path, pdf_sha256: str) -> bool:
+    """Raw rows are only reusable when they were parsed from the same PDF."""
+    path = tmp_dir / "manifest.raw.json"
+    if not path.exists():
+        return False
+    return load_raw(path).get("pdf_sha256") == pdf_sha256
+
+def cleanup_tmp(tmp_dir: Path, keep: Iterable[str] = ()):
+    """Remove `tmp_dir`, or everything in it but the entries named in `keep`."""
+    if not (tmp_dir.exists() and tmp_dir.is_dir()):
+        return
+    keep = set(keep)
+    if not keep:
         shutil.rmtree(tmp_dir)
+        return
+    for path in tmp_dir.iterdir():
+        if path.name in keep:
+            continue
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
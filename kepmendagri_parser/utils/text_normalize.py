@@ -0,0 +1,97 @@
+"""
+Shared text normalisation for the page classifier and the page parsers.
+
+Every pattern is compiled once at import. The helpers take a plain-string
+fast path when a cell has nothing to normalise (the common case), and
+otherwise apply exactly the substitutions the parsers used inline, so
+output is unchanged.
+"""
+
+import re
+from functools import lru_cache
+
+# =========================
+# Region codes
+# =========================
+
+PROVINCE_CODE_RE = re.compile(r"^\d{2}$")
+REGENCY_CODE_RE = re.compile(r"^\d{2}\.\d{2}$")
+DISTRICT_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}$")
+VILLAGE_CODE_RE = re.compile(r"^\d{2}\.\d{2}\.\d{2}\.\d{4}$")
+
+# =========================
+# Patterns
+# =========================
+
+# K O D E → KODE
+LETTER_SPACING_RE = re.compile(r"(?<=\b[A-Z])\s+(?=[A-Z]\b)")
+# footnote markers: *), **)
+FOOTNOTE_RE = re.compile(r"\*+\)")
+CONTROL_WHITESPACE_RE = re.compile(r"[\n\r\t]+")
+MULTI_WHITESPACE_RE = re.compile(r"\s{2,}")
+# row numbering in front of a name: "12 Sukamaju", "12Sukamaju"
+LEADING_NUMBER_RE = re.compile(r"^\d+\s*")
+# row numbering separated by whitespace only: "12 Sukamaju"
+LEADING_NUMBER_WORD_RE = re.compile(r"^\d+\s+")
+DIGIT_RE = re.compile(r"\d")
+
+
+# header cells repeat on every page of a section
+@lru_cache(maxsize=4096)
+def normalize_header(cell: str | None) -> str:
+    """Last word of a header cell, upper-cased, letter spacing and footnotes removed."""
+    if not cell:
+        return ""
+
+    s = cell.upper()
+
+    # 1️⃣ rapatkan huruf yang terpisah satu-satu (K O D E → KODE)
+    s = LETTER_SPACING_RE.sub("", s)
+
+    # 2️⃣ buang footnote (*), **), dll
+    if "*" in s:
+        s = FOOTNOTE_RE.sub("", s)
+
+    # 3️⃣ kata terakhir (split() memecah di whitespace apa pun)
+    words = s.split()
+    return words[-1] if words else ""
+
+
+def clean_name(value: str | None) -> str | None:
+    """Tabs/newlines to spaces, whitespace runs collapsed, stripped."""
+    if not value:
+        return None
+
+    # only plain spaces, never two in a row: nothing to collapse
+    if value.isprintable() and "  " not in value:
+        return value.strip()
+
+    value = CONTROL_WHITESPACE_RE.sub(" ", value)
+    value = MULTI_WHITESPACE_RE.sub(" ", value)
+
+    return value.strip()
+
+
+def strip_leading_number(value: str) -> str:
+    """Drop row numbering glued to or before a name ("12 Sukamaju" → "Sukamaju")."""
+    if not value or not value[0].isdigit():
+        return value
+    return LEADING_NUMBER_RE.sub("", value, count=1)
+
+
+def strip_leading_number_word(value: str) -> str:
+    """Drop row numbering followed by whitespace ("12 Sukamaju" → "Sukamaju")."""
+    if not value or not value[0].isdigit():
+        return value
+    return LEADING_NUMBER_WORD_RE.sub("", value, count=1)
+
+
+def has_digit(value: str) -> bool:
+    return DIGIT_RE.search(value) is not None
+
+
+def split_cell(cell: str | None) -> list[str]:
+    """Non-empty stripped lines of a multi-line table cell."""
+    if not cell:
+        return []
+    return [x.strip() for x in cell.split("\n") if x.strip()]
@@ -4,100 +4,99 @@ import argparse
 from pathlib import Path
 from collections import Counter
 
+from region_diff import merge_join, read_rows
 
-def load_csv(path, key="code"):
-    rows = {}
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            rows[row[key]] = row
-    return rows, reader.fieldnames
 
+def compare(old_file, new_file, output_file, sort=False):
+    """
+    Diff two dataset files in one streaming pass (see region_diff);
+    only the current row of each file is held in memory, unless `sort`
+    sorts files that are not in code order first.
+    """
+    old_reader = read_rows(old_file, sort=sort)
+    new_reader = read_rows(new_file, sort=sort)
+    key = old_reader.key
 
-def compare(old_file, new_file, output_file):
-    old_rows, old_fields = load_csv(old_file)
-    new_rows, new_fields = load_csv(new_file)
-
-    # fields to compare (exclude code)
-    compare_fields = [f for f in old_fields if f != "code"]
-
-    all_codes = sorted(set(old_rows) | set(new_rows))
-    diffs = []
+    # fields to compare (exclude the key)
+    compare_fields = [f for f in old_reader.fieldnames if f != key]
     stats = Counter()
 
-    for code in all_codes:
-        old = old_rows.get(code)
-        new = new_rows.get(code)
-
-        if old and not new:
-            stats["ONLY_IN_OLD"] += 1
-            diffs.append({
-                "code": code,
-                "status": "ONLY_IN_OLD",
-                **{f"old_{f}": old.get(f, "") for f in compare_fields},
-                **{f"new_{f}": "" for f in compare_fields},
-            })
-            continue
-
-        if new and not old:
-            stats["ONLY_IN_NEW"] += 1
-            diffs.append({
-                "code": code,
-                "status": "ONLY_IN_NEW",
-                **{f"old_{f}": "" for f in compare_fields},
-                **{f"new_{f}": new.get(f, "") for f in compare_fields},
-            })
-            continue
-
-        changed = []
-        for f in compare_fields:
-            if old.get(f) != new.get(f):
-                changed.append(f)
-
-        if not changed:
-            stats["UNCHANGED"] += 1
-            continue
-
-        if len(changed) == 1:
-            status = f"CHANGED_{changed[0].upper()}"
-        else:
-            status = "MULTIPLE_CHANGED"
-
-        stats[status] += 1
-
-        diffs.append({
-            "code": code,
-            "status": status,
-            **{f"old_{f}": old.get(f, "") for f in compare_fields},
-            **{f"new_{f}": new.get(f, "") for f in compare_fields},
-        })
-
-    # write diff csv
     output_file = Path(output_file)
     with output_file.open("w", newline="", encoding="utf-8") as f:
         fieldnames = (
-            ["code", "status"]
+            [key, "status"]
             + [f"old_{f}" for f in compare_fields]
             + [f"new_{f}" for f in compare_fields]
         )
         writer = csv.DictWriter(f, fieldnames=fieldnames)
         writer.writeheader()
-        writer.writerows(diffs)
+
+        for code, old, new in merge_join(old_reader, new_reader):
+            if old and not new:
+                stats["ONLY_IN_OLD"] += 1
+                writer.writerow({
+                    key: code,
+                    "status": "ONLY_IN_OLD",
+                    **{f"old_{f}": old.get(f, "") for f in compare_fields},
+                    **{f"new_{f}": "" for f in compare_fields},
+                })
+                continue
+
+            if new and not old:
+                stats["ONLY_IN_NEW"] += 1
+                writer.writerow({
+                    key: code,
+                    "status": "ONLY_IN_NEW",
+                    **{f"old_{f}": "" for f in compare_fields},
+                    **{f"new_{f}": new.get(f, "") for f in compare_fields},
+                })
+                continue
+
+            changed = []
+            for f in compare_fields:
+                if old.get(f) != new.get(f):
+                    changed.append(f)
+
+            if not changed:
+                stats["UNCHANGED"] += 1
+                continue
+
+            if len(changed) == 1:
+                status = f"CHANGED_{changed[0].upper()}"
+            else:
+                status = "MULTIPLE_CHANGED"
+
+            stats[status] += 1
+
+            writer.writerow({
+                key: code,
+                "status": status,
+                **{f"old_{f}": old.get(f, "") for f in compare_fields},
+                **{f"new_{f}": new.get(f, "") for f in compare_fields},
+            })
 
     return stats, output_file
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Compare region CSV files (district / village)"
+        description=(
+            "Compare two releases of a dataset file (any of the five CSVs, "
+            "or their Parquet copies)"
+        )
     )
-    parser.add_argument("old", help="Old CSV file")
-    parser.add_argument("new", help="New CSV file")
+    parser.add_argument("old", help="Old CSV / Parquet file")
+    parser.add_argument("new", help="New CSV / Parquet file")
     parser.add_argument("-o", "--output", default="diff.csv", help="Output diff CSV")
+    parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="Sort both files by code in memory first (for files not in code order)",
+    )
 
     args = parser.parse_args()
 
-    stats, out = compare(args.old, args.new, args.output)
+    stats, out = compare(args.old, args.new, args.output, sort=args.sort)
 
     print("\n=== COMPARISON SUMMARY ===")
     for k, v in stats.items():
@@ -8,12 +8,18 @@ Rationale:
 - therefore, comparison MUST be village-equivalent
 
 Only village-owned fields are compared.
+
+With --structural, the removed / added villages are paired up again by
+name (see region_changes) and the output is a change log of moves,
+renames, district splits and merges instead of the field-level diff.
 """
 
 import csv
 import argparse
 from pathlib import Path
 
+from region_diff import merge_join, read_rows
+
 # =========================
 # CONFIG
 # =========================
@@ -31,22 +37,6 @@ VILLAGE_FIELDS = {
 # IO UTILITIES
 # =========================
 
-def load_csv(path, key):
-    """
-    Load CSV into dict[key] = row
-    Rows without key are ignored safely.
-    """
-    rows = {}
-    with open(path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            k = row.get(key)
-            if not k:
-                continue
-            rows[k] = row
-    return rows
-
-
 def write_csv(path, fieldnames, rows):
     with open(path, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=fieldnames)
@@ -57,23 +47,22 @@ def write_csv(path, fieldnames, rows):
 # CORE LOGIC
 # =========================
 
-def compare(old_file, new_file, output_prefix):
-    old_rows = load_csv(old_file, KEY_FIELD)
-    new_rows = load_csv(new_file, KEY_FIELD)
-
-    all_keys = set(old_rows) | set(new_rows)
+def iter_field_diffs(old_file, new_file, summary, sort=False):
+    """
+    Field-level diffs of two regions_id files, streamed in village code
+    order with one row of each file in memory (see region_diff; `sort`
+    sorts files that are not in code order in memory first).
+    `summary` is filled in as the files are read.
+    """
+    old_reader = read_rows(old_file, KEY_FIELD, sort=sort)
+    new_reader = read_rows(new_file, KEY_FIELD, sort=sort)
+    # file column order, so the output order is stable
+    fields = [f for f in old_reader.fieldnames if f in VILLAGE_FIELDS]
 
-    diffs = []
-    summary = {
-        "total_villages": len(all_keys),
-        "added": 0,
-        "removed": 0,
-        "changed": 0,
-    }
+    summary.update({"total_villages": 0, "added": 0, "removed": 0, "changed": 0})
 
-    for code in sorted(all_keys):
-        old = old_rows.get(code)
-        new = new_rows.get(code)
+    for code, old, new in merge_join(old_reader, new_reader):
+        summary["total_villages"] += 1
 
         if not old:
             summary["added"] += 1
@@ -84,21 +73,25 @@ def compare(old_file, new_file, output_prefix):
             continue
 
         changed = False
-        for field in VILLAGE_FIELDS:
+        for field in fields:
             old_val = old.get(field)
             new_val = new.get(field)
             if old_val != new_val:
-                diffs.append({
+                yield {
                     "village_code": code,
                     "field": field,
                     "old": old_val,
                     "new": new_val,
-                })
+                }
                 changed = True
 
         if changed:
             summary["changed"] += 1
 
+
+def compare(old_file, new_file, output_prefix, sort=False):
+    summary = {}
+    diffs = list(iter_field_diffs(old_file, new_file, summary, sort=sort))
     return diffs, summary
 
 # =========================
@@ -109,26 +102,52 @@ def main():
     parser = argparse.ArgumentParser(
         description="Compare regions_id.csv using village-level treatment"
     )
-    parser.add_argument("old", help="Old regions_id.csv")
-    parser.add_argument("new", help="New regions_id.csv")
+    parser.add_argument("old", help="Old regions_id.csv (or .parquet)")
+    parser.add_argument("new", help="New regions_id.csv (or .parquet)")
     parser.add_argument(
         "-o",
         "--output",
         default="regions_id_diff",
         help="Output prefix (default: regions_id_diff)",
     )
+    parser.add_argument(
+        "--structural",
+        action="store_true",
+        help="Write a change log of moves, renames, splits and merges (<prefix>_changes.csv)",
+    )
+    parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="Sort both files by village code in memory first (for files not in code order)",
+    )
 
     args = parser.parse_args()
 
-    diffs, summary = compare(args.old, args.new, args.output)
-
     out_prefix = Path(args.output)
 
-    # Write field-level diff
+    if args.structural:
+        # imports the parser package for name normalisation
+        from region_changes import CHANGE_FIELDS, detect_changes
+
+        changes, summary = detect_changes(args.old, args.new, sort=args.sort)
+        write_csv(out_prefix.with_name(out_prefix.name + "_changes.csv"), CHANGE_FIELDS, changes)
+        write_csv(
+            out_prefix.with_name(out_prefix.name + "_summary.csv"),
+            ["metric", "value"],
+            [{"metric": k, "value": v} for k, v in summary.items()],
+        )
+        print("=== regions_id structural comparison completed ===")
+        for k, v in summary.items():
+            print(f"{k}: {v}")
+        return
+
+    summary = {}
+
+    # Write field-level diff while both files are streamed
     write_csv(
         out_prefix.with_name(out_prefix.name + "_field_diff.csv"),
         ["village_code", "field", "old", "new"],
-        diffs,
+        iter_field_diffs(args.old, args.new, summary, sort=args.sort),
     )
 
     # Write summary
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Structural changes between two regions_id editions.
+
+A per-code diff shows a village that moved to another district as one
+ONLY_IN_OLD plus one ONLY_IN_NEW row, and a split district as hundreds
+of them. This module pairs those rows up again:
+
+1. both files are merge-joined by village code (region_diff); codes in
+   both are checked for renames / type changes, and only the unmatched
+   rows are kept (the changed part of the edition, not all of it)
+2. removed and added villages are matched by normalised name
+   (utils.name_key) within blocks of decreasing locality: same
+   district, same regency, same province, and finally a name that is
+   unique on both sides. Each pass is a dict lookup per village, so the
+   matching is linear in the number of unmatched rows.
+3. district flows (old district → new district of every surviving
+   village) reveal district splits, merges and re-codings
+
+The result is a change log ordered so it can be applied to a
+downstream database in sequence: new districts first, then village
+moves / additions / updates, removals, and removed districts last.
+"""
+
+import sys
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from region_diff import merge_join, read_rows
+
+# scripts run from a checkout: make the parser package importable
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from kepmendagri_parser.utils.name_key import name_key  # noqa: E402
+
+KEY_FIELD = "village_code"
+
+# villages a district must send to (receive from) another one to count
+# as a split (merge) rather than a few single moves
+MIN_FLOW = 2
+
+# order in which changes are applied downstream
+CHANGE_ORDER = [
+    "DISTRICT_ADDED",
+    "DISTRICT_RECODED",
+    "DISTRICT_SPLIT",
+    "DISTRICT_MERGED",
+    "DISTRICT_RENAMED",
+    "MOVED",
+    "ADDED",
+    "RENAMED",
+    "RETYPED",
+    "REMOVED",
+    "DISTRICT_REMOVED",
+]
+
+CHANGE_FIELDS = [
+    "change", "level",
+    "old_code", "new_code",
+    "old_name", "new_name",
+    "old_parent", "new_parent",
+    "detail",
+]
+
+
+@dataclass(slots=True)
+class Village:
+    code: str
+    name: str
+    type: str
+    district: str
+    regency: str
+    province: str
+    key: str
+
+
+@dataclass(slots=True)
+class District:
+    code: str
+    name: str
+    regency: str
+
+
+def _village(code: str, row: dict) -> Village:
+    return Village(
+        code=code,
+        name=row.get("village_name", ""),
+        type=row.get("village_type", ""),
+        district=row.get("district_code", ""),
+        regency=row.get("regency_code", ""),
+        province=row.get("province_code", ""),
+        key=name_key(row.get("village_name")),
+    )
+
+
+def _change(change: str, level: str, old=None, new=None, old_parent="", new_parent="", detail="") -> dict:
+    return {
+        "change": change,
+        "level": level,
+        "old_code": old.code if old else "",
+        "new_code": new.code if new else "",
+        "old_name": old.name if old else "",
+        "new_name": new.name if new else "",
+        "old_parent": old_parent,
+        "new_parent": new_parent,
+        "detail": detail,
+    }
+
+
+# =========================
+# Village matching
+# =========================
+
+# blocking keys, from most to least local
+BLOCKS = [
+    ("district", lambda v: (v.district, v.key)),
+    ("regency", lambda v: (v.regency, v.key)),
+    ("province", lambda v: (v.province, v.key)),
+]
+
+
+def match_moves(removed: list[Village], added: list[Village]) -> list[tuple[Village, Village, str]]:
+    """
+    Pair removed and added villages with the same normalised name, most
+    local block first. Within a block, pairs are made in code order.
+    Matched villages are taken out of `removed` / `added`.
+    """
+    pairs = []
+
+    for block, block_key in BLOCKS:
+        candidates = defaultdict(deque)
+        for v in added:
+            candidates[block_key(v)].append(v)
+        still_removed = []
+        for v in removed:
+            queue = candidates.get(block_key(v))
+            if queue:
+                pairs.append((v, queue.popleft(), block))
+            else:
+                still_removed.append(v)
+        matched = {id(new) for _, new, _ in pairs}
+        removed[:] = still_removed
+        added[:] = [v for v in added if id(v) not in matched]
+
+    # anywhere in the country, only when the name is unambiguous
+    old_by_key = Counter(v.key for v in removed)
+    new_by_key = Counter(v.key for v in added)
+    unique_new = {v.key: v for v in added if new_by_key[v.key] == 1}
+    still_removed = []
+    for v in removed:
+        new = unique_new.get(v.key) if old_by_key[v.key] == 1 else None
+        if new is not None:
+            pairs.append((v, new, "country"))
+        else:
+            still_removed.append(v)
+    matched = {id(new) for _, new, _ in pairs}
+    removed[:] = still_removed
+    added[:] = [v for v in added if id(v) not in matched]
+    return pairs
+
+
+# =========================
+# District flows
+# =========================
+
+def district_changes(
+    old_districts: dict[str, District],
+    new_districts: dict[str, District],
+    flows: dict[str, Counter],
+) -> list[dict]:
+    """
+    Changes of districts from `flows` (old district → Counter of the new
+    districts its surviving villages are in).
+
+    A district whose villages went to two or more districts was split; a
+    district that received villages from two or more was merged into.
+    An old code that is gone, with all its villages under a single new
+    code, was re-coded. Districts created or dropped by a split / merge
+    are still reported as DISTRICT_ADDED / DISTRICT_REMOVED, since a
+    downstream database has to insert / delete their rows.
+    """
+    changes = []
+    inflows = defaultdict(Counter)
+    for old_code, targets in flows.items():
+        for new_code, n in targets.items():
+            inflows[new_code][old_code] += n
+
+    recoded = {}
+    for old_code in sorted(flows):
+        old = old_districts[old_code]
+        targets = {c: n for c, n in flows[old_code].items() if n >= MIN_FLOW}
+        if len(targets) >= 2:
+            changes.append(_change(
+                "DISTRICT_SPLIT", "district", old=old, old_parent=old.regency,
+                detail=_flow_detail(targets),
+            ))
+        elif len(flows[old_code]) == 1 and old_code not in new_districts:
+            new_code = next(iter(flows[old_code]))
+            if new_code not in old_districts and len(inflows[new_code]) == 1:
+                recoded[old_code] = new_code
+
+    for new_code in sorted(inflows):
+        sources = {c: n for c, n in inflows[new_code].items() if n >= MIN_FLOW}
+        if len(sources) >= 2:
+            new = new_districts[new_code]
+            changes.append(_change(
+                "DISTRICT_MERGED", "district", new=new, new_parent=new.regency,
+                detail=_flow_detail(sources),
+            ))
+
+    for old_code, new_code in recoded.items():
+        old, new = old_districts[old_code], new_districts[new_code]
+        changes.append(_change(
+            "DISTRICT_RECODED", "district", old=old, new=new,
+            old_parent=old.regency, new_parent=new.regency,
+        ))
+
+    recoded_new = set(recoded.values())
+    for code in sorted(new_districts.keys() - old_districts.keys() - recoded_new):
+        new = new_districts[code]
+        changes.append(_change("DISTRICT_ADDED", "district", new=new, new_parent=new.regency))
+
+    for code in sorted(old_districts.keys() & new_districts.keys()):
+        old, new = old_districts[code], new_districts[code]
+        if old.name != new.name:
+            changes.append(_change(
+                "DISTRICT_RENAMED", "district", old=old, new=new,
+                old_parent=old.regency, new_parent=new.regency,
+            ))
+
+    for code in sorted(old_districts.keys() - new_districts.keys() - recoded.keys()):
+        old = old_districts[code]
+        changes.append(_change("DISTRICT_REMOVED", "district", old=old, old_parent=old.regency))
+
+    return changes
+
+
+def _flow_detail(flow: dict[str, int]) -> str:
+    # "code:villages;code:villages"
+    return ";".join(f"{code}:{n}" for code, n in sorted(flow.items()))
+
+
+# =========================
+# Change log
+# =========================
+
+def detect_changes(old_file, new_file, sort: bool = False) -> tuple[list[dict], dict]:
+    """
+    (change log in apply order, summary counts) of two regions_id files;
+    `sort` reads files that are not in village code order (see region_diff).
+    """
+    old_districts: dict[str, District] = {}
+    new_districts: dict[str, District] = {}
+    flows: dict[str, Counter] = defaultdict(Counter)
+    removed: list[Village] = []
+    added: list[Village] = []
+    changes: list[dict] = []
+    summary = Counter()
+
+    for code, old_row, new_row in merge_join(
+        read_rows(old_file, KEY_FIELD, sort=sort), read_rows(new_file, KEY_FIELD, sort=sort)
+    ):
+        summary["total_villages"] += 1
+        old = _village(code, old_row) if old_row else None
+        new = _village(code, new_row) if new_row else None
+        for row, districts in ((old_row, old_districts), (new_row, new_districts)):
+            if row and row["district_code"] not in districts:
+                districts[row["district_code"]] = District(
+                    row["district_code"], row.get("district_name", ""), row.get("regency_code", "")
+                )
+
+        if old is None:
+            added.append(new)
+            continue
+        if new is None:
+            removed.append(old)
+            continue
+
+        flows[old.district][new.district] += 1
+        if old.name != new.name:
+            changes.append(_change(
+                "RENAMED", "village", old=old, new=new,
+                old_parent=old.district, new_parent=new.district,
+            ))
+        if old.type != new.type:
+            changes.append(_change(
+                "RETYPED", "village", old=old, new=new,
+                old_parent=old.district, new_parent=new.district,
+                detail=f"{old.type}->{new.type}",
+            ))
+
+    for old, new, block in match_moves(removed, added):
+        flows[old.district][new.district] += 1
+        changes.append(_change(
+            "MOVED", "village", old=old, new=new,
+            old_parent=old.district, new_parent=new.district, detail=block,
+        ))
+    for v in added:
+        changes.append(_change("ADDED", "village", new=v, new_parent=v.district))
+    for v in removed:
+        changes.append(_change("REMOVED", "village", old=v, old_parent=v.district))
+
+    changes += district_changes(old_districts, new_districts, flows)
+
+    rank = {change: i for i, change in enumerate(CHANGE_ORDER)}
+    changes.sort(key=lambda c: (rank[c["change"]], c["old_code"] or c["new_code"], c["new_code"]))
+    summary.update(c["change"] for c in changes)
+    return changes, dict(summary)
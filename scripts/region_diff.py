@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Streaming merge-join over two dataset files sorted by code.
+
+Every dataset file is written sorted by its key (`code`, or
+`village_code` for regions_id), so two releases can be diffed in one
+pass over both files, holding a single row of each in memory:
+
+    for key, old, new in merge_join(read_rows(old_path), read_rows(new_path)):
+        ...   # old / new is None when the key is only in the other file
+
+Inputs are CSV or, when pyarrow is installed, Parquet (read in record
+batches; values are turned into the strings the CSV holds, so CSV and
+Parquet files of a release compare equal). Rows without a key and
+unsorted or duplicated keys raise ValueError instead of producing a
+wrong diff. Files that are not sorted by code (e.g. edited by hand) can
+be read with `read_rows(path, sort=True)` (`--sort` in the compare
+scripts), which sorts the whole file in memory first.
+"""
+
+import csv
+from pathlib import Path
+from typing import Iterable, Iterator
+
+KEY_FIELDS = ("code", "village_code")
+
+PARQUET_BATCH_ROWS = 64 * 1024
+
+
+def detect_key(fieldnames: list[str]) -> str:
+    for key in KEY_FIELDS:
+        if key in fieldnames:
+            return key
+    raise ValueError(f"no key column ({' / '.join(KEY_FIELDS)}) in {fieldnames}")
+
+
+class DatasetReader:
+    """Rows of a CSV / Parquet dataset file as (key, row), in file order or sorted by key."""
+
+    def __init__(self, path: str | Path, key: str | None = None, sort: bool = False):
+        self.path = Path(path)
+        self.sort = sort
+        if self.path.suffix == ".parquet":
+            self.fieldnames = _parquet_file(self.path).schema_arrow.names
+        else:
+            with open(self.path, newline="", encoding="utf-8") as f:
+                self.fieldnames = next(csv.reader(f), [])
+        self.key = key or detect_key(self.fieldnames)
+
+    def __iter__(self) -> Iterator[tuple[str, dict]]:
+        rows = self._parquet_rows() if self.path.suffix == ".parquet" else self._csv_rows()
+        pairs = self._keyed(rows)
+        if self.sort:
+            # stable: duplicated keys stay adjacent and are still reported
+            pairs = sorted(pairs, key=lambda pair: pair[0])
+        yield from pairs
+
+    def _keyed(self, rows: Iterator[dict]) -> Iterator[tuple[str, dict]]:
+        key = self.key
+        for number, row in enumerate(rows, start=1):
+            value = row.get(key)
+            if not value:
+                raise ValueError(f"{self.path}: data row {number} has no {key}")
+            yield value, row
+
+    def _csv_rows(self) -> Iterator[dict]:
+        with open(self.path, newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
+
+    def _parquet_rows(self) -> Iterator[dict]:
+        for batch in _parquet_file(self.path).iter_batches(batch_size=PARQUET_BATCH_ROWS):
+            columns = [[_csv_value(v) for v in c.to_pylist()] for c in batch.columns]
+            for values in zip(*columns):
+                yield dict(zip(batch.schema.names, values))
+
+
+def read_rows(path: str | Path, key: str | None = None, sort: bool = False) -> DatasetReader:
+    return DatasetReader(path, key, sort)
+
+
+def merge_join(
+    old_rows: Iterable[tuple[str, dict]], new_rows: Iterable[tuple[str, dict]]
+) -> Iterator[tuple[str, dict | None, dict | None]]:
+    """(key, old row, new row) for the union of keys, in key order."""
+    old_iter = _checked(old_rows, "old")
+    new_iter = _checked(new_rows, "new")
+    old = next(old_iter, None)
+    new = next(new_iter, None)
+
+    while old is not None or new is not None:
+        if new is None or (old is not None and old[0] < new[0]):
+            yield old[0], old[1], None
+            old = next(old_iter, None)
+        elif old is None or new[0] < old[0]:
+            yield new[0], None, new[1]
+            new = next(new_iter, None)
+        else:
+            yield old[0], old[1], new[1]
+            old = next(old_iter, None)
+            new = next(new_iter, None)
+
+
+def _checked(rows: Iterable[tuple[str, dict]], label: str) -> Iterator[tuple[str, dict]]:
+    """Rows, asserting a key on every row and strictly increasing keys."""
+    previous = None
+    for key, row in rows:
+        if not key:
+            raise ValueError(f"{label} file: row without a key after {previous}")
+        if previous is not None and key <= previous:
+            if key == previous:
+                raise ValueError(f"{label} file: duplicate key {key}")
+            raise ValueError(
+                f"{label} file: unsorted key {key} after {previous} (inputs must "
+                "be sorted by code; --sort / read_rows(..., sort=True) sorts them "
+                "in memory)"
+            )
+        previous = key
+        yield key, row
+
+
+def _csv_value(value) -> str:
+    # what the dataset CSV holds for the same value
+    if value is None:
+        return ""
+    return str(value)
+
+
+def _parquet_file(path: Path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Reading Parquet needs pyarrow (pip install pyarrow)") from None
+    return pq.ParquetFile(path)
@@ -0,0 +1,134 @@
+"""
+download_file against a local http.server: resume, 304, 416, checksum
+mismatch and bodies without a length.
+"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from kepmendagri_parser.utils.input_resolver import DownloadCache, download_file
+
+BODY = bytes(range(256)) * 400  # 100 KiB
+SHA256 = hashlib.sha256(BODY).hexdigest()
+ETAG = '"v1"'
+
+
+class Handler(BaseHTTPRequestHandler):
+    # per-test behaviour, monkeypatched by the tests
+    truncate_first: bool = False
+    send_length: bool = True
+    requests: list[dict] = []
+
+    def do_GET(self):
+        headers = dict(self.headers)
+        self.requests.append(headers)
+
+        if headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        start = 0
+        if "Range" in headers and headers.get("If-Range", ETAG) == ETAG:
+            start = int(headers["Range"].removeprefix("bytes=").removesuffix("-"))
+            if start >= len(BODY):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(BODY)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(BODY) - 1}/{len(BODY)}")
+        else:
+            self.send_response(200)
+
+        body = BODY[start:]
+        self.send_header("ETag", ETAG)
+        if self.send_length:
+            self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+
+        if self.truncate_first and len(self.requests) == 1:
+            # connection drops half way through the first download
+            body = body[: len(body) // 2]
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(Handler, "requests", [])
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/kepmendagri.pdf"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_interrupted_download_resumes(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(Handler, "truncate_first", True)
+
+    with pytest.raises(ConnectionError, match="run again to resume"):
+        download_file(server, SHA256, cache_dir=tmp_path)
+    part = DownloadCache(tmp_path).partial(SHA256)
+    assert part.stat().st_size == len(BODY) // 2
+
+    path = download_file(server, SHA256, cache_dir=tmp_path)
+    assert path.read_bytes() == BODY
+    assert path == DownloadCache(tmp_path).blob(SHA256)
+    assert Handler.requests[1]["Range"] == f"bytes={len(BODY) // 2}-"
+    assert Handler.requests[1]["If-Range"] == ETAG
+    assert not part.exists()
+
+
+def test_unchanged_url_is_revalidated_with_304(server, tmp_path):
+    first = download_file(server, cache_dir=tmp_path)
+    second = download_file(server, cache_dir=tmp_path)
+
+    assert second == first and second.read_bytes() == BODY
+    assert Handler.requests[1]["If-None-Match"] == ETAG
+    assert len(Handler.requests) == 2
+
+
+def test_complete_partial_file_is_stored_on_416(server, tmp_path):
+    cache = DownloadCache(tmp_path)
+    part = cache.partial(SHA256)
+    part.parent.mkdir(parents=True)
+    part.write_bytes(BODY)
+    part.with_suffix(".json").write_text(json.dumps({"url": server, "etag": ETAG}))
+
+    path = download_file(server, SHA256, cache_dir=tmp_path)
+    assert path == cache.blob(SHA256) and path.read_bytes() == BODY
+    assert [r["Range"] for r in Handler.requests] == [f"bytes={len(BODY)}-"]
+
+
+def test_sha256_mismatch_is_not_cached(server, tmp_path):
+    wrong = "0" * 64
+    with pytest.raises(ValueError, match="SHA256 mismatch"):
+        download_file(server, wrong, cache_dir=tmp_path)
+
+    cache = DownloadCache(tmp_path)
+    assert not cache.partial(wrong).exists()
+    assert not cache.blob(SHA256).exists()
+    assert cache.url_entry(server) is None
+
+
+def test_download_without_length_is_not_cached(server, tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(Handler, "send_length", False)
+
+    path = download_file(server, cache_dir=tmp_path)
+    assert path.read_bytes() == BODY
+    assert "no Content-Length" in caplog.text
+
+    cache = DownloadCache(tmp_path)
+    assert not cache.blob(SHA256).exists()
+    assert cache.url_entry(server) is None
+
+    # with a checksum the same body is verified and cached
+    assert download_file(server, SHA256, cache_dir=tmp_path) == cache.blob(SHA256)
@@ -0,0 +1,87 @@
+"""
+The pdfium engine must extract exactly what the pdfplumber engine does:
+same tables, same header rows and the same parsed rows on every page of
+a small synthetic Kepmendagri PDF.
+"""
+
+import pytest
+
+from benchmarks.synthetic_pdf import SyntheticSizes, generate_synthetic_pdf
+from kepmendagri_parser.extractors.engines import get_engine
+from kepmendagri_parser.pipeline.page_parser import iter_page_results
+
+ENGINE_NAMES = ("pdfplumber", "pdfium")
+
+
+@pytest.fixture(scope="module")
+def synthetic_pdf(tmp_path_factory):
+    path = tmp_path_factory.mktemp("parity") / "synthetic.pdf"
+    info = generate_synthetic_pdf(
+        path,
+        SyntheticSizes(
+            provinces=2,
+            regencies_per_province=2,
+            districts_per_regency=2,
+            villages_per_district=6,
+            rows_per_page=10,
+        ),
+    )
+    return path, info
+
+
+def extract_pages(engine_name, path):
+    engine = get_engine(engine_name)
+    with engine.open(path) as pdf:
+        return [
+            {
+                "table": engine.extract_table(page),
+                "header_row": engine.extract_header_row(page),
+                "text": engine.extract_text(page),
+            }
+            for page in pdf.pages
+        ]
+
+
+def parse_pages(engine_name, path, start_page, end_page):
+    engine = get_engine(engine_name)
+    with engine.open(path) as pdf:
+        return [
+            (result.page, result.content_type, result.rows)
+            for result in iter_page_results(pdf, start_page, end_page, engine=engine)
+        ]
+
+
+def test_synthetic_pdf_covers_every_section(synthetic_pdf):
+    _, info = synthetic_pdf
+    assert set(info["sections"]) == {"provinsi", "kab_kota", "kecamatan", "kelurahan_desa"}
+
+
+def test_tables_header_rows_and_text_match(synthetic_pdf):
+    path, info = synthetic_pdf
+    reference, candidate = (extract_pages(name, path) for name in ENGINE_NAMES)
+
+    assert len(reference) == len(candidate) == info["pages"]
+    for page, (expected, actual) in enumerate(zip(reference, candidate), start=1):
+        assert actual["table"] == expected["table"], f"table of page {page}"
+        assert actual["header_row"] == expected["header_row"], f"header row of page {page}"
+        assert actual["text"] == expected["text"], f"text of page {page}"
+
+
+def test_tables_are_found(synthetic_pdf):
+    path, info = synthetic_pdf
+    first, last = info["sections"]["kelurahan_desa"]
+    pages = extract_pages("pdfium", path)
+    for page in range(first, last + 1):
+        assert pages[page - 1]["table"], f"no table on village page {page}"
+        assert pages[page - 1]["header_row"], f"no header row on village page {page}"
+
+
+@pytest.mark.parametrize("section", ["provinsi", "kab_kota", "kecamatan", "kelurahan_desa"])
+def test_parsed_rows_match(synthetic_pdf, section):
+    path, info = synthetic_pdf
+    first, last = info["sections"][section]
+    reference, candidate = (parse_pages(name, path, first, last) for name in ENGINE_NAMES)
+
+    assert candidate == reference
+    assert all(content_type.value == section for _, content_type, _ in reference)
+    assert sum(len(rows) for _, _, rows in reference) > 0
@@ -0,0 +1,92 @@
+"""
+Foreign keys must name a known parent; the code prefix rule is only
+enforced with `strict_codes` (--strict-codes).
+"""
+
+import csv
+
+import pytest
+
+from kepmendagri_parser.builders.dataset_builder import (
+    build_dataset,
+    build_dataset_streaming,
+)
+from kepmendagri_parser.builders.validation import ForeignKeyError
+
+PROVINCES = [
+    {"code": "11", "name": "Aceh", "source_page": 2},
+    {"code": "12", "name": "Sumatera Utara", "source_page": 2},
+]
+REGENCIES = [
+    {"code": "1101", "province_code": "11", "name": "Kab. Simeulue", "type": "regency", "source_page": 3},
+    {"code": "1201", "province_code": "12", "name": "Kab. Tapanuli Tengah", "type": "regency", "source_page": 3},
+]
+DISTRICTS = [
+    {"code": "110101", "regency_code": "1101", "province_code": "11", "name": "Teupah Selatan", "source_page": 4},
+    {"code": "120101", "regency_code": "1201", "province_code": "12", "name": "Barus", "source_page": 4},
+]
+
+
+def villages(district_code_of_second: str) -> list[dict]:
+    return [
+        {"code": "1101012001", "name": "Latiung", "district_code": "110101", "type": "village", "source_page": 5},
+        {"code": "1101012002", "name": "Labuhan Bajau", "district_code": district_code_of_second, "type": "village", "source_page": 5},
+    ]
+
+
+def pandas_builder():
+    pytest.importorskip("pandas")
+    from kepmendagri_parser.builders.dataset_builder_pandas import build_dataset_pandas
+
+    return build_dataset_pandas
+
+
+BUILDERS = {
+    "python": lambda: build_dataset,
+    "streaming": lambda: build_dataset_streaming,
+    "pandas": pandas_builder,
+}
+
+
+def build(builder: str, out_dir, village_rows, **kwargs):
+    return BUILDERS[builder]()(
+        PROVINCES, REGENCIES, DISTRICTS, village_rows, out_dir, **kwargs
+    )
+
+
+def read_csv(path) -> list[dict]:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+@pytest.mark.parametrize("builder", BUILDERS)
+def test_parent_outside_code_prefix_is_accepted(builder, tmp_path):
+    build(builder, tmp_path, villages("120101"))
+
+    # regions_id joins the parents the rows name
+    rows = read_csv(tmp_path / "regions_id.csv")
+    assert [(r["village_code"], r["district_code"], r["province_code"]) for r in rows] == [
+        ("1101012001", "110101", "11"),
+        ("1101012002", "120101", "12"),
+    ]
+
+
+@pytest.mark.parametrize("builder", BUILDERS)
+def test_strict_codes_rejects_parent_outside_code_prefix(builder, tmp_path):
+    with pytest.raises(ForeignKeyError) as e:
+        build(builder, tmp_path, villages("120101"), strict_codes=True)
+
+    [violation] = e.value.violations
+    assert (violation.code, violation.value, violation.expected) == ("1101012002", "120101", "110101")
+    assert "not the parent of the code" in str(e.value)
+    assert not (tmp_path / "villages.csv").exists()
+
+
+@pytest.mark.parametrize("builder", BUILDERS)
+def test_unknown_parent_is_rejected(builder, tmp_path):
+    with pytest.raises(ForeignKeyError) as e:
+        build(builder, tmp_path, villages("110199"))
+
+    [violation] = e.value.violations
+    assert (violation.code, violation.known, violation.source_page) == ("1101012002", False, 5)
+    assert "unknown district" in str(e.value)
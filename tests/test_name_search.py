@@ -0,0 +1,63 @@
+"""
+NameSearch context scoring when a village's ancestor is missing from the
+datasets.
+"""
+
+import csv
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from kepmendagri_parser.lookup.name_search import NameSearch
+
+DATASETS = {
+    "provinces.csv": [
+        ["code", "name", "capital"],
+        ["11", "Aceh", "Banda Aceh"],
+    ],
+    "regencies.csv": [
+        ["code", "province_code", "name", "capital", "type", "is_administrative"],
+        ["1101", "11", "Kabupaten Simeulue", "Sinabang", "regency", "False"],
+    ],
+    # 110103 and 110105 are missing
+    "districts.csv": [
+        ["code", "regency_code", "name"],
+        ["110101", "1101", "Teupah Selatan"],
+        ["110104", "1101", "Simeulue Barat"],
+    ],
+    "villages.csv": [
+        ["code", "district_code", "name", "type"],
+        ["1101012001", "110101", "Sukamaju", "village"],
+        ["1101032001", "110103", "Sukamaju", "village"],
+        ["1101042001", "110104", "Sukamaju", "village"],
+        ["1101052001", "110105", "Sukamaju", "village"],
+    ],
+}
+
+
+@pytest.fixture
+def search(tmp_path):
+    for name, rows in DATASETS.items():
+        with open(tmp_path / name, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+    return NameSearch.load(tmp_path)
+
+
+def scores(matches) -> dict[str, float]:
+    return {m.region.code: m.score for m in matches}
+
+
+def test_missing_ancestor_scores_no_context(search):
+    by_code = scores(search.search("Desa Sukamaju, Simeulue Barat"))
+
+    # 110103 sorts right before 110104: its villages must not borrow that name
+    assert by_code["1101042001"] > by_code["1101032001"]
+    assert by_code["1101032001"] == by_code["1101012001"]
+
+
+def test_missing_ancestor_after_the_last_code(search):
+    by_code = scores(search.search("Desa Sukamaju, Teupah Selatan"))
+
+    assert max(by_code, key=by_code.get) == "1101012001"
+    assert by_code["1101052001"] == by_code["1101042001"]
@@ -0,0 +1,103 @@
+"""
+build_page_index finds the section boundaries by search, and falls back
+to classifying every page when the sections are not contiguous.
+"""
+
+from types import SimpleNamespace
+
+from kepmendagri_parser.pipeline.context import PageType
+from kepmendagri_parser.utils.page_index import (
+    build_page_index,
+    check_page_index_boundaries,
+    verify_page_index,
+)
+
+HEADERS = {
+    "P": ["NO", "KODE", "PROVINSI"],
+    "R": ["NO", "KODE", "NAMA KABUPATEN / KOTA"],
+    "D": ["NO", "KODE", "NAMA PROVINSI / KAB/KOTA / KECAMATAN"],
+    "V": ["KODE", "NAMA"],
+    "U": None,
+}
+
+
+class LetterEngine:
+    """Engine over fake pages: each page is a letter of HEADERS."""
+
+    name = "letters"
+
+    def extract_header_row(self, page):
+        return HEADERS[page]
+
+    def extract_table(self, page):
+        return [HEADERS[page]] if HEADERS[page] else []
+
+    def extract_text(self, page):
+        return ""
+
+
+def index_of(layout: str):
+    pdf = SimpleNamespace(pages=list(layout))
+    probed = []
+    index = build_page_index(
+        pdf, LetterEngine(), "sha", on_probe=lambda page, _: probed.append(page)
+    )
+    return pdf, index, probed
+
+
+def sections(index):
+    return [(s.page_type, s.start, s.end) for s in index.sections]
+
+
+def test_contiguous_sections_are_searched():
+    layout = "UU" + "P" + "RR" + "D" * 5 + "V" * 60 + "UU"
+    pdf, index, probed = index_of(layout)
+
+    assert sections(index) == [
+        (PageType.PROVINSI, 3, 3),
+        (PageType.KAB_KOTA, 4, 5),
+        (PageType.KECAMATAN, 6, 10),
+        (PageType.KELURAHAN_DESA, 11, 70),
+    ]
+    assert not index.linear_scan
+    assert len(probed) < len(layout) / 2
+    assert verify_page_index(pdf, LetterEngine(), index) == []
+    assert check_page_index_boundaries(pdf, LetterEngine(), index) == []
+
+
+def test_stray_page_inside_a_section_falls_back_to_a_linear_scan():
+    # the gallop for the end of the data probes pages 5, 6, 8, 12, 20:
+    # it stops at the stray page 20
+    layout = "U" + "P" + "R" + "D" + "V" * 15 + "U" + "V" * 19 + "U"
+    pdf, index, _ = index_of(layout)
+
+    assert index.linear_scan
+    assert sections(index) == [
+        (PageType.PROVINSI, 2, 2),
+        (PageType.KAB_KOTA, 3, 3),
+        (PageType.KECAMATAN, 4, 4),
+        (PageType.KELURAHAN_DESA, 5, 19),
+        (PageType.KELURAHAN_DESA, 21, 39),
+    ]
+    # the stray page is skipped, not parsed as a village page
+    assert index.page_type(20) == PageType.UNKNOWN
+    assert index.page_ranges() == [(2, 19), (21, 39)]
+    assert verify_page_index(pdf, LetterEngine(), index) == []
+
+
+def test_out_of_order_boundary_page_falls_back_to_a_linear_scan():
+    layout = "U" + "P" + "RRRR" + "DDDDDDD" + "R" + "V" * 8 + "U"
+    pdf, index, _ = index_of(layout)
+
+    assert index.linear_scan
+    assert index.page_type(14) == PageType.KAB_KOTA
+    assert verify_page_index(pdf, LetterEngine(), index) == []
+
+
+def test_stale_index_is_caught_by_its_boundary_pages():
+    pdf, index, _ = index_of("UP" + "R" + "D" + "V" * 10 + "U")
+    pdf.pages[-1] = "V"
+
+    assert check_page_index_boundaries(pdf, LetterEngine(), index) == [
+        {"page": 15, "expected": "unknown", "actual": "kelurahan_desa"}
+    ]
@@ -0,0 +1,72 @@
+"""
+Merge-join of two dataset files (scripts/region_diff.py).
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+from region_diff import merge_join, read_rows  # noqa: E402
+
+FIELDS = ["code", "district_code", "name", "type"]
+
+
+def write(path, codes_and_names):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for code, name in codes_and_names:
+            writer.writerow([code, code[:6], name, "village"])
+    return path
+
+
+def diff(old, new, **kwargs):
+    return [
+        (key, old_row and old_row["name"], new_row and new_row["name"])
+        for key, old_row, new_row in merge_join(read_rows(old, **kwargs), read_rows(new, **kwargs))
+    ]
+
+
+def test_merge_join(tmp_path):
+    old = write(tmp_path / "old.csv", [("1101012001", "Latiung"), ("1101012002", "Labuhan")])
+    new = write(tmp_path / "new.csv", [("1101012002", "Labuhan Bajau"), ("1101012003", "Lataling")])
+
+    assert diff(old, new) == [
+        ("1101012001", "Latiung", None),
+        ("1101012002", "Labuhan", "Labuhan Bajau"),
+        ("1101012003", None, "Lataling"),
+    ]
+
+
+def test_unsorted_input_needs_sort(tmp_path):
+    old = write(tmp_path / "old.csv", [("1101012002", "Labuhan"), ("1101012001", "Latiung")])
+    new = write(tmp_path / "new.csv", [("1101012001", "Latiung")])
+
+    with pytest.raises(ValueError, match=r"old file: unsorted key .*--sort"):
+        diff(old, new)
+    assert diff(old, new, sort=True) == [
+        ("1101012001", "Latiung", "Latiung"),
+        ("1101012002", "Labuhan", None),
+    ]
+
+
+@pytest.mark.parametrize("sort", [False, True])
+def test_row_without_key_is_an_error(tmp_path, sort):
+    old = write(tmp_path / "old.csv", [("1101012001", "Latiung"), ("", "Labuhan")])
+    new = write(tmp_path / "new.csv", [("1101012001", "Latiung")])
+
+    with pytest.raises(ValueError, match="old.csv: data row 2 has no code"):
+        diff(old, new, sort=sort)
+
+
+@pytest.mark.parametrize("sort", [False, True])
+def test_duplicate_key_is_an_error(tmp_path, sort):
+    old = write(tmp_path / "old.csv", [("1101012001", "Latiung"), ("1101012001", "Labuhan")])
+    new = write(tmp_path / "new.csv", [])
+
+    with pytest.raises(ValueError, match="duplicate key 1101012001"):
+        diff(old, new, sort=sort)
@@ -0,0 +1,79 @@
+"""
+RegionIndex lookups over a small datasets directory.
+"""
+
+import csv
+
+import pytest
+
+from kepmendagri_parser.lookup import region_index
+from kepmendagri_parser.lookup.region_index import RegionIndex
+
+DATASETS = {
+    "provinces.csv": [
+        ["code", "name", "capital"],
+        ["11", "Aceh", "Banda Aceh"],
+    ],
+    "regencies.csv": [
+        ["code", "province_code", "name", "capital", "type", "is_administrative"],
+        ["1101", "11", "Kabupaten Simeulue", "Sinabang", "regency", "False"],
+    ],
+    "districts.csv": [
+        ["code", "regency_code", "name"],
+        ["110101", "1101", "Teupah Selatan"],
+        ["110102", "1101", "Simeulue Timur"],
+    ],
+    "villages.csv": [
+        ["code", "district_code", "name", "type"],
+        ["1101012001", "110101", "Latiung", "village"],
+        ["1101012002", "110101", "Labuhan Bajau", "village"],
+    ],
+}
+
+
+@pytest.fixture
+def datasets(tmp_path):
+    for name, rows in DATASETS.items():
+        with open(tmp_path / name, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+    return tmp_path
+
+
+def test_lookups(datasets):
+    index = RegionIndex.load(datasets)
+    assert index["11.01.01.2001"].name == "Latiung"
+    assert index.get(110102).name == "Simeulue Timur"
+    assert index.get("9999") is None
+    assert index.get("not a code") is None
+    assert [r.name for r in index.ancestry("1101012002")] == [
+        "Aceh", "Kabupaten Simeulue", "Teupah Selatan", "Labuhan Bajau",
+    ]
+    assert [r.code for r in index.children("110101")] == ["1101012001", "1101012002"]
+    assert index.children("110102") == []
+
+
+@pytest.mark.parametrize("code", ["11.01.0", "1101x", "", 0, -11])
+def test_malformed_codes_raise_key_error(datasets, code):
+    index = RegionIndex.load(datasets)
+    assert code not in index
+    for lookup in (index.__getitem__, index.ancestry, index.children, index.parent):
+        with pytest.raises(KeyError):
+            lookup(code)
+
+
+def test_empty_level_is_read_once(datasets, monkeypatch):
+    with open(datasets / "villages.csv", "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerow(DATASETS["villages.csv"][0])
+
+    reads = []
+    level_table = region_index.LevelTable
+
+    def counting_table(level, path):
+        reads.append(level)
+        return level_table(level, path)
+
+    monkeypatch.setattr(region_index, "LevelTable", counting_table)
+    index = RegionIndex.load(datasets)
+    for _ in range(3):
+        assert index.get("1101012001") is None
+    assert reads == [region_index.Level.VILLAGE]
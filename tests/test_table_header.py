@@ -0,0 +1,79 @@
+"""
+header_row reads the first row of the page's ruled table, whatever is
+drawn above it.
+"""
+
+from kepmendagri_parser.classifier.page_classifier import classify_header
+from kepmendagri_parser.extractors.table_header import header_row
+from kepmendagri_parser.pipeline.context import PageType
+
+CHAR_WIDTH = 4
+COLUMNS = [20, 50, 110, 300]
+ROWS = [100, 120, 140]
+
+
+def text_chars(text: str, x: float, top: float) -> list[tuple]:
+    """(text, x0, top, x1, bottom) boxes of `text` written from x."""
+    return [
+        (ch, x + i * CHAR_WIDTH, top, x + (i + 1) * CHAR_WIDTH, top + 8)
+        for i, ch in enumerate(text)
+    ]
+
+
+def province_table():
+    """NO | KODE | PROVINSI header and one data row, fully ruled."""
+    horizontal = [(y, COLUMNS[0], COLUMNS[-1]) for y in ROWS]
+    vertical = [(x, ROWS[0], ROWS[-1]) for x in COLUMNS]
+    chars = (
+        text_chars("NO", 24, 105)
+        + text_chars("KODE", 54, 105)
+        + text_chars("PROVINSI", 114, 105)
+        + text_chars("1", 24, 125)
+        + text_chars("11", 54, 125)
+        + text_chars("Aceh", 114, 125)
+    )
+    return chars, horizontal, vertical
+
+
+def test_header_row_of_table():
+    assert header_row(*province_table()) == ["NO", "KODE", "PROVINSI"]
+
+
+def test_per_row_vertical_segments():
+    chars, horizontal, _ = province_table()
+    vertical = [(x, top, bottom) for x in COLUMNS for top, bottom in zip(ROWS, ROWS[1:])]
+    assert header_row(chars, horizontal, vertical) == ["NO", "KODE", "PROVINSI"]
+
+
+def test_rule_above_table_is_not_the_header_band():
+    chars, horizontal, vertical = province_table()
+    # letterhead rule, then a title with column-like words underlined
+    horizontal = [(30, 10, 400), (72, 20, 300), *horizontal]
+    chars = text_chars("KODE NO KECAMATAN", 24, 62) + chars
+
+    header = header_row(chars, horizontal, vertical)
+    assert header == ["NO", "KODE", "PROVINSI"]
+    assert classify_header(header) == PageType.PROVINSI
+
+
+def test_boxed_title_is_not_the_header_band():
+    chars, horizontal, vertical = province_table()
+    horizontal = [(40, 60, 260), (70, 60, 260), *horizontal]
+    vertical = [(60, 40, 70), (260, 40, 70), *vertical]
+    chars = text_chars("KODE", 64, 50) + chars
+
+    assert header_row(chars, horizontal, vertical) == ["NO", "KODE", "PROVINSI"]
+
+
+def test_spanning_header_cell():
+    chars, horizontal, vertical = province_table()
+    # no ruling between KODE and PROVINSI in the header band
+    vertical = [v for v in vertical if v[0] != COLUMNS[2]] + [(COLUMNS[2], ROWS[1], ROWS[2])]
+
+    assert header_row(chars, horizontal, vertical) == ["NO", "KODE PROVINSI", None]
+
+
+def test_rules_without_table():
+    chars, horizontal, _ = province_table()
+    assert header_row(chars, horizontal, []) is None
+    assert header_row(chars, [], []) is None
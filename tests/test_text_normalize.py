@@ -0,0 +1,86 @@
+"""
+Outputs of the shared text helpers, pinned to what the classifier and the
+parsers produced with their former inline `re.sub` code.
+"""
+
+import pytest
+
+from kepmendagri_parser.utils.text_normalize import (
+    clean_name,
+    normalize_header,
+    split_cell,
+    strip_leading_number,
+    strip_leading_number_word,
+)
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("NO", "NO"),
+    ("N O", "NO"),
+    ("K O D E", "KODE"),
+    ("kode", "KODE"),
+    ("P R O V I N S I *)", "PROVINSI"),
+    ("NAMA KABUPATEN /\nKOTA", "KOTA"),
+    ("NAMA PROVINSI /\nKAB/KOTA /\nKECAMATAN", "KECAMATAN"),
+    ("NAMA\nKELURAHAN **)", "KELURAHAN"),
+    ("JUMLAH\nPENDUDUK *)", "PENDUDUK"),
+    ("NAMA\xa0DESA", "DESA"),
+    ("  IBUKOTA \n", "IBUKOTA"),
+    ("*)", ""),
+    ("", ""),
+    (None, ""),
+])
+def test_normalize_header(cell, expected):
+    assert normalize_header(cell) == expected
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("Sukamaju", "Sukamaju"),
+    ("  Sukamaju  ", "Sukamaju"),
+    ("Tanjung\nSari", "Tanjung Sari"),
+    ("Tanjung\r\n\tSari", "Tanjung Sari"),
+    ("Mekar   Jaya", "Mekar Jaya"),
+    ("Mekar  Jaya", "Mekar Jaya"),
+    ("Air \n Baru", "Air Baru"),
+    # a single non-breaking space is not collapsed, a run of two is
+    ("Batu\xa0Gunung", "Batu\xa0Gunung"),
+    ("Batu\xa0\xa0Gunung", "Batu Gunung"),
+    ("", None),
+    (None, None),
+])
+def test_clean_name(value, expected):
+    assert clean_name(value) == expected
+
+
+@pytest.mark.parametrize("value, expected, expected_word", [
+    ("12 Sukamaju", "Sukamaju", "Sukamaju"),
+    ("12Sukamaju", "Sukamaju", "12Sukamaju"),
+    ("12\nSukamaju", "Sukamaju", "Sukamaju"),
+    ("007  Rejo", "Rejo", "Rejo"),
+    ("12", "", "12"),
+    ("Sukamaju 12", "Sukamaju 12", "Sukamaju 12"),
+    ("Kampung 2", "Kampung 2", "Kampung 2"),
+    ("", "", ""),
+])
+def test_strip_leading_number(value, expected, expected_word):
+    assert strip_leading_number(value) == expected
+    assert strip_leading_number_word(value) == expected_word
+
+
+def test_village_name():
+    # village_parser: clean_name(strip_leading_number(name))
+    assert clean_name(strip_leading_number("3 Tanjung\n Sari ")) == "Tanjung Sari"
+    assert clean_name(strip_leading_number("3")) is None
+
+
+@pytest.mark.parametrize("cell, expected", [
+    ("11\n12\n13", ["11", "12", "13"]),
+    (" 11 \n\n 12 \n", ["11", "12"]),
+    ("Aceh", ["Aceh"]),
+    ("A\xa0B\nC\r\nD", ["A\xa0B", "C", "D"]),
+    ("\n \n", []),
+    ("", []),
+    (None, []),
+])
+def test_split_cell(cell, expected):
+    assert split_cell(cell) == expected
@@ -0,0 +1,60 @@
+"""
+VillageColumns takes every row the village parser emits; rows it cannot
+encode are rejected by validation, not by the store.
+"""
+
+import pytest
+
+from kepmendagri_parser.builders.dataset_builder import normalize_village
+from kepmendagri_parser.builders.validation import ForeignKeyError, assert_foreign_keys
+from kepmendagri_parser.models.columns import VillageColumns
+
+PROVINCES = [{"code": "11"}]
+REGENCIES = [{"code": "1101", "province_code": "11"}]
+DISTRICTS = [{"code": "110101", "regency_code": "1101", "province_code": "11"}]
+
+
+def village(code, district_code="110101", vtype="village", page=7):
+    return {
+        "code": code,
+        "name": "Sukamaju",
+        "district_code": district_code,
+        "type": vtype,
+        "source_page": page,
+    }
+
+
+def test_valid_rows_round_trip():
+    rows = [village("1101012002"), village("1101011001", vtype="urban_village")]
+    columns = VillageColumns.from_rows(rows)
+    assert not columns.invalid
+    assert list(columns) == rows
+    assert list(normalize_village(columns)) == rows[::-1]
+
+
+@pytest.mark.parametrize("row, message", [
+    (village("11.01.01.2X01"), "page 7: invalid code '11.01.01.2X01'"),
+    (village(None), "page 7: invalid code None"),
+    (village("1101012001", vtype="kampung"), "page 7: 1101012001: unknown type 'kampung'"),
+])
+def test_unencodable_rows_fail_validation(row, message):
+    columns = VillageColumns.from_rows([village("1101012002"), row])
+    assert len(columns) == 2
+    # iterated as parsed
+    assert list(columns)[1] == row
+
+    with pytest.raises(ValueError, match="invalid row") as e:
+        normalize_village(columns)
+    assert message in str(e.value)
+
+
+def test_missing_district_code_fails_foreign_keys():
+    rows = [village("1101012001", district_code=None), village("1101012002")]
+    villages = normalize_village(rows)
+    assert [v["district_code"] for v in villages] == [None, "110101"]
+
+    with pytest.raises(ForeignKeyError) as e:
+        assert_foreign_keys(PROVINCES, REGENCIES, DISTRICTS, villages)
+    [violation] = e.value.violations
+    assert (violation.code, violation.value, violation.known) == ("1101012001", None, False)
+    assert violation.source_page == 7